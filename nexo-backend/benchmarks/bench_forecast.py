@@ -0,0 +1,74 @@
+"""Latência da previsão Monte Carlo de conclusão por tamanho de projeto e número de simulações.
+
+Mede forecast_completion de ponta a ponta (consulta das tarefas + simulação)
+num SQLite em memória com uma fração das tarefas já concluídas.
+
+Uso: python benchmarks/bench_forecast.py [tarefas ...]
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from src.models.user import db, User
+from src.models.project import Project, Task
+from src.services.forecast import forecast_completion
+
+SIMULATIONS = (10000, 100000)
+REPEATS = 5
+
+
+def seed_project(task_count):
+    rng = random.Random(task_count)
+    user = User(username=f'bench{task_count}', email=f'bench{task_count}@example.com')
+    db.session.add(user)
+    db.session.flush()
+    project = Project(name='Bench', user_id=user.id, start_date=datetime.utcnow() - timedelta(days=90))
+    db.session.add(project)
+    db.session.flush()
+    rows = []
+    for index in range(task_count):
+        estimated = rng.choice((1, 2, 4, 8, 16, 24))
+        done = index < task_count // 4
+        rows.append({
+            'title': f'Tarefa {index}',
+            'project_id': project.id,
+            'status': 'done' if done else 'todo',
+            'estimated_hours': estimated,
+            'actual_hours': estimated * rng.lognormvariate(0.15, 0.35) if done else 0.0,
+            'progress': 100.0 if done else 0.0
+        })
+    db.session.execute(db.insert(Task), rows)
+    db.session.commit()
+    return project
+
+
+def main():
+    sizes = [int(value) for value in sys.argv[1:]] or [100, 1000, 5000]
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        for size in sizes:
+            project = seed_project(size)
+            for simulations in SIMULATIONS:
+                forecast_completion(project, simulations=simulations, seed=1)
+                timings = []
+                for repeat in range(REPEATS):
+                    started = time.perf_counter()
+                    result = forecast_completion(project, simulations=simulations, seed=repeat)
+                    timings.append((time.perf_counter() - started) * 1000)
+                p50, p95 = result['percentiles']['p50'], result['percentiles']['p95']
+                print(
+                    f'{size:6} tarefas  {simulations:7} simulações  mediana {sorted(timings)[REPEATS // 2]:7.1f} ms'
+                    f'   P50 {p50["working_days"]:7.1f} dias úteis   P95 {p95["working_days"]:7.1f}'
+                )
+
+
+if __name__ == '__main__':
+    main()
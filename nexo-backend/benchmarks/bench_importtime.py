@@ -0,0 +1,107 @@
+"""Tempo de inicialização a frio da aplicação, medido com `python -X importtime`.
+
+Cada cenário roda num processo novo (como um worker do gunicorn ou uma
+função serverless) e mede:
+  - import src.app: só a fábrica; não deve carregar SQLAlchemy nem as rotas
+  - import src.main: fábrica + create_app() (sem tocar no banco)
+  - primeira requisição: processo novo até a resposta de /api/health
+
+Os limites em ms funcionam como portão de regressão: o script sai com
+código 1 se a mediana de algum cenário passar do orçamento, ou se
+importar src.app carregar algum dos módulos listados em LAZY_MODULES.
+
+Uso: python benchmarks/bench_importtime.py [repetições] [fator do orçamento]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Orçamentos (ms, mediana, incluindo a partida do interpretador); em máquinas
+# mais lentas ou mais rápidas, ajuste pelo fator da linha de comando
+BUDGETS_MS = {
+    'import src.app': 400,
+    'import src.main': 1500,
+    'primeira requisição': 1800
+}
+
+# Carregados só dentro de create_app()
+LAZY_MODULES = ('sqlalchemy', 'flask_sqlalchemy', 'src.models.user', 'src.routes.project', 'src.services.importer')
+
+FIRST_REQUEST = (
+    "from src.main import app\n"
+    "response = app.test_client().get('/api/health')\n"
+    "assert response.status_code == 200, response.status_code\n"
+)
+
+
+def importtime(statement):
+    """Executa statement com -X importtime; retorna (µs acumulados por módulo, µs de parede)"""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    elapsed = (time.perf_counter() - started) * 1e6
+    if result.returncode != 0:
+        raise SystemExit(f'Falha ao executar {statement!r}:\n{result.stderr[-2000:]}')
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(cumulative)
+    return modules, elapsed
+
+
+def top_modules(modules, count=8):
+    return sorted(
+        ((name, value) for name, value in modules.items() if name.startswith('src.')),
+        key=lambda item: item[1], reverse=True
+    )[:count]
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    factor = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    # Aquece o cache de bytecode para medir só a importação
+    importtime(FIRST_REQUEST)
+
+    failures = []
+    results = {}
+    for name, statement in (
+        ('import src.app', 'import src.app'),
+        ('import src.main', 'import src.main'),
+        ('primeira requisição', FIRST_REQUEST)
+    ):
+        samples = []
+        modules = {}
+        for _ in range(repeats):
+            modules, elapsed = importtime(statement)
+            samples.append(elapsed / 1000)
+        median = statistics.median(samples)
+        budget = BUDGETS_MS[name] * factor
+        results[name] = modules
+        status = 'ok' if median <= budget else 'ACIMA DO ORÇAMENTO'
+        print(f'{name:22} mediana {median:8.1f} ms   orçamento {budget:8.1f} ms   {status}')
+        if median > budget:
+            failures.append(name)
+
+    eager = [name for name in LAZY_MODULES if name in results['import src.app']]
+    if eager:
+        print(f"import src.app carregou módulos que deveriam ser preguiçosos: {', '.join(eager)}")
+        failures.append('importação preguiçosa')
+
+    print('\nMódulos do projeto mais caros em import src.main (acumulado):')
+    for name, value in top_modules(results['import src.main']):
+        print(f'  {name:40} {value / 1000:8.1f} ms')
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
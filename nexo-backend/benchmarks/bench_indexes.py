@@ -0,0 +1,97 @@
+"""Benchmark dos índices: plano de execução e tempo antes/depois da migração 1.
+
+Uso: python benchmarks/bench_indexes.py [projetos] [tarefas_por_projeto]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from src.models.user import db
+from src.models.project import Project, Task, TaskDependency, ProjectKPI
+from src.models.migrations import MIGRATIONS, run_migrations
+
+QUERIES = {
+    'tarefas do projeto (order_index)': 'SELECT id FROM task WHERE project_id = 50 ORDER BY order_index, id LIMIT 100',
+    'tarefas por status': "SELECT count(*) FROM task WHERE project_id = 50 AND status = 'done'",
+    'tarefas do responsável': 'SELECT id FROM task WHERE assigned_to = 3',
+    'subtarefas': 'SELECT id FROM task WHERE parent_task_id = 1234',
+    'projetos do usuário': 'SELECT id FROM project WHERE user_id = 2 ORDER BY updated_at DESC',
+    'contagem de KPIs': 'SELECT count(*) FROM project_kpi WHERE project_id = 50',
+    'dependências da tarefa': 'SELECT depends_on_task_id FROM task_dependency WHERE task_id = 1234',
+}
+
+
+def seed(connection, projects, tasks_per_project):
+    connection.exec_driver_sql("INSERT INTO user (id, username, email) VALUES (1, 'u1', 'u1@x.com'), (2, 'u2', 'u2@x.com'), (3, 'u3', 'u3@x.com')")
+    connection.exec_driver_sql(
+        'INSERT INTO project (id, name, user_id, updated_at) VALUES (?, ?, ?, ?)',
+        [(p, f'Projeto {p}', p % 3 + 1, f'2025-01-{p % 28 + 1:02d}') for p in range(1, projects + 1)]
+    )
+    statuses = ('todo', 'in_progress', 'done', 'blocked')
+    task_rows = []
+    task_id = 0
+    for p in range(1, projects + 1):
+        for i in range(tasks_per_project):
+            task_id += 1
+            parent = task_id - i if i else None
+            task_rows.append((task_id, f'Tarefa {task_id}', statuses[task_id % 4], p, task_id % 3 + 1, parent, i))
+    connection.exec_driver_sql(
+        'INSERT INTO task (id, title, status, project_id, assigned_to, parent_task_id, order_index) VALUES (?, ?, ?, ?, ?, ?, ?)',
+        task_rows
+    )
+    connection.exec_driver_sql(
+        'INSERT INTO task_dependency (task_id, depends_on_task_id) VALUES (?, ?)',
+        [(t, t - 1) for t in range(2, task_id + 1)]
+    )
+    connection.exec_driver_sql(
+        "INSERT INTO project_kpi (project_id, kpi_type) VALUES (?, 'cost')",
+        [(p,) for p in range(1, projects + 1) for _ in range(4)]
+    )
+
+
+def report(connection, label):
+    print(f'\n== {label} ==')
+    for name, sql in QUERIES.items():
+        plan = ' | '.join(row[3] for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}'))
+        start = time.perf_counter()
+        for _ in range(20):
+            connection.exec_driver_sql(sql).fetchall()
+        elapsed = (time.perf_counter() - start) / 20 * 1000
+        print(f'{name:34s} {elapsed:8.3f} ms  {plan}')
+
+
+def main():
+    projects = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    tasks_per_project = int(sys.argv[2]) if len(sys.argv) > 2 else 250
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        db.init_app(app)
+        with app.app_context():
+            db.create_all()
+            with db.engine.begin() as connection:
+                # Simula um banco criado antes dos índices
+                for _, _, statements in MIGRATIONS:
+                    for statement in statements:
+                        if isinstance(statement, str) and statement.startswith('CREATE INDEX IF NOT EXISTS '):
+                            name = statement.split()[5]
+                            connection.exec_driver_sql(f'DROP INDEX IF EXISTS {name}')
+                seed(connection, projects, tasks_per_project)
+            print(f'{projects} projetos, {projects * tasks_per_project} tarefas')
+
+            with db.engine.connect() as connection:
+                report(connection, 'sem índices')
+            start = time.perf_counter()
+            applied = run_migrations()
+            print(f'\nmigrações aplicadas: {applied} em {(time.perf_counter() - start) * 1000:.1f} ms')
+            with db.engine.connect() as connection:
+                report(connection, 'com índices')
+
+
+if __name__ == '__main__':
+    main()
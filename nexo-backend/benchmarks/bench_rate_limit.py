@@ -0,0 +1,67 @@
+"""Teste de carga do rate limiter: custo por verificação nos backends em memória e SQLite.
+
+Uso: python benchmarks/bench_rate_limit.py [verificações por worker] [workers]
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.middleware.rate_limit import MemoryBackend, SQLiteBackend
+
+
+def hammer(backend, checks, worker):
+    for i in range(checks):
+        backend.hit(f'default:10.0.{worker}.{i % 256}', 600, 60)
+
+
+def run_threads(backend, checks, workers):
+    threads = [threading.Thread(target=hammer, args=(backend, checks, w)) for w in range(workers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def process_worker(path, checks, worker):
+    hammer(SQLiteBackend(path), checks, worker)
+
+
+def run_processes(path, checks, workers):
+    processes = [multiprocessing.Process(target=process_worker, args=(path, checks, w)) for w in range(workers)]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    return time.perf_counter() - start
+
+
+def report(label, elapsed, total):
+    print(f'{label:40s} {elapsed / total * 1e6:8.2f} µs/verificação  ({total / elapsed:,.0f} verificações/s)')
+
+
+def main():
+    checks = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    memory = MemoryBackend()
+    report('memória, 1 thread', run_threads(memory, checks, 1), checks)
+    report(f'memória, {workers} threads', run_threads(memory, checks, workers), checks * workers)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'ratelimit.db')
+        sqlite = SQLiteBackend(path)
+        report('SQLite, 1 thread', run_threads(sqlite, checks, 1), checks)
+        report(f'SQLite, {workers} threads', run_threads(sqlite, checks, workers), checks * workers)
+        report(f'SQLite, {workers} processos (arquivo compartilhado)', run_processes(path, checks, workers), checks * workers)
+
+
+if __name__ == '__main__':
+    main()
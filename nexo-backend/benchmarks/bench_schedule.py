@@ -0,0 +1,63 @@
+"""Benchmark do caminho crítico: motor puro e endpoint /projects/<id>/schedule.
+
+Uso: python benchmarks/bench_schedule.py [tarefas]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from src.models.user import db
+from src.models.project import Project, Task, TaskDependency, ProjectKPI
+from src.routes.project import project_bp
+from src.services.scheduling import DEPENDENCY_TYPES, critical_path
+
+
+def random_graph(n, max_deps=3, seed=42):
+    rng = random.Random(seed)
+    durations = {i: rng.randint(1, 40) / 8 for i in range(1, n + 1)}
+    dependencies = []
+    for task_id in range(2, n + 1):
+        for depends_on in rng.sample(range(max(1, task_id - 500), task_id), min(task_id - 1, rng.randint(0, max_deps))):
+            dependencies.append((task_id, depends_on, rng.choice(DEPENDENCY_TYPES)))
+    return durations, dependencies
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    durations, dependencies = random_graph(n)
+    print(f'{n} tarefas, {len(dependencies)} dependências')
+
+    start = time.perf_counter()
+    _, duration, critical = critical_path(durations, dependencies)
+    print(f'motor CPM: {(time.perf_counter() - start) * 1000:.1f} ms '
+          f'(duração {duration:.1f} dias, {len(critical)} tarefas críticas)')
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.register_blueprint(project_bp, url_prefix='/api')
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql("INSERT INTO user (id, username, email) VALUES (1, 'u', 'u@x.com')")
+            connection.exec_driver_sql("INSERT INTO project (id, name, user_id) VALUES (1, 'bench', 1)")
+            connection.exec_driver_sql(
+                "INSERT INTO task (id, title, project_id, estimated_hours) VALUES (?, 't', 1, ?)",
+                [(task_id, d * 8) for task_id, d in durations.items()]
+            )
+            connection.exec_driver_sql(
+                'INSERT INTO task_dependency (task_id, depends_on_task_id, dependency_type) VALUES (?, ?, ?)',
+                dependencies
+            )
+    client = app.test_client()
+    start = time.perf_counter()
+    response = client.get('/api/projects/1/schedule')
+    print(f'endpoint (consultas + CPM + JSON): {(time.perf_counter() - start) * 1000:.1f} ms, status {response.status_code}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Vazão do SQLite com N threads escrevendo e M lendo, com e sem a camada de configuração do banco.
+
+"padrão" usa o SQLite como o main.py usava (sem pragmas, BEGIN implícito do
+driver, uma única conexão para leitura e escrita); "configurado" usa WAL,
+busy_timeout, BEGIN IMMEDIATE nas escritas e o pool de leitura dos GETs.
+
+Uso: python benchmarks/bench_sqlite_concurrency.py [escritores] [leitores] [segundos]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from src.models.user import db, User
+from src.models.project import Project, ProjectStats
+from src.models.database import init_database
+from src.routes.project import project_bp
+
+SCENARIOS = {
+    'padrão': {'SQLITE_PRAGMAS': {}, 'SQLITE_BEGIN_IMMEDIATE': False, 'DATABASE_READ_REPLICA': False},
+    'configurado': {}
+}
+
+
+def make_app(path, config):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{path}'
+    app.config.update(config)
+    app.register_blueprint(project_bp, url_prefix='/api')
+    init_database(app, db)
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench', email='bench@example.com')
+        db.session.add(user)
+        db.session.flush()
+        project = Project(name='Bench', user_id=user.id, stats=ProjectStats())
+        db.session.add(project)
+        db.session.commit()
+        return app, project.id
+
+
+def run(app, project_id, writers, readers, seconds):
+    counts = {'write': 0, 'read': 0, 'error': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker(kind):
+        client = app.test_client()
+        done = errors = 0
+        while time.perf_counter() < deadline:
+            try:
+                if kind == 'write':
+                    response = client.post(f'/api/projects/{project_id}/tasks', json={'title': 'x', 'estimated_hours': 2})
+                else:
+                    response = client.get(f'/api/projects/{project_id}/tasks?limit=50')
+                ok = response.status_code < 400
+            except Exception:
+                ok = False
+            if ok:
+                done += 1
+            else:
+                errors += 1
+        with lock:
+            counts[kind] += done
+            counts['error'] += errors
+
+    threads = [threading.Thread(target=worker, args=('write',)) for _ in range(writers)]
+    threads += [threading.Thread(target=worker, args=('read',)) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counts
+
+
+def main():
+    writers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 5
+    print(f'{writers} escritores, {readers} leitores, {seconds:g}s por cenário')
+    for name, config in SCENARIOS.items():
+        with tempfile.TemporaryDirectory() as directory:
+            app, project_id = make_app(os.path.join(directory, 'bench.db'), config)
+            counts = run(app, project_id, writers, readers, seconds)
+            with app.app_context():
+                for engine in db.engines.values():
+                    engine.dispose()
+        print(
+            f"{name:12} escritas/s {counts['write'] / seconds:8.1f}   leituras/s {counts['read'] / seconds:8.1f}   "
+            f"erros {counts['error']}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""Árvore de tarefas (GET /projects/<id>/tasks/tree) em hierarquias de 10 níveis.
+
+Monta projetos com N tarefas distribuídas em 10 níveis (cada nível com o
+dobro de nós do anterior, pais sorteados no nível de cima) num SQLite em
+arquivo, reconcilia o progresso derivado e mede a consulta recursiva, a
+montagem da árvore e a requisição completa. Confere contagem, profundidade
+e os totais acumulados (horas e progresso das folhas) contra somas diretas
+e contra o progresso gravado no projeto; sai com código 1 se algo não bater. Para o menor tamanho
+compara com o caminho antigo, Task.to_dict() por nó (uma consulta por
+subtasks).
+
+Uso: python benchmarks/bench_task_tree.py [tarefas ...]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.app import create_app
+from src.models.user import db, User
+from src.models.project import Project, ProjectStats, Task
+from src.models.migrations import upgrade_schema
+from src.services.progress import reconcile_progress
+from src.services.task_tree import build_task_tree, task_tree_query
+
+LEVELS = 10
+REPEATS = 5
+BASELINE_MAX_TASKS = 10000
+
+
+def seed_tree(size, rng):
+    """Insere size tarefas em LEVELS níveis e devolve (projeto, horas estimadas, horas ponderadas) das folhas"""
+    user = User(username=f'bench{size}', email=f'bench{size}@example.com')
+    db.session.add(user)
+    db.session.flush()
+    project = Project(name=f'Bench {size}', user_id=user.id)
+    project.stats = ProjectStats()
+    db.session.add(project)
+    db.session.flush()
+
+    weights = [2 ** level for level in range(LEVELS)]
+    counts = [max(1, size * weight // sum(weights)) for weight in weights]
+    counts[-1] += size - sum(counts)
+    next_id = (db.session.query(db.func.max(Task.id)).scalar() or 0) + 1
+    rows, previous = [], []
+    for level, count in enumerate(counts):
+        current = list(range(next_id, next_id + count))
+        next_id += count
+        for task_id in current:
+            estimated = rng.choice((0, 1, 2, 4, 8))
+            progress = rng.choice((0.0, 25.0, 50.0, 100.0))
+            rows.append({
+                'id': task_id,
+                'title': f'Tarefa {task_id}',
+                'project_id': project.id,
+                'parent_task_id': rng.choice(previous) if previous else None,
+                'status': 'done' if progress == 100.0 else 'todo',
+                'estimated_hours': estimated,
+                'actual_hours': 0.0,
+                'progress': progress,
+                'order_index': rng.randrange(100)
+            })
+        previous = current
+    db.session.execute(db.insert(Task), rows)
+    db.session.commit()
+    parents = {row['parent_task_id'] for row in rows}
+    leaves = [row for row in rows if row['id'] not in parents]
+    estimated_total = sum(row['estimated_hours'] for row in leaves)
+    weighted_total = sum(row['estimated_hours'] * row['progress'] for row in leaves)
+    return project.id, estimated_total, weighted_total
+
+
+def median_ms(function):
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        result = function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return sorted(timings)[REPEATS // 2], result
+
+
+def check(condition, message, failures):
+    if not condition:
+        failures.append(message)
+
+
+def main():
+    sizes = [int(value) for value in sys.argv[1:]] or [10000, 100000]
+    directory = tempfile.mkdtemp(prefix='nexo-tree-')
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.join(directory, "bench.db")}',
+        'RATELIMIT_ENABLED': False
+    })
+    client = app.test_client()
+    failures = []
+    try:
+        with app.app_context():
+            upgrade_schema()
+            rng = random.Random(42)
+            for size in sizes:
+                project_id, estimated_total, weighted_total = seed_tree(size, rng)
+                started = time.perf_counter()
+                reconcile_progress(db.session.connection(), [project_id])
+                db.session.commit()
+                reconcile_ms = (time.perf_counter() - started) * 1000
+                query = task_tree_query(project_id)
+                db.session.execute(query).all()
+
+                query_ms, rows = median_ms(lambda: db.session.execute(query).all())
+                build_ms, (roots, rollup, nodes) = median_ms(lambda: build_task_tree(rows))
+                request_ms, response = median_ms(lambda: client.get(f'/api/projects/{project_id}/tasks/tree'))
+                print(
+                    f'{size:7} tarefas  consulta {query_ms:7.1f} ms   montagem {build_ms:7.1f} ms   '
+                    f'requisição {request_ms:7.1f} ms   ({len(response.data) / 1024 / 1024:.1f} MB)   '
+                    f'reconciliação {reconcile_ms:7.1f} ms'
+                )
+
+                body = response.get_json()
+                check(response.status_code == 200, f'{size}: status {response.status_code}', failures)
+                check(nodes == size and body['count'] == size and body['detached'] == 0,
+                      f'{size}: {nodes} nós na árvore', failures)
+                check(max(row.depth for row in rows) == LEVELS - 1, f'{size}: profundidade errada', failures)
+                check(sum(root['rollup']['tasks'] for root in roots) == size, f'{size}: totais das raízes', failures)
+                check(abs(rollup['estimated_hours'] - round(estimated_total, 2)) < 0.01, f'{size}: horas', failures)
+                expected = weighted_total / estimated_total if estimated_total else 0.0
+                check(abs(rollup['progress'] - round(expected, 2)) < 0.01, f'{size}: progresso ponderado', failures)
+                stored = db.session.get(Project, project_id).progress
+                check(abs(stored - rollup['progress']) < 0.01, f'{size}: progresso gravado {stored}', failures)
+
+                if size <= BASELINE_MAX_TASKS:
+                    def per_node():
+                        db.session.expire_all()
+                        return [task.to_dict() for task in Task.query.filter_by(project_id=project_id)]
+                    baseline_ms, _ = median_ms(per_node)
+                    print(f'{"":7}          to_dict por nó (N+1) {baseline_ms:7.1f} ms')
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    for failure in failures:
+        print(f'FALHA: {failure}')
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+import os
+from flask import Flask
+
+STATIC_FOLDER = os.path.join(os.path.dirname(__file__), 'static')
+
+
+def _env_flag(name):
+    return os.environ.get(name, '').lower() in ('1', 'true', 'yes')
+
+
+def create_app(config=None):
+    """Cria e configura a aplicação Flask.
+
+    Importar este módulo só carrega o Flask: modelos, blueprints e
+    middlewares são importados aqui dentro. Nenhuma conexão com o banco é
+    aberta na criação; o schema é criado por `flask db upgrade` (ou, com
+    AUTO_CREATE_SCHEMA, na primeira requisição). config sobrescreve
+    qualquer valor padrão.
+    """
+    from flask_cors import CORS
+    from src.models.user import db
+    from src.models.database import init_database
+    from src.models.migrations import db_cli, init_schema_on_first_request
+    from src.middleware.security import SecurityMiddleware
+    from src.services.events import EventBus
+    from src.services.jobs import JobExecutor
+    from src.utils.assets import StaticAssets, assets_cli
+
+    app = Flask(__name__, static_folder=STATIC_FOLDER)
+    app.config['SECRET_KEY'] = 'nexo-secret-key-2025-production'
+
+    # Rate limiting por IP: (requisições, janela em segundos). Com vários workers,
+    # use RATELIMIT_STORAGE=sqlite:///caminho/ratelimit.db para compartilhar os contadores.
+    app.config['RATELIMIT_STORAGE'] = os.environ.get('RATELIMIT_STORAGE', 'memory')
+    app.config['RATELIMIT_DEFAULT'] = (600, 60)
+    app.config['RATELIMIT_RULES'] = {
+        'auth': (30, 60),
+        'ai': (60, 60)
+    }
+    # Quantos proxies reversos (nginx, balanceador) ficam na frente da aplicação; o IP do
+    # cliente é o endereço que o mais externo deles registrou em X-Forwarded-For
+    app.config['TRUSTED_PROXIES'] = int(os.environ.get('TRUSTED_PROXIES') or 0)
+    app.config['AUTO_CREATE_SCHEMA'] = _env_flag('AUTO_CREATE_SCHEMA')
+    # Listagens completas quando a requisição não envia limit nem cursor (clientes antigos)
+    app.config['UNPAGINATED_LISTS'] = _env_flag('UNPAGINATED_LISTS')
+    if os.environ.get('IMPORT_MAX_CONTENT_LENGTH'):
+        app.config['IMPORT_MAX_CONTENT_LENGTH'] = int(os.environ['IMPORT_MAX_CONTENT_LENGTH'])
+
+    if config:
+        app.config.from_mapping(config)
+
+    # Configurar CORS para permitir comunicação com o frontend
+    CORS(app, origins=['http://localhost:5173', 'http://localhost:3000'], supports_credentials=True)
+
+    # Inicializar middleware de segurança
+    SecurityMiddleware(app)
+
+    # Jobs em segundo plano (Prefer: respond-async nos endpoints de IA); o pool nasce no primeiro job
+    JobExecutor(app)
+
+    # Pub/sub dos streams SSE (GET /projects/<id>/events); o backend nasce no primeiro uso
+    EventBus(app)
+
+    register_blueprints(app)
+
+    # Comandos de manutenção (flask --app src.main db upgrade, stats rebuild|check,
+    # history rebuild|backfill, progress reconcile, data import arquivo.ndjson, assets compress)
+    from src.services.stats import stats_cli
+    from src.services.progress import progress_cli
+    from src.services.history import history_cli
+    from src.services.importer import data_cli
+    app.cli.add_command(db_cli)
+    app.cli.add_command(stats_cli)
+    app.cli.add_command(history_cli)
+    app.cli.add_command(progress_cli)
+    app.cli.add_command(data_cli)
+    app.cli.add_command(assets_cli)
+
+    # Configuração do banco de dados (DATABASE_URL, pragmas do SQLite, pools e conexões de leitura).
+    # Só cria os engines; a primeira conexão acontece na primeira consulta.
+    init_database(app, db)
+    if app.config['AUTO_CREATE_SCHEMA']:
+        init_schema_on_first_request(app)
+
+    # Frontend compilado: manifesto montado no primeiro acesso, sem acesso ao disco depois disso
+    static_assets = StaticAssets(app)
+
+    @app.route('/', defaults={'path': ''})
+    @app.route('/<path:path>')
+    def serve(path):
+        return static_assets.serve(path)
+
+    # Rota de health check
+    @app.route('/api/health')
+    def health_check():
+        return {'status': 'ok', 'message': 'Nexo API is running'}
+
+    return app
+
+
+def register_blueprints(app):
+    from src.routes.user import user_bp
+    from src.routes.auth import auth_bp
+    from src.routes.project import project_bp
+    from src.routes.ai import ai_bp
+    from src.routes.jobs import jobs_bp
+
+    app.register_blueprint(user_bp, url_prefix='/api')
+    app.register_blueprint(auth_bp, url_prefix='/api')
+    app.register_blueprint(project_bp, url_prefix='/api')
+    app.register_blueprint(ai_bp, url_prefix='/api')
+    app.register_blueprint(jobs_bp, url_prefix='/api')
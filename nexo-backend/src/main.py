@@ -3,60 +3,15 @@ import sys
 # DON'T CHANGE THIS !!!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory
-from flask_cors import CORS
-from src.models.user import db
-from src.models.project import Project, Task, TaskDependency, ProjectKPI
-from src.routes.user import user_bp
-from src.routes.auth import auth_bp
-from src.routes.project import project_bp
-from src.routes.ai import ai_bp
-from src.middleware.security import SecurityMiddleware
+from src.app import create_app
 
-app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
-app.config['SECRET_KEY'] = 'nexo-secret-key-2025-production'
-
-# Configurar CORS para permitir comunicação com o frontend
-CORS(app, origins=['http://localhost:5173', 'http://localhost:3000'], supports_credentials=True)
-
-# Inicializar middleware de segurança
-security = SecurityMiddleware(app)
-
-# Registrar blueprints
-app.register_blueprint(user_bp, url_prefix='/api')
-app.register_blueprint(auth_bp, url_prefix='/api')
-app.register_blueprint(project_bp, url_prefix='/api')
-app.register_blueprint(ai_bp, url_prefix='/api')
-
-# Configuração do banco de dados
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db.init_app(app)
-
-# Criar tabelas
-with app.app_context():
-    db.create_all()
-
-@app.route('/', defaults={'path': ''})
-@app.route('/<path:path>')
-def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
-            return "Static folder not configured", 404
-
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
-        else:
-            return "index.html not found", 404
-
-# Rota de health check
-@app.route('/api/health')
-def health_check():
-    return {'status': 'ok', 'message': 'Nexo API is running'}
+# Ponto de entrada do gunicorn/serverless (src.main:app). Criar a aplicação
+# não toca no banco: o schema é criado/migrado com `flask --app src.main db upgrade`.
+app = create_app()
 
 if __name__ == '__main__':
+    # Em desenvolvimento o schema é criado/migrado antes de subir o servidor
+    from src.models.migrations import upgrade_schema
+    with app.app_context():
+        upgrade_schema()
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,142 @@
+from collections import OrderedDict, namedtuple
+import math
+import os
+import sqlite3
+import threading
+import time
+
+RateLimitResult = namedtuple('RateLimitResult', ['allowed', 'limit', 'remaining', 'reset_after', 'retry_after'])
+
+
+def _result(allowed, tokens, limit, window):
+    """Monta o resultado de uma verificação a partir do saldo do balde"""
+    rate = limit / window
+    return RateLimitResult(
+        allowed=allowed,
+        limit=limit,
+        remaining=max(0, int(tokens)),
+        reset_after=math.ceil((limit - tokens) / rate),
+        retry_after=0 if allowed else max(1, math.ceil((1 - tokens) / rate))
+    )
+
+
+class MemoryBackend:
+    """Token bucket em memória do processo, O(1) por verificação.
+
+    Cada chave guarda (saldo, instante da última verificação); o saldo é
+    reabastecido proporcionalmente ao tempo decorrido. Os baldes menos
+    usados são descartados acima de max_keys (voltam cheios).
+    """
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key, limit, window, now=None):
+        now = time.time() if now is None else now
+        rate = limit / window
+        with self._lock:
+            state = self._buckets.get(key)
+            tokens = limit if state is None else min(limit, state[0] + (now - state[1]) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return _result(allowed, tokens, limit, window)
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteBackend:
+    """Token bucket compartilhado entre workers por um arquivo SQLite local.
+
+    Cada verificação é um único UPSERT ... RETURNING (atômico no SQLite, que
+    serializa escritores), então processos diferentes enxergam o mesmo saldo
+    sem Redis. As expressões do SET são avaliadas sobre a linha antiga, o que
+    permite calcular o saldo novo e a decisão na mesma instrução. O arquivo
+    usa WAL e synchronous=OFF: perder contadores numa queda é aceitável.
+    A cada PURGE_EVERY verificações deste processo, os baldes parados há mais
+    que a maior janela vista são apagados: já estariam cheios, o mesmo que
+    não existir.
+    """
+
+    PURGE_EVERY = 1000
+
+    UPSERT = (
+        'INSERT INTO rate_limit_bucket (key, tokens, updated, allowed) VALUES (:key, :limit - 1, :now, 1) '
+        'ON CONFLICT(key) DO UPDATE SET '
+        'tokens = CASE WHEN min(:limit, tokens + (:now - updated) * :rate) >= 1 '
+        'THEN min(:limit, tokens + (:now - updated) * :rate) - 1 '
+        'ELSE min(:limit, tokens + (:now - updated) * :rate) END, '
+        'allowed = min(:limit, tokens + (:now - updated) * :rate) >= 1, '
+        'updated = :now '
+        'RETURNING tokens, allowed'
+    )
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._hits = 0
+        self._max_window = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS rate_limit_bucket ('
+            'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, allowed INTEGER NOT NULL)'
+        )
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, isolation_level=None, timeout=5)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=OFF')
+            self._local.connection = connection
+        return connection
+
+    def hit(self, key, limit, window, now=None):
+        now = time.time() if now is None else now
+        connection = self._connection()
+        tokens, allowed = connection.execute(
+            self.UPSERT, {'key': key, 'limit': limit, 'rate': limit / window, 'now': now}
+        ).fetchone()
+        with self._lock:
+            self._hits += 1
+            self._max_window = max(self._max_window, window)
+            purge = self._hits % self.PURGE_EVERY == 0
+        if purge:
+            self.purge(now - self._max_window)
+        return _result(bool(allowed), tokens, limit, window)
+
+    def purge(self, older_than):
+        """Remove baldes sem uso desde older_than (timestamp)"""
+        self._connection().execute('DELETE FROM rate_limit_bucket WHERE updated < ?', (older_than,))
+
+    def reset(self):
+        self._connection().execute('DELETE FROM rate_limit_bucket')
+
+
+def create_backend(storage):
+    """Backend a partir da configuração: 'memory' ou 'sqlite:///caminho/arquivo.db'"""
+    if not storage or storage == 'memory':
+        return MemoryBackend()
+    if storage.startswith('sqlite:///'):
+        return SQLiteBackend(storage[len('sqlite:///'):])
+    raise ValueError(f'Backend de rate limit não suportado: {storage}')
+
+
+def rate_limit_headers(response, result):
+    """Headers X-RateLimit-* (e Retry-After quando bloqueado)"""
+    response.headers['X-RateLimit-Limit'] = str(result.limit)
+    response.headers['X-RateLimit-Remaining'] = str(result.remaining)
+    response.headers['X-RateLimit-Reset'] = str(result.reset_after)
+    if not result.allowed:
+        response.headers['Retry-After'] = str(result.retry_after)
+    return response
@@ -1,8 +1,119 @@
-from flask import request, jsonify, g
+from flask import request, jsonify, g, current_app, make_response
+from collections.abc import Mapping, Sequence
 from functools import wraps
+from werkzeug.local import LocalProxy
+from werkzeug.middleware.proxy_fix import ProxyFix
 import re
 import html
 from src.routes.auth import verify_token
+from src.middleware.rate_limit import MemoryBackend, create_backend, rate_limit_headers
+from src.middleware.validation import compile_schema
+
+# Backend usado pelo decorator rate_limit quando o middleware não foi inicializado
+_default_backend = MemoryBackend()
+
+# Padrões de sanitização compilados uma única vez
+SCRIPT_TAG_PATTERN = re.compile(r'<script[^>]*>.*?</script>', re.IGNORECASE | re.DOTALL)
+EVENT_HANDLER_PATTERN = re.compile(r'on\w+\s*=\s*["\'][^"\']*["\']', re.IGNORECASE)
+# Strings sem nenhum destes caracteres já saem intactas da sanitização
+UNSAFE_CHARS_PATTERN = re.compile(r'[<>&"\']')
+# Conteúdo de strings JSON, removido antes de medir o aninhamento
+JSON_STRING_PATTERN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+NON_BRACKET_BYTES = bytes(set(range(256)) - set(b'[]{}'))
+# Objetos e listas contam igual para o aninhamento: { e } viram [ e ], e um único
+# replace(b'[]', b'') remove exatamente uma camada (não reavalia o que ele mesmo junta)
+BRACKETS_AS_LISTS = bytes.maketrans(b'{}', b'[]')
+
+DEFAULT_MAX_BODY_SIZE = 5 * 1024 * 1024
+DEFAULT_IMPORT_MAX_BODY_SIZE = 200 * 1024 * 1024
+DEFAULT_MAX_JSON_DEPTH = 32
+
+# Corpos lidos em streaming pelos handlers, sem passar pela checagem de JSON
+STREAM_CONTENT_TYPES = ('application/x-ndjson', 'text/csv')
+
+def sanitize_string(value):
+    """Sanitizar uma string para prevenir XSS"""
+    if not UNSAFE_CHARS_PATTERN.search(value):
+        return value
+    # Escapar HTML
+    sanitized = html.escape(value)
+    # Remover scripts maliciosos
+    sanitized = SCRIPT_TAG_PATTERN.sub('', sanitized)
+    # Remover eventos JavaScript
+    sanitized = EVENT_HANDLER_PATTERN.sub('', sanitized)
+    return sanitized
+
+def sanitize_value(value):
+    """Sanitiza strings na hora; objetos e listas viram visões sanitizadas sob demanda"""
+    if isinstance(value, str):
+        return sanitize_string(value)
+    if isinstance(value, dict):
+        return SanitizedDict(value)
+    if isinstance(value, list):
+        return SanitizedList(value)
+    return value
+
+class SanitizedDict(Mapping):
+    """Visão somente leitura de um objeto JSON que sanitiza cada campo só quando ele é lido"""
+    
+    def __init__(self, data):
+        self._data = data
+        self._cache = {}
+    
+    def __getitem__(self, key):
+        if key not in self._cache:
+            self._cache[key] = sanitize_value(self._data[key])
+        return self._cache[key]
+    
+    def __iter__(self):
+        return iter(self._data)
+    
+    def __len__(self):
+        return len(self._data)
+
+class SanitizedList(Sequence):
+    """Visão somente leitura de uma lista JSON que sanitiza cada item só quando ele é lido"""
+    
+    def __init__(self, data):
+        self._data = data
+        self._cache = {}
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._data)))]
+        if index < 0:
+            index += len(self._data)
+        if index not in self._cache:
+            self._cache[index] = sanitize_value(self._data[index])
+        return self._cache[index]
+    
+    def __len__(self):
+        return len(self._data)
+
+def sanitized_json():
+    """JSON da requisição como visão sanitizada sob demanda (memorizada por requisição)"""
+    if 'sanitized_json' not in g:
+        g.sanitized_json = sanitize_value(request.get_json(silent=True))
+    return g.sanitized_json
+
+def json_depth_exceeds(raw, max_depth):
+    """Verifica, sem parsear, se o JSON bruto aninha objetos/listas além de max_depth.
+
+    Remove o conteúdo das strings, mantém só os delimitadores (todos como
+    colchetes) e elimina os pares internos uma camada por vez; cada camada
+    é uma passada em C sobre os bytes, e no máximo max_depth passadas são feitas.
+    """
+    if raw.count(b'[') + raw.count(b'{') <= max_depth:
+        return False
+    brackets = JSON_STRING_PATTERN.sub(b'', raw).translate(BRACKETS_AS_LISTS, NON_BRACKET_BYTES)
+    for _ in range(max_depth):
+        if not brackets:
+            return False
+        reduced = brackets.replace(b'[]', b'')
+        if reduced == brackets:
+            return False  # JSON malformado; o parser reporta o erro
+        brackets = reduced
+    return bool(brackets)
 
 class SecurityMiddleware:
     """Middleware de segurança para proteger contra vulnerabilidades comuns"""
@@ -14,26 +125,82 @@ class SecurityMiddleware:
     
     def init_app(self, app):
         """Inicializar middleware com a aplicação Flask"""
+        # Rate limiting: RATELIMIT_RULES mapeia endpoint ('auth.login') ou
+        # blueprint ('auth') para (max_requests, janela em segundos);
+        # RATELIMIT_DEFAULT vale para as demais rotas da API (None = sem limite).
+        app.config.setdefault('RATELIMIT_ENABLED', True)
+        app.config.setdefault('RATELIMIT_STORAGE', 'memory')
+        app.config.setdefault('RATELIMIT_DEFAULT', None)
+        app.config.setdefault('RATELIMIT_RULES', {})
+        app.extensions['rate_limiter'] = create_backend(app.config['RATELIMIT_STORAGE'])
+        # Proxies reversos na frente da aplicação: só com TRUSTED_PROXIES > 0 o
+        # X-Forwarded-For é lido, e apenas os saltos acrescentados por esses proxies
+        # (o que o cliente envia no cabeçalho é ignorado)
+        app.config.setdefault('TRUSTED_PROXIES', 0)
+        if app.config['TRUSTED_PROXIES']:
+            hops = app.config['TRUSTED_PROXIES']
+            app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+        # Limites de corpo verificados antes do parse do JSON
+        # (MAX_CONTENT_LENGTH é aplicado pelo próprio Werkzeug, inclusive em uploads chunked)
+        app.config.setdefault('MAX_CONTENT_LENGTH', DEFAULT_MAX_BODY_SIZE)
+        # Importações em streaming têm limite próprio, maior que o geral
+        app.config.setdefault('IMPORT_MAX_CONTENT_LENGTH', DEFAULT_IMPORT_MAX_BODY_SIZE)
+        app.config.setdefault('MAX_JSON_DEPTH', DEFAULT_MAX_JSON_DEPTH)
+        
         app.before_request(self.before_request)
         app.after_request(self.after_request)
     
     def before_request(self):
         """Executado antes de cada requisição"""
-        # Validar Content-Type para requisições POST/PUT
+        # Rate limiting por IP, antes de qualquer outro processamento
+        if '/api/' in request.path and current_app.config['RATELIMIT_ENABLED']:
+            blocked = self.check_rate_limit()
+            if blocked is not None:
+                return blocked
+        
+        # Validar Content-Type para requisições POST/PUT (importações aceitam NDJSON e CSV em streaming)
         if request.method in ['POST', 'PUT', 'PATCH']:
-            if not request.is_json and request.content_type != 'application/json':
+            if not request.is_json and request.mimetype not in STREAM_CONTENT_TYPES:
                 if '/api/' in request.path:
                     return jsonify({'error': 'Content-Type deve ser application/json'}), 400
         
-        # Sanitizar dados de entrada
-        if request.is_json and request.json:
-            g.sanitized_data = self.sanitize_input(request.json)
+        if request.is_json:
+            max_length = current_app.config['MAX_CONTENT_LENGTH']
+            if max_length and request.content_length and request.content_length > max_length:
+                return jsonify({'error': 'Corpo da requisição excede o tamanho máximo permitido'}), 413
+            if json_depth_exceeds(request.get_data(cache=True), current_app.config['MAX_JSON_DEPTH']):
+                return jsonify({'error': 'JSON excede a profundidade máxima permitida'}), 400
+            
+            # Sanitizar dados de entrada sob demanda: nada é parseado ou
+            # percorrido até que um handler leia g.sanitized_data
+            g.sanitized_data = LocalProxy(sanitized_json)
+    
+    def check_rate_limit(self):
+        """Aplica a regra de rate limit da rota; devolve a resposta 429 se bloqueada"""
+        rules = current_app.config['RATELIMIT_RULES']
+        if request.endpoint in rules:
+            scope = request.endpoint
+        elif request.blueprint in rules:
+            scope = request.blueprint
+        elif current_app.config['RATELIMIT_DEFAULT']:
+            scope = 'default'
+        else:
+            return None
+        max_requests, window = rules.get(scope) or current_app.config['RATELIMIT_DEFAULT']
         
-        # Rate limiting básico (em produção usar Redis)
-        # Aqui implementaríamos rate limiting por IP
+        result = current_app.extensions['rate_limiter'].hit(f'{scope}:{client_ip()}', max_requests, window)
+        g.rate_limit = result
+        if not result.allowed:
+            return too_many_requests()
+        return None
         
     def after_request(self, response):
         """Executado após cada requisição"""
+        # Headers de rate limit (o decorator rate_limit já define os seus)
+        result = g.get('rate_limit')
+        if result is not None and 'X-RateLimit-Limit' not in response.headers:
+            rate_limit_headers(response, result)
+        
         # Headers de segurança
         response.headers['X-Content-Type-Options'] = 'nosniff'
         response.headers['X-Frame-Options'] = 'DENY'
@@ -45,23 +212,6 @@ class SecurityMiddleware:
         response.headers.pop('Server', None)
         
         return response
-    
-    def sanitize_input(self, data):
-        """Sanitizar dados de entrada para prevenir XSS"""
-        if isinstance(data, dict):
-            return {key: self.sanitize_input(value) for key, value in data.items()}
-        elif isinstance(data, list):
-            return [self.sanitize_input(item) for item in data]
-        elif isinstance(data, str):
-            # Escapar HTML
-            sanitized = html.escape(data)
-            # Remover scripts maliciosos
-            sanitized = re.sub(r'<script[^>]*>.*?</script>', '', sanitized, flags=re.IGNORECASE | re.DOTALL)
-            # Remover eventos JavaScript
-            sanitized = re.sub(r'on\w+\s*=\s*["\'][^"\']*["\']', '', sanitized, flags=re.IGNORECASE)
-            return sanitized
-        else:
-            return data
 
 def require_auth(f):
     """Decorator para exigir autenticação"""
@@ -83,57 +233,49 @@ def require_auth(f):
     return decorated_function
 
 def validate_input(schema):
-    """Decorator para validar entrada baseada em schema"""
+    """Decorator para validar entrada baseada em schema.
+
+    schema pode ser o nome de um schema em SCHEMAS (já compilado) ou um
+    dicionário, compilado uma única vez na decoração. O payload convertido
+    fica em g.validated_data.
+    """
+    validator = VALIDATORS[schema] if isinstance(schema, str) else compile_schema(schema)
+
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
             if not request.is_json:
                 return jsonify({'error': 'Content-Type deve ser application/json'}), 400
             
-            data = request.json
-            errors = []
-            
-            # Validar campos obrigatórios
-            for field in schema.get('required', []):
-                if field not in data or data[field] is None or data[field] == '':
-                    errors.append(f'Campo {field} é obrigatório')
-            
-            # Validar tipos de dados
-            for field, field_type in schema.get('types', {}).items():
-                if field in data and not isinstance(data[field], field_type):
-                    errors.append(f'Campo {field} deve ser do tipo {field_type.__name__}')
-            
-            # Validar tamanhos de string
-            for field, max_length in schema.get('max_lengths', {}).items():
-                if field in data and isinstance(data[field], str) and len(data[field]) > max_length:
-                    errors.append(f'Campo {field} deve ter no máximo {max_length} caracteres')
-            
-            # Validar emails
-            email_fields = schema.get('email_fields', [])
-            email_pattern = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
-            for field in email_fields:
-                if field in data and not email_pattern.match(data[field]):
-                    errors.append(f'Campo {field} deve ser um email válido')
-            
+            parsed, errors = validator(request.get_json(silent=True))
             if errors:
                 return jsonify({'error': 'Dados inválidos', 'details': errors}), 400
             
+            g.validated_data = parsed
             return f(*args, **kwargs)
         
         return decorated_function
     return decorator
 
+def client_ip():
+    """IP do cliente: remote_addr, já corrigido pelo ProxyFix quando há proxies confiáveis (TRUSTED_PROXIES)"""
+    return request.remote_addr
+
+def too_many_requests():
+    return jsonify({'error': 'Limite de requisições excedido, tente novamente mais tarde'}), 429
+
 def rate_limit(max_requests=100, window=3600):
-    """Decorator para rate limiting (versão simplificada)"""
+    """Decorator para rate limiting por IP (token bucket) de uma rota específica"""
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            # Em produção, implementar com Redis
-            # Por agora, apenas log da tentativa
-            client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.remote_addr)
-            print(f"Rate limit check for {client_ip} on {request.endpoint}")
-            
-            return f(*args, **kwargs)
+            backend = current_app.extensions.get('rate_limiter', _default_backend)
+            result = backend.hit(f'{request.endpoint}:{client_ip()}', max_requests, window)
+            if not result.allowed:
+                response = make_response(too_many_requests())
+            else:
+                response = make_response(f(*args, **kwargs))
+            return rate_limit_headers(response, result)
         
         return decorated_function
     return decorator
@@ -164,3 +306,5 @@ SCHEMAS = {
     }
 }
 
+# Validadores compilados uma vez na importação
+VALIDATORS = {name: compile_schema(schema) for name, schema in SCHEMAS.items()}
@@ -0,0 +1,107 @@
+import math
+import re
+
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+
+def _type_name(field_type):
+    if isinstance(field_type, tuple):
+        return ' ou '.join(t.__name__ for t in field_type)
+    return field_type.__name__
+
+
+def _coercer(field_type):
+    """Função que converte um valor para o tipo do campo ou levanta ValueError.
+
+    Números aceitam strings numéricas ('12', '3.5'); campos float aceitam
+    inteiros. Booleanos e floats não finitos (nan, inf) nunca passam como número.
+    """
+    types = field_type if isinstance(field_type, tuple) else (field_type,)
+    accepts_float = float in types
+    accepts_int = int in types
+
+    if types == (str,):
+        def coerce(value):
+            if not isinstance(value, str):
+                raise ValueError
+            return value
+    elif accepts_int or accepts_float:
+        def coerce(value):
+            if isinstance(value, bool):
+                raise ValueError
+            if isinstance(value, int) and accepts_int:
+                return value
+            if isinstance(value, str):
+                if accepts_int and value.strip().lstrip('+-').isdigit():
+                    return int(value)
+                value = float(value) if accepts_float else value
+            if isinstance(value, (int, float)) and accepts_float:
+                value = float(value)
+                if math.isfinite(value):
+                    return value
+            raise ValueError
+    else:
+        def coerce(value):
+            if not isinstance(value, types):
+                raise ValueError
+            return value
+    return coerce
+
+
+def compile_schema(schema):
+    """Compila um schema (required/types/max_lengths/email_fields) em um validador.
+
+    Todo o trabalho de interpretar o dicionário acontece aqui, uma vez; o
+    validador devolvido só percorre tuplas pré-montadas de verificações.
+    validator(data) -> (payload convertido, lista de erros). A ordem das
+    mensagens segue a do validador original: obrigatórios, tipos, tamanhos
+    e emails.
+    """
+    required = tuple(
+        (field, f'Campo {field} é obrigatório') for field in schema.get('required', [])
+    )
+    types = tuple(
+        (field, _coercer(field_type), f'Campo {field} deve ser do tipo {_type_name(field_type)}')
+        for field, field_type in schema.get('types', {}).items()
+    )
+    max_lengths = tuple(
+        (field, max_length, f'Campo {field} deve ter no máximo {max_length} caracteres')
+        for field, max_length in schema.get('max_lengths', {}).items()
+    )
+    email_fields = tuple(
+        (field, f'Campo {field} deve ser um email válido') for field in schema.get('email_fields', [])
+    )
+    match_email = EMAIL_PATTERN.match
+
+    def validate(data):
+        if not isinstance(data, dict):
+            return None, ['Corpo da requisição deve ser um objeto JSON']
+        errors = []
+        for field, message in required:
+            value = data.get(field)
+            if value is None or value == '':
+                errors.append(message)
+
+        parsed = dict(data)
+        for field, coerce, message in types:
+            if field in data:
+                try:
+                    parsed[field] = coerce(data[field])
+                except (TypeError, ValueError):
+                    errors.append(message)
+
+        for field, max_length, message in max_lengths:
+            value = data.get(field)
+            if isinstance(value, str) and len(value) > max_length:
+                errors.append(message)
+
+        for field, message in email_fields:
+            if field in data:
+                value = data[field]
+                if not isinstance(value, str) or not match_email(value):
+                    errors.append(message)
+
+        return parsed, errors
+
+    return validate
+
@@ -0,0 +1,129 @@
+import os
+from flask import g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+# Bind das conexões somente leitura usadas pelos GETs
+READ_BIND_KEY = 'read'
+READ_METHODS = frozenset(('GET', 'HEAD'))
+
+DEFAULT_DATABASE_URI = f"sqlite:///{os.path.join(os.path.dirname(os.path.dirname(__file__)), 'database', 'app.db')}"
+
+# Aplicados em toda conexão SQLite nova (ordem importa: journal_mode antes do resto)
+DEFAULT_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',        # leitores não bloqueiam escritores e vice-versa
+    'synchronous': 'NORMAL',      # seguro com WAL; só o último commit pode se perder numa queda de energia
+    'busy_timeout': 5000,         # ms esperando o lock de escrita antes de 'database is locked'
+    'cache_size': -64000,         # negativo = KiB (64 MB por conexão)
+    'mmap_size': 268435456,       # 256 MB de leitura via mmap
+    'temp_store': 'MEMORY'
+}
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+class RoutingSession(Session):
+    """Sessão que envia as consultas de requisições GET/HEAD para o bind de leitura.
+
+    Escritas (flush e INSERT/UPDATE/DELETE explícitos) continuam na conexão
+    principal mesmo dentro de um GET, então handlers que gravam algo de
+    forma preguiçosa seguem funcionando. Sem bind de leitura configurado,
+    tudo vai para a conexão principal.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._use_read_bind(clause):
+            engine = self._db.engines.get(READ_BIND_KEY)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _use_read_bind(self, clause):
+        if self._flushing or not has_request_context() or request.method not in READ_METHODS:
+            return False
+        if clause is not None and getattr(clause, 'is_dml', False):
+            return False
+        return not g.get('use_primary_database', False)
+
+
+def use_primary_database():
+    """Força a conexão principal no restante da requisição (ex.: ler o que acabou de ser gravado)"""
+    g.use_primary_database = True
+
+
+def is_sqlite_file(uri):
+    return uri.startswith('sqlite:') and uri not in ('sqlite://', 'sqlite:///:memory:') and 'mode=memory' not in uri
+
+
+def configure_database(app):
+    """Preenche a configuração do banco a partir do ambiente, sem sobrescrever valores explícitos.
+
+    DATABASE_URL define a URI principal e DATABASE_READ_URL a de leitura; em
+    SQLite com arquivo, a leitura usa o mesmo arquivo por um pool próprio.
+    DB_POOL_SIZE, DB_MAX_OVERFLOW e DB_POOL_TIMEOUT dimensionam os pools.
+    """
+    uri = app.config.setdefault('SQLALCHEMY_DATABASE_URI', os.environ.get('DATABASE_URL', DEFAULT_DATABASE_URI))
+    app.config.setdefault('SQLALCHEMY_TRACK_MODIFICATIONS', False)
+    app.config.setdefault('SQLITE_PRAGMAS', dict(DEFAULT_SQLITE_PRAGMAS))
+    # Escritas começam com BEGIN IMMEDIATE: o lock é pedido no início da transação,
+    # quando o busy_timeout ainda pode esperar, e não num upgrade de leitura para escrita
+    app.config.setdefault('SQLITE_BEGIN_IMMEDIATE', True)
+
+    if not uri.startswith('sqlite') or is_sqlite_file(uri):
+        pool = {
+            'pool_size': _env_int('DB_POOL_SIZE', 5),
+            'max_overflow': _env_int('DB_MAX_OVERFLOW', 10),
+            'pool_timeout': _env_int('DB_POOL_TIMEOUT', 30)
+        }
+        options = app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+        for key, value in pool.items():
+            options.setdefault(key, value)
+
+    read_uri = os.environ.get('DATABASE_READ_URL') or (uri if is_sqlite_file(uri) else None)
+    if read_uri and app.config.get('DATABASE_READ_REPLICA', True):
+        binds = app.config.setdefault('SQLALCHEMY_BINDS', {})
+        binds.setdefault(READ_BIND_KEY, {
+            'url': read_uri,
+            'pool_size': _env_int('DB_READ_POOL_SIZE', 10),
+            'max_overflow': _env_int('DB_MAX_OVERFLOW', 10),
+            'pool_timeout': _env_int('DB_POOL_TIMEOUT', 30)
+        })
+
+
+def _sqlite_listeners(engine, pragmas, read_only, begin_immediate):
+    @event.listens_for(engine, 'connect')
+    def on_connect(dbapi_connection, connection_record):
+        if begin_immediate:
+            # Desliga o BEGIN implícito do driver; o evento 'begin' abaixo emite o nosso
+            dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        if read_only:
+            cursor.execute('PRAGMA query_only=ON')
+        cursor.close()
+
+    if begin_immediate:
+        @event.listens_for(engine, 'begin')
+        def on_begin(connection):
+            connection.exec_driver_sql('BEGIN IMMEDIATE')
+
+
+def init_database(app, db):
+    """Configura e inicializa o banco da aplicação (pragmas, pools e bind de leitura)"""
+    configure_database(app)
+    db.init_app(app)
+    with app.app_context():
+        for key, engine in db.engines.items():
+            if engine.dialect.name != 'sqlite':
+                continue
+            read_only = key == READ_BIND_KEY
+            _sqlite_listeners(
+                engine,
+                app.config['SQLITE_PRAGMAS'],
+                read_only,
+                app.config['SQLITE_BEGIN_IMMEDIATE'] and not read_only
+            )
@@ -0,0 +1,172 @@
+import os
+import threading
+from datetime import datetime
+import click
+from flask.cli import AppGroup
+from src.models.user import db
+
+# Migrações versionadas aplicadas sobre bancos já existentes.
+# db.create_all() só cria tabelas que faltam; índices e colunas novas em
+# tabelas existentes precisam passar por aqui. Cada entrada é
+# (versão, descrição, lista de passos) e deve ser idempotente; um passo é
+# uma instrução SQL ou uma função que recebe a conexão.
+
+
+def add_column(table, column, ddl):
+    """Passo que adiciona a coluna só se ela ainda não existe (create_all já pode tê-la criado)"""
+    def step(connection):
+        if column not in {info['name'] for info in db.inspect(connection).get_columns(table)}:
+            connection.exec_driver_sql(f'ALTER TABLE {table} ADD COLUMN {column} {ddl}')
+    return step
+
+
+def reconcile_progress_step(connection):
+    # Importação tardia: o serviço depende dos modelos
+    from src.services.progress import reconcile_progress
+    reconcile_progress(connection)
+
+
+def create_missing_stats_step(connection):
+    # Importação tardia: o serviço depende dos modelos
+    from src.services.stats import create_missing_stats
+    create_missing_stats(connection)
+
+
+MIGRATIONS = [
+    (1, 'Índices dos caminhos de acesso de projetos, tarefas, dependências e KPIs', [
+        'CREATE INDEX IF NOT EXISTS ix_project_user_updated ON project (user_id, updated_at)',
+        'CREATE INDEX IF NOT EXISTS ix_task_project_order ON task (project_id, order_index)',
+        'CREATE INDEX IF NOT EXISTS ix_task_project_status ON task (project_id, status)',
+        'CREATE INDEX IF NOT EXISTS ix_task_assigned_to ON task (assigned_to)',
+        'CREATE INDEX IF NOT EXISTS ix_task_parent_task_id ON task (parent_task_id)',
+        'CREATE INDEX IF NOT EXISTS ix_task_dependency_task_id ON task_dependency (task_id)',
+        'CREATE INDEX IF NOT EXISTS ix_task_dependency_depends_on ON task_dependency (depends_on_task_id)',
+        'CREATE INDEX IF NOT EXISTS ix_project_kpi_project_id ON project_kpi (project_id)',
+        'ANALYZE',
+    ]),
+    (2, 'Progresso ponderado derivado das tarefas: somas das folhas por subárvore e por projeto', [
+        add_column('task', 'subtree_leaf_count', 'INTEGER NOT NULL DEFAULT 0'),
+        add_column('task', 'subtree_estimated_hours', 'FLOAT NOT NULL DEFAULT 0'),
+        add_column('task', 'subtree_progress_sum', 'FLOAT NOT NULL DEFAULT 0'),
+        add_column('task', 'subtree_weighted_progress_sum', 'FLOAT NOT NULL DEFAULT 0'),
+        add_column('project_stats', 'leaf_count', 'INTEGER NOT NULL DEFAULT 0'),
+        add_column('project_stats', 'leaf_estimated_hours', 'FLOAT NOT NULL DEFAULT 0'),
+        add_column('project_stats', 'leaf_progress_sum', 'FLOAT NOT NULL DEFAULT 0'),
+        add_column('project_stats', 'leaf_weighted_progress_sum', 'FLOAT NOT NULL DEFAULT 0'),
+        reconcile_progress_step,
+    ]),
+    (3, 'Rollup de estatísticas para projetos criados antes da tabela project_stats', [
+        create_missing_stats_step,
+    ]),
+]
+
+MIGRATIONS_TABLE = 'schema_migrations'
+
+
+def _ensure_migrations_table(connection):
+    connection.exec_driver_sql(
+        f'CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} ('
+        'version INTEGER PRIMARY KEY, description VARCHAR(200), applied_at VARCHAR(32))'
+    )
+
+
+def applied_versions(connection):
+    """Versões já registradas na tabela de migrações"""
+    _ensure_migrations_table(connection)
+    return {row[0] for row in connection.exec_driver_sql(f'SELECT version FROM {MIGRATIONS_TABLE}')}
+
+
+def run_migrations(engine=None):
+    """Aplica, em ordem, as migrações pendentes. Retorna as versões aplicadas.
+
+    Cada migração roda na sua própria transação junto com o registro da
+    versão, então uma falha não deixa o banco marcado como migrado.
+    """
+    engine = engine or db.engine
+    with engine.begin() as connection:
+        done = applied_versions(connection)
+
+    applied = []
+    for version, description, statements in sorted(MIGRATIONS, key=lambda m: m[0]):
+        if version in done:
+            continue
+        with engine.begin() as connection:
+            for statement in statements:
+                if callable(statement):
+                    statement(connection)
+                else:
+                    connection.exec_driver_sql(statement)
+            connection.execute(
+                db.text(
+                    f'INSERT INTO {MIGRATIONS_TABLE} (version, description, applied_at) '
+                    'VALUES (:version, :description, :applied_at)'
+                ),
+                {'version': version, 'description': description, 'applied_at': datetime.utcnow().isoformat()}
+            )
+        applied.append(version)
+    return applied
+
+
+def pending_versions(engine=None):
+    """Versões de MIGRATIONS ainda não aplicadas no banco"""
+    engine = engine or db.engine
+    with engine.begin() as connection:
+        done = applied_versions(connection)
+    return sorted(version for version, _, _ in MIGRATIONS if version not in done)
+
+
+def upgrade_schema():
+    """Cria as tabelas que faltam e aplica as migrações pendentes (requer contexto da aplicação)"""
+    # Registra todos os modelos no metadata antes do create_all
+    import src.models.project  # noqa: F401
+    import src.models.job  # noqa: F401
+
+    database = db.engine.url.database
+    if db.engine.dialect.name == 'sqlite' and database and database != ':memory:':
+        os.makedirs(os.path.dirname(os.path.abspath(database)), exist_ok=True)
+    # Só o bind principal: o de leitura aponta para o mesmo banco (ou uma réplica) e
+    # db.metadatas é do processo, então pode listar binds de outra aplicação
+    db.create_all(bind_key=None)
+    return run_migrations()
+
+
+def init_schema_on_first_request(app):
+    """Cria/migra o schema na primeira requisição em vez de na importação (AUTO_CREATE_SCHEMA).
+
+    Útil em ambientes efêmeros (SQLite em disco temporário) onde não há um
+    passo de deploy para rodar `flask db upgrade`.
+    """
+    lock = threading.Lock()
+    state = {'done': False}
+
+    @app.before_request
+    def ensure_schema():
+        if state['done']:
+            return
+        with lock:
+            if not state['done']:
+                upgrade_schema()
+                state['done'] = True
+
+
+db_cli = AppGroup('db', help='Schema e migrações do banco.')
+
+
+@db_cli.command('upgrade')
+def upgrade_command():
+    """Cria as tabelas que faltam e aplica as migrações pendentes"""
+    applied = upgrade_schema()
+    if applied:
+        click.echo(f"Migrações aplicadas: {', '.join(map(str, applied))}")
+    else:
+        click.echo('Schema atualizado; nenhuma migração pendente.')
+
+
+@db_cli.command('status')
+def status_command():
+    """Lista as migrações pendentes sem aplicá-las"""
+    pending = pending_versions()
+    if pending:
+        click.echo(f"Migrações pendentes: {', '.join(map(str, pending))}")
+    else:
+        click.echo('Nenhuma migração pendente.')
@@ -3,6 +3,10 @@ from datetime import datetime
 from src.models.user import db
 
 class Project(db.Model):
+    __table_args__ = (
+        db.Index('ix_project_user_updated', 'user_id', 'updated_at'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
@@ -24,7 +28,42 @@ class Project(db.Model):
     def __repr__(self):
         return f'<Project {self.name}>'
 
-    def to_dict(self):
+    @classmethod
+    def count_columns(cls):
+        """Subconsultas correlacionadas com as contagens de tarefas e KPIs do projeto"""
+        tasks_count = (
+            db.select(db.func.count(Task.id))
+            .where(Task.project_id == cls.id)
+            .correlate(cls)
+            .scalar_subquery()
+        )
+        kpis_count = (
+            db.select(db.func.count(ProjectKPI.id))
+            .where(ProjectKPI.project_id == cls.id)
+            .correlate(cls)
+            .scalar_subquery()
+        )
+        return tasks_count.label('tasks_count'), kpis_count.label('kpis_count')
+
+    @classmethod
+    def query_with_counts(cls):
+        """Consulta que traz cada projeto junto com as contagens de tarefas e KPIs.
+
+        As contagens são subconsultas correlacionadas resolvidas pelo banco na
+        mesma instrução SQL, evitando carregar os relacionamentos para contar.
+        """
+        return db.session.query(cls, *cls.count_columns())
+
+    def count_children(self):
+        """Contagens de tarefas e KPIs do projeto via COUNT, sem carregar as linhas"""
+        if self.id is None:
+            return 0, 0
+        row = Project.query_with_counts().filter(Project.id == self.id).first()
+        return (row.tasks_count, row.kpis_count) if row else (0, 0)
+
+    def to_dict(self, tasks_count=None, kpis_count=None):
+        if tasks_count is None or kpis_count is None:
+            tasks_count, kpis_count = self.count_children()
         return {
             'id': self.id,
             'name': self.name,
@@ -39,11 +78,18 @@ class Project(db.Model):
             'user_id': self.user_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'tasks_count': len(self.tasks) if self.tasks else 0,
-            'kpis_count': len(self.kpis) if self.kpis else 0
+            'tasks_count': tasks_count or 0,
+            'kpis_count': kpis_count or 0
         }
 
 class Task(db.Model):
+    __table_args__ = (
+        db.Index('ix_task_project_order', 'project_id', 'order_index'),
+        db.Index('ix_task_project_status', 'project_id', 'status'),
+        db.Index('ix_task_assigned_to', 'assigned_to'),
+        db.Index('ix_task_parent_task_id', 'parent_task_id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
@@ -58,6 +104,12 @@ class Task(db.Model):
     assigned_to = db.Column(db.Integer, db.ForeignKey('user.id'))
     parent_task_id = db.Column(db.Integer, db.ForeignKey('task.id'))
     order_index = db.Column(db.Integer, default=0)
+    # Somas das folhas da subárvore (a própria tarefa, se não tem subtarefas), mantidas
+    # por src.services.progress; o progress de uma tarefa com subtarefas deriva delas
+    subtree_leaf_count = db.Column(db.Integer, default=0, nullable=False, server_default='0')
+    subtree_estimated_hours = db.Column(db.Float, default=0.0, nullable=False, server_default='0')
+    subtree_progress_sum = db.Column(db.Float, default=0.0, nullable=False, server_default='0')
+    subtree_weighted_progress_sum = db.Column(db.Float, default=0.0, nullable=False, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -68,7 +120,22 @@ class Task(db.Model):
     def __repr__(self):
         return f'<Task {self.title}>'
 
-    def to_dict(self):
+    @classmethod
+    def subtasks_count_column(cls):
+        """Subconsulta correlacionada com o número de subtarefas de cada tarefa"""
+        child = db.aliased(cls)
+        return (
+            db.select(db.func.count(child.id))
+            .where(child.parent_task_id == cls.id)
+            .correlate(cls)
+            .scalar_subquery()
+            .label('subtasks_count')
+        )
+
+    def to_dict(self, subtasks_count=None):
+        # Listagens passam subtasks_count (de subtasks_count_column()) para não carregar as subtarefas por linha
+        if subtasks_count is None:
+            subtasks_count = len(self.subtasks) if self.subtasks else 0
         return {
             'id': self.id,
             'title': self.title,
@@ -86,10 +153,15 @@ class Task(db.Model):
             'order_index': self.order_index,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'subtasks_count': len(self.subtasks) if self.subtasks else 0
+            'subtasks_count': subtasks_count
         }
 
 class TaskDependency(db.Model):
+    __table_args__ = (
+        db.Index('ix_task_dependency_task_id', 'task_id'),
+        db.Index('ix_task_dependency_depends_on', 'depends_on_task_id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     task_id = db.Column(db.Integer, db.ForeignKey('task.id'), nullable=False)
     depends_on_task_id = db.Column(db.Integer, db.ForeignKey('task.id'), nullable=False)
@@ -106,6 +178,10 @@ class TaskDependency(db.Model):
         }
 
 class ProjectKPI(db.Model):
+    __table_args__ = (
+        db.Index('ix_project_kpi_project_id', 'project_id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
     kpi_type = db.Column(db.String(50), nullable=False)  # deadline, cost, quality, satisfaction
@@ -132,3 +208,127 @@ class ProjectKPI(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+
+class ProjectStats(db.Model):
+    """Rollup das tarefas do projeto, mantido incrementalmente pelas rotas de tarefas"""
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), primary_key=True)
+    task_count = db.Column(db.Integer, default=0, nullable=False)
+    todo_count = db.Column(db.Integer, default=0, nullable=False)
+    in_progress_count = db.Column(db.Integer, default=0, nullable=False)
+    done_count = db.Column(db.Integer, default=0, nullable=False)
+    blocked_count = db.Column(db.Integer, default=0, nullable=False)
+    estimated_hours = db.Column(db.Float, default=0.0, nullable=False)
+    actual_hours = db.Column(db.Float, default=0.0, nullable=False)
+    progress_sum = db.Column(db.Float, default=0.0, nullable=False)
+    # Soma de progress * estimated_hours de todas as tarefas
+    weighted_progress_sum = db.Column(db.Float, default=0.0, nullable=False)
+    # Mesmas somas só sobre as folhas (tarefas sem subtarefas), base do progresso do projeto
+    leaf_count = db.Column(db.Integer, default=0, nullable=False, server_default='0')
+    leaf_estimated_hours = db.Column(db.Float, default=0.0, nullable=False, server_default='0')
+    leaf_progress_sum = db.Column(db.Float, default=0.0, nullable=False, server_default='0')
+    leaf_weighted_progress_sum = db.Column(db.Float, default=0.0, nullable=False, server_default='0')
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    project = db.relationship('Project', backref=db.backref('stats', uselist=False, cascade='all, delete-orphan'))
+
+    def __repr__(self):
+        return f'<ProjectStats {self.project_id}>'
+
+    @property
+    def weighted_progress(self):
+        """Progresso das folhas ponderado pelas horas estimadas (média simples se não houver estimativas).
+
+        Tarefas com subtarefas ficam de fora: o progresso delas já é o das folhas.
+        """
+        if self.leaf_estimated_hours and self.leaf_estimated_hours > 0:
+            return round(self.leaf_weighted_progress_sum / self.leaf_estimated_hours, 2)
+        if self.leaf_count:
+            return round(self.leaf_progress_sum / self.leaf_count, 2)
+        return 0.0
+
+    @classmethod
+    def weighted_progress_column(cls):
+        """weighted_progress como expressão SQL (para gravar Project.progress no próprio UPDATE)"""
+        return db.func.round(db.case(
+            (cls.leaf_estimated_hours > 0, cls.leaf_weighted_progress_sum / cls.leaf_estimated_hours),
+            (cls.leaf_count > 0, cls.leaf_progress_sum / cls.leaf_count),
+            else_=0.0
+        ), 2)
+
+    def to_dict(self):
+        return {
+            'project_id': self.project_id,
+            'task_count': self.task_count,
+            'todo_count': self.todo_count,
+            'in_progress_count': self.in_progress_count,
+            'done_count': self.done_count,
+            'blocked_count': self.blocked_count,
+            'estimated_hours': self.estimated_hours,
+            'actual_hours': self.actual_hours,
+            'weighted_progress': self.weighted_progress,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+
+class TaskEvent(db.Model):
+    """Log append-only das mudanças de tarefas que afetam as séries históricas.
+
+    Cada linha guarda o estado da tarefa depois da mudança (na exclusão, o
+    último estado). task_id não tem chave estrangeira: o histórico continua
+    válido depois que a tarefa é excluída.
+    """
+    __table_args__ = (
+        db.Index('ix_task_event_project_occurred', 'project_id', 'occurred_at'),
+        db.Index('ix_task_event_task', 'task_id', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
+    task_id = db.Column(db.Integer, nullable=False)
+    event_type = db.Column(db.String(20), nullable=False)  # created, updated, deleted
+    previous_status = db.Column(db.String(50))
+    status = db.Column(db.String(50))
+    estimated_hours = db.Column(db.Float)
+    actual_hours = db.Column(db.Float)
+    progress = db.Column(db.Float)
+    occurred_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<TaskEvent {self.event_type} {self.task_id}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'project_id': self.project_id,
+            'task_id': self.task_id,
+            'event_type': self.event_type,
+            'previous_status': self.previous_status,
+            'status': self.status,
+            'estimated_hours': self.estimated_hours,
+            'actual_hours': self.actual_hours,
+            'progress': self.progress,
+            'occurred_at': self.occurred_at.isoformat() if self.occurred_at else None
+        }
+
+
+class ProjectRollup(db.Model):
+    """Variação diária e semanal das métricas de tarefas do projeto, mantida a partir do TaskEvent.
+
+    Cada linha guarda deltas do período (period='day' ou 'week', semanas
+    começando na segunda-feira); o valor acumulado em uma data é a soma
+    dos períodos até ela.
+    """
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), primary_key=True)
+    period = db.Column(db.String(10), primary_key=True)
+    period_start = db.Column(db.Date, primary_key=True)
+    scope_tasks = db.Column(db.Integer, default=0, nullable=False)
+    scope_hours = db.Column(db.Float, default=0.0, nullable=False)
+    done_tasks = db.Column(db.Integer, default=0, nullable=False)
+    done_hours = db.Column(db.Float, default=0.0, nullable=False)
+    actual_hours = db.Column(db.Float, default=0.0, nullable=False)
+    # Transições para done e de done para outro status no período
+    completed = db.Column(db.Integer, default=0, nullable=False)
+    reopened = db.Column(db.Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f'<ProjectRollup {self.project_id} {self.period} {self.period_start}>'
@@ -1,6 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
+from src.models.database import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -16,3 +17,15 @@ class User(db.Model):
             'username': self.username,
             'email': self.email
         }
+
+
+class RevokedToken(db.Model):
+    """Token revogado por logout, visível para todos os workers até o próprio exp"""
+    __tablename__ = 'revoked_token'
+    # AUTOINCREMENT: ids nunca são reaproveitados, os workers sincronizam por id crescente
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    id = db.Column(db.Integer, primary_key=True)
+    # SHA-256 do token em hexadecimal; o token em si não é guardado
+    token_hash = db.Column(db.String(64), unique=True, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
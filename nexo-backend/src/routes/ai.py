@@ -2,209 +2,97 @@ from flask import Blueprint, jsonify, request
 from datetime import datetime, timedelta
 import random
 import json
+from src.models.user import db
+from src.models.project import Project
+from src.routes.jobs import enqueue_job, wants_async
+from src.services import templates
+from src.services.jobs import job_handler
+from src.services.scheduling import HOURS_PER_DAY, PRIORITY_WEIGHTS, WorkCalendar, resource_schedule
 
 ai_bp = Blueprint('ai', __name__)
 
+# Limites do otimizador de cronograma: cada tarefa é testada em todos os recursos
+MAX_SCHEDULE_RESOURCES = 200
+MAX_TASK_HOURS = 10000
+
 # Simulação de modelos de IA - em produção seria integrado com OpenAI, Anthropic, etc.
 
 @ai_bp.route('/ai/generate-smart-objective', methods=['POST'])
 def generate_smart_objective():
     """Gera objetivos SMART baseados na descrição do projeto"""
     data = request.json
-    description = data.get('description', '')
-    industry = data.get('industry', 'geral')
-    timeline = data.get('timeline', '6 meses')
-    
-    # Templates de objetivos SMART por setor
-    templates = {
-        'tecnologia': [
-            f"Desenvolver e lançar {description} em {timeline}, alcançando 85% de satisfação dos usuários através de testes beta com pelo menos 100 usuários, medindo NPS e tempo de resposta do sistema.",
-            f"Implementar {description} reduzindo o tempo de processamento em 40% nos próximos {timeline}, com monitoramento contínuo de performance e relatórios semanais de otimização.",
-            f"Criar {description} que aumente a eficiência operacional em 30% até {timeline}, medindo através de métricas de produtividade e feedback da equipe."
-        ],
-        'marketing': [
-            f"Executar campanha de {description} aumentando o engajamento em 50% nos próximos {timeline}, medindo através de métricas de redes sociais e conversões.",
-            f"Implementar estratégia de {description} gerando 200 leads qualificados por mês até {timeline}, com acompanhamento via CRM e relatórios de ROI.",
-            f"Desenvolver {description} aumentando o reconhecimento da marca em 35% nos próximos {timeline}, medindo através de pesquisas de mercado mensais."
-        ],
-        'vendas': [
-            f"Implementar processo de {description} aumentando as vendas em 25% nos próximos {timeline}, com acompanhamento semanal de pipeline e conversões.",
-            f"Desenvolver {description} reduzindo o ciclo de vendas em 20% até {timeline}, medindo tempo médio de fechamento e satisfação do cliente.",
-            f"Executar {description} aumentando a taxa de retenção de clientes em 30% nos próximos {timeline}, com métricas de churn e NPS."
-        ],
-        'geral': [
-            f"Implementar {description} melhorando a eficiência em 25% nos próximos {timeline}, com medições mensais de KPIs específicos e relatórios de progresso.",
-            f"Desenvolver {description} até {timeline}, alcançando 90% de satisfação dos stakeholders através de pesquisas regulares e marcos de entrega.",
-            f"Executar {description} reduzindo custos em 15% nos próximos {timeline}, com acompanhamento orçamentário semanal e análise de ROI."
-        ]
-    }
-    
-    selected_templates = templates.get(industry, templates['geral'])
-    objective = random.choice(selected_templates)
+    try:
+        result = templates.smart_objective(
+            templates.normalize_text(data.get('description', '')),
+            templates.normalize_category(data.get('industry'), templates.SMART_OBJECTIVE_TEMPLATES),
+            templates.normalize_text(data.get('timeline', '6 meses')),
+            seed=templates.parse_seed(data.get('seed'))
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Adicionar métricas específicas
-    metrics = [
-        "Acompanhamento semanal de progresso",
-        "Relatórios mensais de performance",
-        "Revisões quinzenais com stakeholders",
-        "Dashboard em tempo real de KPIs",
-        "Análise de ROI trimestral"
-    ]
-    
-    return jsonify({
-        'smart_objective': objective,
-        'suggested_metrics': random.sample(metrics, 3),
-        'confidence': random.randint(85, 95),
-        'generated_at': datetime.utcnow().isoformat()
-    })
+    return jsonify({**result, 'generated_at': datetime.utcnow().isoformat()})
 
 @ai_bp.route('/ai/suggest-kpis', methods=['POST'])
 def suggest_kpis():
     """Sugere KPIs baseados no objetivo do projeto"""
     data = request.json
-    objective = data.get('objective', '')
-    project_type = data.get('project_type', 'geral')
+    try:
+        result = templates.kpi_suggestions(
+            templates.normalize_category(data.get('project_type'), templates.KPI_SUGGESTIONS),
+            seed=templates.parse_seed(data.get('seed'))
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    kpi_suggestions = {
-        'tecnologia': [
-            {'name': 'Tempo de Resposta', 'type': 'performance', 'unit': 'ms', 'target': '< 200'},
-            {'name': 'Uptime', 'type': 'reliability', 'unit': '%', 'target': '99.9'},
-            {'name': 'Bugs por Release', 'type': 'quality', 'unit': 'count', 'target': '< 5'},
-            {'name': 'Cobertura de Testes', 'type': 'quality', 'unit': '%', 'target': '> 80'},
-            {'name': 'Satisfação do Usuário', 'type': 'satisfaction', 'unit': 'NPS', 'target': '> 50'}
-        ],
-        'marketing': [
-            {'name': 'Taxa de Conversão', 'type': 'conversion', 'unit': '%', 'target': '> 3'},
-            {'name': 'Custo por Lead', 'type': 'cost', 'unit': 'R$', 'target': '< 50'},
-            {'name': 'Engajamento', 'type': 'engagement', 'unit': '%', 'target': '> 5'},
-            {'name': 'Alcance', 'type': 'reach', 'unit': 'pessoas', 'target': '> 10000'},
-            {'name': 'ROI', 'type': 'financial', 'unit': '%', 'target': '> 300'}
-        ],
-        'vendas': [
-            {'name': 'Taxa de Fechamento', 'type': 'conversion', 'unit': '%', 'target': '> 20'},
-            {'name': 'Ticket Médio', 'type': 'revenue', 'unit': 'R$', 'target': '> 1000'},
-            {'name': 'Ciclo de Vendas', 'type': 'time', 'unit': 'dias', 'target': '< 30'},
-            {'name': 'Retenção de Clientes', 'type': 'retention', 'unit': '%', 'target': '> 85'},
-            {'name': 'LTV/CAC', 'type': 'financial', 'unit': 'ratio', 'target': '> 3'}
-        ],
-        'geral': [
-            {'name': 'Prazo', 'type': 'time', 'unit': 'dias', 'target': 'Dentro do cronograma'},
-            {'name': 'Orçamento', 'type': 'cost', 'unit': 'R$', 'target': 'Dentro do orçamento'},
-            {'name': 'Qualidade', 'type': 'quality', 'unit': '%', 'target': '> 90'},
-            {'name': 'Satisfação', 'type': 'satisfaction', 'unit': 'score', 'target': '> 4.5'},
-            {'name': 'Produtividade', 'type': 'efficiency', 'unit': '%', 'target': '> 85'}
-        ]
-    }
-    
-    suggested = kpi_suggestions.get(project_type, kpi_suggestions['geral'])
-    selected_kpis = random.sample(suggested, min(4, len(suggested)))
-    
-    return jsonify({
-        'suggested_kpis': selected_kpis,
-        'total_suggestions': len(suggested),
-        'confidence': random.randint(80, 95),
-        'generated_at': datetime.utcnow().isoformat()
-    })
+    return jsonify({**result, 'generated_at': datetime.utcnow().isoformat()})
 
 @ai_bp.route('/ai/generate-tasks', methods=['POST'])
 def generate_tasks():
-    """Gera tarefas detalhadas baseadas no objetivo do projeto"""
+    """Gera tarefas detalhadas baseadas no objetivo do projeto (com Prefer: respond-async, como job)"""
     data = request.json
-    objective = data.get('objective', '')
-    project_type = data.get('project_type', 'geral')
     complexity = data.get('complexity', 'medium')  # low, medium, high
-    
-    # Multiplicadores baseados na complexidade
-    complexity_multipliers = {
-        'low': {'tasks': 0.7, 'hours': 0.8},
-        'medium': {'tasks': 1.0, 'hours': 1.0},
-        'high': {'tasks': 1.5, 'hours': 1.3}
-    }
-    
-    multiplier = complexity_multipliers[complexity]
-    
-    task_templates = {
-        'tecnologia': [
-            {'title': 'Análise de Requisitos Técnicos', 'category': 'planning', 'base_hours': 20},
-            {'title': 'Arquitetura do Sistema', 'category': 'design', 'base_hours': 24},
-            {'title': 'Setup do Ambiente de Desenvolvimento', 'category': 'setup', 'base_hours': 8},
-            {'title': 'Desenvolvimento do Backend', 'category': 'development', 'base_hours': 60},
-            {'title': 'Desenvolvimento do Frontend', 'category': 'development', 'base_hours': 50},
-            {'title': 'Integração de APIs', 'category': 'integration', 'base_hours': 16},
-            {'title': 'Testes Unitários', 'category': 'testing', 'base_hours': 20},
-            {'title': 'Testes de Integração', 'category': 'testing', 'base_hours': 16},
-            {'title': 'Testes de Performance', 'category': 'testing', 'base_hours': 12},
-            {'title': 'Documentação Técnica', 'category': 'documentation', 'base_hours': 16},
-            {'title': 'Deploy e Configuração', 'category': 'deployment', 'base_hours': 12},
-            {'title': 'Monitoramento e Logs', 'category': 'monitoring', 'base_hours': 8}
-        ],
-        'marketing': [
-            {'title': 'Pesquisa de Mercado', 'category': 'research', 'base_hours': 16},
-            {'title': 'Definição de Personas', 'category': 'strategy', 'base_hours': 12},
-            {'title': 'Criação de Conteúdo', 'category': 'content', 'base_hours': 30},
-            {'title': 'Design de Materiais', 'category': 'design', 'base_hours': 20},
-            {'title': 'Configuração de Campanhas', 'category': 'setup', 'base_hours': 8},
-            {'title': 'Lançamento da Campanha', 'category': 'execution', 'base_hours': 4},
-            {'title': 'Monitoramento de Métricas', 'category': 'monitoring', 'base_hours': 12},
-            {'title': 'Otimização de Performance', 'category': 'optimization', 'base_hours': 16},
-            {'title': 'Relatórios de Resultados', 'category': 'reporting', 'base_hours': 8},
-            {'title': 'Análise de ROI', 'category': 'analysis', 'base_hours': 6}
-        ],
-        'geral': [
-            {'title': 'Planejamento Inicial', 'category': 'planning', 'base_hours': 16},
-            {'title': 'Definição de Escopo', 'category': 'planning', 'base_hours': 12},
-            {'title': 'Alocação de Recursos', 'category': 'resource', 'base_hours': 8},
-            {'title': 'Execução Principal', 'category': 'execution', 'base_hours': 40},
-            {'title': 'Controle de Qualidade', 'category': 'quality', 'base_hours': 16},
-            {'title': 'Testes e Validação', 'category': 'testing', 'base_hours': 20},
-            {'title': 'Documentação', 'category': 'documentation', 'base_hours': 12},
-            {'title': 'Treinamento da Equipe', 'category': 'training', 'base_hours': 16},
-            {'title': 'Entrega Final', 'category': 'delivery', 'base_hours': 8},
-            {'title': 'Avaliação de Resultados', 'category': 'evaluation', 'base_hours': 6}
-        ]
-    }
-    
-    templates = task_templates.get(project_type, task_templates['geral'])
-    
-    # Selecionar tarefas baseadas na complexidade
-    num_tasks = int(len(templates) * multiplier['tasks'])
-    selected_templates = random.sample(templates, min(num_tasks, len(templates)))
-    
-    generated_tasks = []
-    for i, template in enumerate(selected_templates):
-        estimated_hours = int(template['base_hours'] * multiplier['hours'])
-        
-        task = {
-            'title': template['title'],
-            'description': f"Executar {template['title'].lower()} conforme especificações do projeto",
-            'category': template['category'],
-            'estimated_hours': estimated_hours,
-            'priority': 'high' if template['category'] in ['planning', 'execution'] else 'medium',
-            'order_index': i,
-            'dependencies': []
+    if complexity not in templates.COMPLEXITY_MULTIPLIERS:
+        return jsonify({'error': 'Campo complexity deve ser low, medium ou high'}), 400
+    try:
+        options = {
+            'project_type': templates.normalize_category(data.get('project_type'), templates.TASK_TEMPLATES),
+            'complexity': complexity,
+            'seed': templates.parse_seed(data.get('seed'))
         }
-        
-        # Adicionar dependências lógicas
-        if template['category'] == 'development' and i > 0:
-            task['dependencies'] = [0]  # Depende do planejamento
-        elif template['category'] == 'testing' and i > 1:
-            task['dependencies'] = [j for j, t in enumerate(selected_templates[:i]) if t['category'] == 'development']
-        
-        generated_tasks.append(task)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    return jsonify({
-        'generated_tasks': generated_tasks,
-        'total_estimated_hours': sum(task['estimated_hours'] for task in generated_tasks),
-        'complexity': complexity,
-        'confidence': random.randint(85, 95),
-        'generated_at': datetime.utcnow().isoformat()
-    })
+    if wants_async():
+        return enqueue_job('ai.generate_tasks', options)
+    return jsonify(generate_tasks_job(options))
+
+@job_handler('ai.generate_tasks')
+def generate_tasks_job(options, job=None):
+    result = templates.generated_tasks(options['project_type'], options['complexity'], seed=options['seed'])
+    return {**result, 'generated_at': datetime.utcnow().isoformat()}
 
 @ai_bp.route('/ai/predict-completion', methods=['POST'])
 def predict_completion():
-    """Prediz data de conclusão baseada no progresso atual"""
+    """Prediz data de conclusão baseada no progresso atual.
+
+    Com project_id de um projeto existente, a previsão é uma simulação Monte
+    Carlo sobre as horas estimadas e reais das tarefas (datas P50/P80/P95),
+    executada como job com Prefer: respond-async; sem ele, usa a velocidade
+    linear informada no corpo.
+    """
     data = request.json
     project_id = data.get('project_id')
+    if project_id is not None:
+        if db.session.get(Project, project_id) is None:
+            return jsonify({'error': 'Projeto não encontrado'}), 404
+        try:
+            options = {'project_id': project_id, **parse_forecast_options(data)}
+            if wants_async():
+                return enqueue_job('ai.predict_completion', options)
+            return jsonify(forecast_prediction_job(options))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
     current_progress = data.get('current_progress', 0)
     total_tasks = data.get('total_tasks', 10)
     completed_tasks = data.get('completed_tasks', 0)
@@ -256,30 +144,90 @@ def predict_completion():
         'generated_at': datetime.utcnow().isoformat()
     })
 
+def parse_forecast_options(data):
+    """Parâmetros da previsão Monte Carlo (simulations, hours_per_day, seed) validados"""
+    from src.services.forecast import DEFAULT_SIMULATIONS, MAX_SIMULATIONS
+
+    simulations = data.get('simulations', DEFAULT_SIMULATIONS)
+    if isinstance(simulations, bool) or not isinstance(simulations, int):
+        raise ValueError('Campo simulations deve ser um inteiro')
+    if not 1 <= simulations <= MAX_SIMULATIONS:
+        raise ValueError(f'simulations deve estar entre 1 e {MAX_SIMULATIONS}')
+    hours_per_day = data.get('hours_per_day')
+    if hours_per_day is not None and (isinstance(hours_per_day, bool) or not isinstance(hours_per_day, (int, float))):
+        raise ValueError('Campo hours_per_day deve ser numérico')
+    return {'simulations': simulations, 'hours_per_day': hours_per_day, 'seed': templates.parse_seed(data.get('seed'))}
+
+# Percentil da simulação devolvido como data prevista (a confiança da previsão)
+PREDICTION_PERCENTILE = 80
+
+@job_handler('ai.predict_completion')
+def forecast_prediction_job(options, job=None):
+    """Resposta de predict-completion a partir da previsão Monte Carlo do projeto"""
+    # numpy só é carregado quando uma previsão é pedida (não pesa na partida da aplicação)
+    from src.services.forecast import forecast_completion
+
+    project = db.session.get(Project, options['project_id'])
+    if project is None:
+        raise ValueError('Projeto não encontrado')
+    forecast = forecast_completion(
+        project,
+        simulations=options['simulations'],
+        hours_per_day=options['hours_per_day'],
+        seed=options['seed']
+    )
+    percentiles = forecast['percentiles']
+    predicted = percentiles[f'p{PREDICTION_PERCENTILE}']
+
+    # Risco pelo prazo do projeto: P95 dentro do prazo é baixo, só P50 dentro é médio
+    if project.end_date:
+        p50, p95 = (datetime.fromisoformat(percentiles[key]['date']) for key in ('p50', 'p95'))
+        risk_level = 'low' if p95 <= project.end_date else 'medium' if p50 <= project.end_date else 'high'
+    else:
+        progress = project.progress or 0
+        risk_level = 'low' if progress >= 80 else 'medium' if progress >= 50 else 'high'
+
+    # velocity mantém a unidade da resposta síncrona (tarefas por dia): o ritmo que
+    # conclui as tarefas restantes na data prevista; horas por dia ficam em forecast
+    days_remaining = predicted['calendar_days']
+    velocity = forecast['remaining_tasks'] / days_remaining if days_remaining > 0 else 0.0
+
+    return {
+        'predicted_completion_date': predicted['date'],
+        # Probabilidade, nas simulações, de concluir até a data prevista
+        'confidence': PREDICTION_PERCENTILE,
+        'risk_level': risk_level,
+        'velocity': round(velocity, 2),
+        'estimated_days_remaining': int(days_remaining),
+        'forecast': forecast,
+        'recommendations': generate_recommendations(risk_level, project.progress or 0),
+        'generated_at': datetime.utcnow().isoformat()
+    }
+
+RECOMMENDATIONS = {
+    'low': (
+        "Manter o ritmo atual de trabalho",
+        "Focar na qualidade das entregas finais",
+        "Preparar documentação de encerramento"
+    ),
+    'medium': (
+        "Revisar cronograma e prioridades",
+        "Considerar realocação de recursos",
+        "Aumentar frequência de reuniões de acompanhamento",
+        "Identificar possíveis bloqueadores"
+    ),
+    'high': (
+        "Ação imediata necessária",
+        "Revisar escopo do projeto",
+        "Considerar recursos adicionais",
+        "Comunicar riscos aos stakeholders",
+        "Implementar plano de contingência"
+    )
+}
+
 def generate_recommendations(risk_level, progress):
     """Gera recomendações baseadas no risco e progresso"""
-    recommendations = {
-        'low': [
-            "Manter o ritmo atual de trabalho",
-            "Focar na qualidade das entregas finais",
-            "Preparar documentação de encerramento"
-        ],
-        'medium': [
-            "Revisar cronograma e prioridades",
-            "Considerar realocação de recursos",
-            "Aumentar frequência de reuniões de acompanhamento",
-            "Identificar possíveis bloqueadores"
-        ],
-        'high': [
-            "Ação imediata necessária",
-            "Revisar escopo do projeto",
-            "Considerar recursos adicionais",
-            "Comunicar riscos aos stakeholders",
-            "Implementar plano de contingência"
-        ]
-    }
-    
-    return recommendations.get(risk_level, recommendations['medium'])
+    return list(RECOMMENDATIONS.get(risk_level, RECOMMENDATIONS['medium']))
 
 @ai_bp.route('/ai/optimize-schedule', methods=['POST'])
 def optimize_schedule():
@@ -288,45 +236,98 @@ def optimize_schedule():
     tasks = data.get('tasks', [])
     resources = data.get('resources', 1)
     
-    # Simulação de otimização de cronograma
-    optimized_tasks = []
-    current_date = datetime.utcnow()
-    
-    for i, task in enumerate(tasks):
-        # Calcular data de início baseada em dependências
-        start_date = current_date
-        if task.get('dependencies'):
-            # Encontrar a última data de término das dependências
-            for dep_index in task['dependencies']:
-                if dep_index < len(optimized_tasks):
-                    dep_end = datetime.fromisoformat(optimized_tasks[dep_index]['end_date'])
-                    start_date = max(start_date, dep_end)
-        
-        # Calcular duração baseada nas horas estimadas
-        estimated_hours = task.get('estimated_hours', 8)
-        duration_days = max(1, estimated_hours // 8)  # 8 horas por dia
-        
-        end_date = start_date + timedelta(days=duration_days)
+    try:
+        start = datetime.fromisoformat(data['start_date']) if data.get('start_date') else datetime.utcnow()
+        base = datetime(start.year, start.month, start.day)
+        calendars = build_calendars(resources, base)
+        if not isinstance(tasks, list) or not all(isinstance(task, dict) for task in tasks):
+            raise ValueError('tasks deve ser uma lista de objetos')
         
-        optimized_task = {
-            **task,
-            'start_date': start_date.isoformat(),
-            'end_date': end_date.isoformat(),
-            'duration_days': duration_days,
-            'resource_allocation': min(1.0, resources / len(tasks))
-        }
+        hours = []
+        for task in tasks:
+            estimated_hours = task.get('estimated_hours', 8)
+            if isinstance(estimated_hours, bool) or not isinstance(estimated_hours, (int, float)) \
+                    or not 0 <= estimated_hours <= MAX_TASK_HOURS:
+                raise ValueError(
+                    f"Horas estimadas inválidas na tarefa {task.get('title', len(hours))} "
+                    f"(entre 0 e {MAX_TASK_HOURS})"
+                )
+            hours.append(float(estimated_hours))
+        assignments = []
+        for task in tasks:
+            assigned_to = task.get('assigned_to')
+            if assigned_to is not None and assigned_to not in calendars:
+                raise ValueError(f'Recurso {assigned_to} não informado em resources')
+            assignments.append(assigned_to)
         
-        optimized_tasks.append(optimized_task)
-        current_date = end_date
+        start_offsets, end_offsets, allocated = resource_schedule(
+            hours,
+            [task.get('dependencies') or [] for task in tasks],
+            calendars,
+            assignments,
+            [PRIORITY_WEIGHTS.get(task.get('priority'), 0) for task in tasks]
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'error': f'Dados inválidos para otimização: {e}'}), 400
     
-    total_duration = (current_date - datetime.utcnow()).days
+    makespan = max(end_offsets, default=0.0)
+    try:
+        project_end = base + timedelta(days=makespan)
+    except OverflowError:
+        return jsonify({'error': 'Dados inválidos para otimização: cronograma ultrapassa a data máxima suportada'}), 400
+    capacity_hours = sum(calendar.work_at(makespan) for calendar in calendars.values())
+    
+    # As datas só são materializadas na saída; internamente tudo é deslocamento numérico
+    optimized_tasks = []
+    for i, task in enumerate(tasks):
+        optimized_tasks.append({
+            **task,
+            'start_date': (base + timedelta(days=start_offsets[i])).isoformat(),
+            'end_date': (base + timedelta(days=end_offsets[i])).isoformat(),
+            'duration_days': round(end_offsets[i] - start_offsets[i], 2),
+            'resource': allocated[i],
+            # Campo legado: cada tarefa ocupa o recurso alocado em tempo integral
+            'resource_allocation': 1.0
+        })
     
     return jsonify({
         'optimized_tasks': optimized_tasks,
-        'total_duration_days': total_duration,
-        'project_end_date': current_date.isoformat(),
-        'resource_utilization': min(100, (len(tasks) / resources) * 100),
+        'total_duration_days': round(makespan, 2),
+        'project_end_date': project_end.isoformat(),
+        'resource_utilization': round(sum(hours) / capacity_hours * 100, 1) if capacity_hours else 0,
         'optimization_score': random.randint(75, 95),
         'generated_at': datetime.utcnow().isoformat()
     })
 
+def build_calendars(resources, base):
+    """Calendários dos recursos: um inteiro N gera N recursos padrão (1..N);
+    uma lista aceita id, capacity_hours, working_days (0=segunda) e holidays"""
+    if isinstance(resources, int) and not isinstance(resources, bool):
+        if not 1 <= resources <= MAX_SCHEDULE_RESOURCES:
+            raise ValueError(f'resources deve estar entre 1 e {MAX_SCHEDULE_RESOURCES}')
+        return {i: WorkCalendar(base) for i in range(1, resources + 1)}
+    if not isinstance(resources, list):
+        raise ValueError('resources deve ser um número inteiro ou uma lista de recursos')
+    if len(resources) > MAX_SCHEDULE_RESOURCES:
+        raise ValueError(f'Informe no máximo {MAX_SCHEDULE_RESOURCES} recursos')
+    
+    calendars = {}
+    for i, resource in enumerate(resources):
+        if not isinstance(resource, dict):
+            raise ValueError(f'Recurso {i + 1} deve ser um objeto com id, capacity_hours, working_days e holidays')
+        resource_id = resource.get('id', i + 1)
+        capacity = resource.get('capacity_hours', HOURS_PER_DAY)
+        if isinstance(capacity, (int, float)) and not isinstance(capacity, bool) and capacity > 24:
+            raise ValueError(f'capacity_hours do recurso {resource_id} deve ser no máximo 24')
+        holidays = resource.get('holidays', [])
+        if not isinstance(holidays, list):
+            raise ValueError(f'holidays do recurso {resource_id} deve ser uma lista de datas ISO 8601')
+        calendars[resource_id] = WorkCalendar(
+            base,
+            hours_per_day=capacity,
+            working_days=resource.get('working_days', (0, 1, 2, 3, 4)),
+            holidays=[datetime.fromisoformat(day).toordinal() for day in holidays]
+        )
+    if not calendars:
+        raise ValueError('Informe pelo menos um recurso')
+    return calendars
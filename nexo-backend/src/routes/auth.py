@@ -1,7 +1,12 @@
-from flask import Blueprint, jsonify, request, session
-from src.models.user import User, db
+from flask import Blueprint, current_app, jsonify, request, session
+from sqlalchemy.exc import IntegrityError
+from src.models.user import User, RevokedToken, db
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timedelta
+from src.utils.cache import TTLCache
+import hashlib
+import threading
+import time
 import jwt
 import os
 
@@ -11,6 +16,21 @@ auth_bp = Blueprint('auth', __name__)
 JWT_SECRET = os.environ.get('JWT_SECRET', 'nexo-secret-key-2025')
 JWT_EXPIRATION_HOURS = 24
 
+# Cache de tokens já verificados, indexado pelo SHA-256 do token: evita
+# refazer a verificação HMAC a cada requisição. Cada entrada vale até o exp
+# do token, limitado a TOKEN_CACHE_TTL segundos. O cache é por processo.
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', 10000))
+TOKEN_CACHE_TTL = int(os.environ.get('TOKEN_CACHE_TTL', 300))
+_verified_tokens = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL)
+# Revogações (logout) ficam na tabela revoked_token, compartilhada entre os
+# workers; este cache só evita consultá-la de novo para um token já revogado.
+_revoked_tokens = TTLCache(maxsize=TOKEN_CACHE_SIZE)
+# Cada processo lê as revogações novas a cada REVOCATION_SYNC_INTERVAL segundos
+# e as tira do cache de verificados: um logout feito em outro worker vale
+# aqui depois de no máximo esse intervalo. Tokens fora do cache consultam a tabela.
+REVOCATION_SYNC_INTERVAL = float(os.environ.get('REVOCATION_SYNC_INTERVAL', 1))
+_revocation_sync_lock = threading.Lock()
+
 def generate_token(user_id):
     payload = {
         'user_id': user_id,
@@ -19,14 +39,87 @@ def generate_token(user_id):
     }
     return jwt.encode(payload, JWT_SECRET, algorithm='HS256')
 
+def _token_digest(token):
+    return hashlib.sha256(token.encode()).digest()
+
+def _timestamp(value):
+    """datetime UTC ingênuo (como gravado no banco) para timestamp Unix"""
+    return (value - datetime(1970, 1, 1)).total_seconds()
+
+def _read_revocations(statement):
+    """Executa uma consulta na tabela de revogações sem deixar transação aberta.
+
+    No SQLite as transações da conexão principal começam com BEGIN IMMEDIATE;
+    a verificação do token não deve segurar o lock de escrita pelo resto da
+    requisição.
+    """
+    in_transaction = db.session().in_transaction()
+    rows = db.session.execute(statement).all()
+    if not in_transaction:
+        db.session.rollback()
+    return rows
+
+def _sync_revocations():
+    """Aplica ao cache local as revogações gravadas desde a última sincronização"""
+    state = current_app.extensions.setdefault('token_revocations', {'last_id': 0, 'next_sync': 0.0})
+    now = time.monotonic()
+    if now < state['next_sync'] or not _revocation_sync_lock.acquire(blocking=False):
+        return
+    try:
+        state['next_sync'] = now + REVOCATION_SYNC_INTERVAL
+        rows = _read_revocations(
+            db.select(RevokedToken.id, RevokedToken.token_hash, RevokedToken.expires_at)
+            .where(RevokedToken.id > state['last_id'], RevokedToken.expires_at > datetime.utcnow())
+            .order_by(RevokedToken.id)
+        )
+        for row in rows:
+            digest = bytes.fromhex(row.token_hash)
+            _verified_tokens.pop(digest)
+            _revoked_tokens.set(digest, True, expires_at=_timestamp(row.expires_at))
+        if rows:
+            state['last_id'] = rows[-1].id
+    finally:
+        _revocation_sync_lock.release()
+
 def verify_token(token):
+    digest = _token_digest(token)
+    _sync_revocations()
+    if digest in _revoked_tokens:
+        return None
+    user_id = _verified_tokens.get(digest)
+    if user_id is not None:
+        return user_id
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=['HS256'])
-        return payload['user_id']
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
+    if _read_revocations(db.select(RevokedToken.id).where(RevokedToken.token_hash == digest.hex())):
+        _revoked_tokens.set(digest, True, expires_at=payload.get('exp'))
+        return None
+    _verified_tokens.set(digest, payload['user_id'], expires_at=payload.get('exp'))
+    return payload['user_id']
+
+def revoke_token(token):
+    """Invalida um token (logout) até a sua expiração, em todos os workers"""
+    try:
+        payload = jwt.decode(token, JWT_SECRET, algorithms=['HS256'])
+    except jwt.InvalidTokenError:
+        return False
+    digest = _token_digest(token)
+    _verified_tokens.pop(digest)
+    _revoked_tokens.set(digest, True, expires_at=payload['exp'])
+    now = datetime.utcnow()
+    # Revogações já expiradas não servem mais: a tabela só guarda tokens ainda válidos
+    db.session.execute(db.delete(RevokedToken).where(RevokedToken.expires_at <= now))
+    db.session.add(RevokedToken(token_hash=digest.hex(), expires_at=datetime.utcfromtimestamp(payload['exp'])))
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Logout repetido do mesmo token: a revogação já está gravada
+        db.session.rollback()
+    return True
 
 @auth_bp.route('/auth/register', methods=['POST'])
 def register():
@@ -94,7 +187,9 @@ def login():
 
 @auth_bp.route('/auth/logout', methods=['POST'])
 def logout():
-    # Em uma implementação real, invalidar o token
+    auth_header = request.headers.get('Authorization')
+    if auth_header and auth_header.startswith('Bearer '):
+        revoke_token(auth_header.split(' ')[1])
     return jsonify({'message': 'Logout realizado com sucesso'})
 
 @auth_bp.route('/auth/me', methods=['GET'])
@@ -0,0 +1,91 @@
+from flask import Blueprint, jsonify, request, url_for
+from src.models.user import db
+from src.models.job import ACTIVE_STATUSES, QUEUED, Job
+from src.models.database import use_primary_database
+from src.routes.auth import verify_token
+from src.services.jobs import JobLimitError, get_executor
+
+jobs_bp = Blueprint('jobs', __name__)
+
+# Intervalo sugerido (segundos) entre consultas de um job ainda ativo
+POLL_INTERVAL = 1
+MAX_LISTED_JOBS = 50
+
+
+def request_owner():
+    """(dono, user_id) da requisição: o usuário do token Bearer ou, sem token válido, o IP"""
+    auth_header = request.headers.get('Authorization', '')
+    if auth_header.startswith('Bearer '):
+        user_id = verify_token(auth_header.split(' ', 1)[1])
+        if user_id:
+            return f'user:{user_id}', user_id
+    return f'ip:{request.remote_addr}', None
+
+
+def wants_async():
+    """Cliente pediu execução em segundo plano (Prefer: respond-async, RFC 7240)"""
+    preferences = request.headers.get('Prefer', '')
+    return any(part.split('=')[0].strip().lower() == 'respond-async' for part in preferences.split(','))
+
+
+def enqueue_job(kind, payload):
+    """Agenda o job e responde 202 Accepted com Location apontando para GET /jobs/<id>"""
+    owner, user_id = request_owner()
+    try:
+        job = get_executor().submit(kind, payload, owner, user_id)
+    except JobLimitError as e:
+        response = jsonify({'error': str(e)})
+        response.status_code = e.status_code
+        response.headers['Retry-After'] = str(POLL_INTERVAL * 5)
+        return response
+    response = jsonify(job.to_dict())
+    response.status_code = 202
+    response.headers['Location'] = url_for('jobs.get_job', job_id=job.id)
+    response.headers['Preference-Applied'] = 'respond-async'
+    return response
+
+
+def owned_job(job_id):
+    """Job do dono da requisição (404 para jobs de outros donos)"""
+    # A consulta precisa ver o que o worker acabou de gravar
+    use_primary_database()
+    job = db.session.get(Job, job_id)
+    if job is None or job.owner != request_owner()[0]:
+        return None
+    return get_executor().expire_stale(job)
+
+
+def job_response(job, status_code=200):
+    response = jsonify(job.to_dict())
+    response.status_code = status_code
+    if job.status in ACTIVE_STATUSES:
+        response.headers['Retry-After'] = str(POLL_INTERVAL)
+    return response
+
+
+@jobs_bp.route('/jobs', methods=['GET'])
+def list_jobs():
+    use_primary_database()
+    jobs = Job.query.filter(Job.owner == request_owner()[0]).order_by(Job.created_at.desc()).limit(MAX_LISTED_JOBS)
+    return jsonify([job.to_dict() for job in jobs])
+
+
+@jobs_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = owned_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job não encontrado'}), 404
+    return job_response(job)
+
+
+@jobs_bp.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancela o job: na fila, imediatamente; em execução, o handler para na próxima verificação (202)"""
+    job = owned_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job não encontrado'}), 404
+    if job.status not in ACTIVE_STATUSES:
+        return jsonify({'error': f'Job já finalizado ({job.status})'}), 409
+    was_queued = job.status == QUEUED
+    job = get_executor().cancel(job)
+    return job_response(job, 200 if was_queued or job.status not in ACTIVE_STATUSES else 202)
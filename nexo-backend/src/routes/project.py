@@ -1,20 +1,104 @@
-from flask import Blueprint, jsonify, request
-from src.models.project import Project, Task, TaskDependency, ProjectKPI, db
+from flask import Blueprint, abort, current_app, jsonify, request
+from src.models.project import Project, Task, TaskDependency, ProjectKPI, ProjectStats, db
 from src.models.user import User
-from datetime import datetime
-import random
+from src.services.analytics import aggregate_project_tasks
+from src.services.bulk import MAX_BULK_ITEMS, BulkValidationError, bulk_task_operations
+from src.routes.jobs import enqueue_job, wants_async
+from src.services.events import EventStreamLimitError, publish_on_commit, stream_events
+from src.services.export import stream_export
+from src.services import history
+from src.services.importer import DEFAULT_CHUNK_SIZE, import_data
+from src.services.jobs import job_handler
+from src.services.progress import apply_progress_changes, progress_state
+from src.services.scheduling import HOURS_PER_DAY, ScheduleCycleError, WorkCalendar, critical_path, duration_days
+from src.services.task_tree import MAX_TREE_DEPTH, load_task_tree
+from src.services import templates
+from src.services.stats import apply_stats_delta, get_project_stats, merge_deltas, stats_delta, task_contribution
+from src.utils.conditional import conditional_response
+from src.utils.pagination import apply_filters, keyset_paginate, paginated_response, parse_fields, project_fields
+from datetime import datetime, timedelta
 
 project_bp = Blueprint('project', __name__)
 
+# Campos aceitos pelo parâmetro fields= de cada listagem
+PROJECT_FIELDS = (
+    'id', 'name', 'description', 'smart_objective', 'start_date', 'end_date', 'status', 'progress',
+    'budget', 'actual_cost', 'user_id', 'created_at', 'updated_at', 'tasks_count', 'kpis_count'
+)
+TASK_FIELDS = (
+    'id', 'title', 'description', 'status', 'priority', 'start_date', 'end_date', 'estimated_hours',
+    'actual_hours', 'progress', 'project_id', 'assigned_to', 'parent_task_id', 'order_index',
+    'created_at', 'updated_at', 'subtasks_count'
+)
+KPI_FIELDS = (
+    'id', 'project_id', 'kpi_type', 'target_value', 'current_value', 'unit', 'is_active',
+    'created_at', 'updated_at'
+)
+
+def version_columns(model, project_id):
+    """Subconsultas com (quantidade, max(updated_at)) das linhas de model do projeto.
+
+    A contagem detecta exclusões, que não alteram o max(updated_at); por isso
+    as listagens só respondem a If-None-Match (o ETag inclui a contagem) e
+    não enviam Last-Modified: If-Modified-Since compararia apenas a data.
+    """
+    return (
+        db.select(db.func.count(model.id)).where(model.project_id == project_id).scalar_subquery(),
+        db.select(db.func.max(model.updated_at)).where(model.project_id == project_id).scalar_subquery()
+    )
+
+def latest(*timestamps):
+    """Maior timestamp entre os informados, ignorando None"""
+    return max((timestamp for timestamp in timestamps if timestamp is not None), default=None)
+
+def export_options():
+    """Formato (format=ndjson|csv) e compressão (gzip=1|0, padrão pelo Accept-Encoding) da exportação"""
+    export_format = request.args.get('format', 'ndjson')
+    gzip = request.args.get('gzip')
+    if gzip is None:
+        compress = 'gzip' in request.accept_encodings
+    else:
+        compress = gzip.lower() in ('1', 'true', 'yes')
+    return export_format, compress
+
 # Projetos
 @project_bp.route('/projects', methods=['GET'])
 def get_projects():
-    user_id = request.args.get('user_id')
-    if user_id:
-        projects = Project.query.filter_by(user_id=user_id).all()
-    else:
-        projects = Project.query.all()
-    return jsonify([project.to_dict() for project in projects])
+    try:
+        fields = parse_fields(PROJECT_FIELDS)
+        # As contagens só são calculadas quando fazem parte da resposta
+        with_counts = fields is None or 'tasks_count' in fields or 'kpis_count' in fields
+        query = Project.query_with_counts() if with_counts else db.session.query(Project)
+        query = apply_filters(query, {
+            'user_id': (Project.user_id, int),
+            'status': (Project.status, str),
+        })
+        if with_counts:
+            rows, next_cursor = keyset_paginate(query, [Project.id], lambda row: [row[0].id])
+        else:
+            rows, next_cursor = keyset_paginate(query, [Project.id], lambda project: [project.id])
+            rows = [(project, 0, 0) for project in rows]
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return paginated_response(
+        [project_fields(project.to_dict(tasks_count, kpis_count), fields) for project, tasks_count, kpis_count in rows],
+        next_cursor
+    )
+
+@project_bp.route('/projects/export', methods=['GET'])
+def export_projects():
+    try:
+        fields = parse_fields(PROJECT_FIELDS) or list(PROJECT_FIELDS)
+        counts = dict(zip(('tasks_count', 'kpis_count'), Project.count_columns()))
+        columns = [counts[field] if field in counts else getattr(Project, field) for field in fields]
+        query = apply_filters(db.session.query(*columns), {
+            'user_id': (Project.user_id, int),
+            'status': (Project.status, str),
+        })
+        export_format, compress = export_options()
+        return stream_export(query.order_by(Project.id), fields, export_format, compress, 'projects')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
 @project_bp.route('/projects', methods=['POST'])
 def create_project():
@@ -28,14 +112,38 @@ def create_project():
         budget=data.get('budget'),
         user_id=data['user_id']
     )
+    project.stats = ProjectStats()
     db.session.add(project)
     db.session.commit()
-    return jsonify(project.to_dict()), 201
+    return jsonify(project.to_dict(tasks_count=0, kpis_count=0)), 201
+
+@project_bp.route('/projects/import', methods=['POST'])
+def import_projects():
+    """Importa um arquivo NDJSON (application/x-ndjson) ou CSV (text/csv) lido em streaming"""
+    import_format = request.args.get('format') or ('csv' if request.mimetype == 'text/csv' else 'ndjson')
+    try:
+        chunk_size = request.args.get('chunk_size', DEFAULT_CHUNK_SIZE, type=int)
+        user_id = request.args.get('user_id', type=int)
+        # Arquivos de importação podem passar do limite geral de corpo
+        request.max_content_length = current_app.config['IMPORT_MAX_CONTENT_LENGTH']
+        lines = (line.decode('utf-8', errors='replace') for line in request.stream)
+        report = import_data(lines, import_format, chunk_size, user_id)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(report)
 
 @project_bp.route('/projects/<int:project_id>', methods=['GET'])
 def get_project(project_id):
-    project = Project.query.get_or_404(project_id)
-    return jsonify(project.to_dict())
+    version = db.session.query(Project.updated_at, *Project.count_columns()).filter(Project.id == project_id).first()
+    if version is None:
+        abort(404)
+
+    def build():
+        project = db.session.get(Project, project_id)
+        return jsonify(project.to_dict(version.tasks_count, version.kpis_count))
+
+    # O corpo é determinado por updated_at e pelas contagens: ETag forte
+    return conditional_response(tuple(version), version.updated_at, build, weak=False)
 
 @project_bp.route('/projects/<int:project_id>', methods=['PUT'])
 def update_project(project_id):
@@ -46,7 +154,7 @@ def update_project(project_id):
     project.description = data.get('description', project.description)
     project.smart_objective = data.get('smart_objective', project.smart_objective)
     project.status = data.get('status', project.status)
-    project.progress = data.get('progress', project.progress)
+    # progress não é aceito: deriva das tarefas (src.services.progress)
     project.budget = data.get('budget', project.budget)
     project.actual_cost = data.get('actual_cost', project.actual_cost)
     
@@ -56,13 +164,17 @@ def update_project(project_id):
         project.end_date = datetime.fromisoformat(data['end_date'])
     
     project.updated_at = datetime.utcnow()
+    payload = project.to_dict()
+    publish_on_commit(project_id, 'project.updated', payload)
     db.session.commit()
-    return jsonify(project.to_dict())
+    return jsonify(payload)
 
 @project_bp.route('/projects/<int:project_id>', methods=['DELETE'])
 def delete_project(project_id):
     project = Project.query.get_or_404(project_id)
+    history.delete_project_history(project_id)
     db.session.delete(project)
+    publish_on_commit(project_id, 'project.deleted', {'id': project_id})
     db.session.commit()
     return '', 204
 
@@ -70,26 +182,35 @@ def delete_project(project_id):
 @project_bp.route('/projects/generate-smart-objective', methods=['POST'])
 def generate_smart_objective():
     data = request.json
-    description = data.get('description', '')
     
     # Simulação de IA - em produção seria integrado com OpenAI ou similar
-    smart_objectives = [
-        f"Aumentar a eficiência operacional em 25% nos próximos 6 meses através da implementação de {description}, medindo o tempo de execução de processos-chave e estabelecendo marcos mensais de progresso.",
-        f"Desenvolver e lançar {description} até {datetime.now().strftime('%B de %Y')}, alcançando 80% de satisfação dos usuários através de pesquisas de feedback e métricas de engajamento.",
-        f"Reduzir custos operacionais em 15% no próximo trimestre implementando {description}, com acompanhamento semanal do orçamento e relatórios de economia gerados.",
-        f"Melhorar a qualidade do produto/serviço relacionado a {description} em 30% nos próximos 4 meses, utilizando métricas de qualidade específicas e avaliações regulares."
-    ]
+    try:
+        result = templates.project_smart_objective(
+            templates.normalize_text(data.get('description', '')),
+            datetime.now().strftime('%B de %Y'),
+            seed=templates.parse_seed(data.get('seed'))
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    return jsonify({
-        'smart_objective': random.choice(smart_objectives),
-        'generated_at': datetime.utcnow().isoformat()
-    })
+    return jsonify({**result, 'generated_at': datetime.utcnow().isoformat()})
 
 # KPIs
 @project_bp.route('/projects/<int:project_id>/kpis', methods=['GET'])
 def get_project_kpis(project_id):
-    kpis = ProjectKPI.query.filter_by(project_id=project_id).all()
-    return jsonify([kpi.to_dict() for kpi in kpis])
+    count, updated_at = db.session.execute(db.select(*version_columns(ProjectKPI, project_id))).one()
+
+    def build():
+        try:
+            fields = parse_fields(KPI_FIELDS)
+            query = ProjectKPI.query.filter_by(project_id=project_id)
+            query = apply_filters(query, {'kpi_type': (ProjectKPI.kpi_type, str)})
+            kpis, next_cursor = keyset_paginate(query, [ProjectKPI.id], lambda kpi: [kpi.id])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return paginated_response([project_fields(kpi.to_dict(), fields) for kpi in kpis], next_cursor)
+
+    return conditional_response((count, updated_at), None, build)
 
 @project_bp.route('/projects/<int:project_id>/kpis', methods=['POST'])
 def create_project_kpi(project_id):
@@ -102,8 +223,11 @@ def create_project_kpi(project_id):
         is_active=data.get('is_active', True)
     )
     db.session.add(kpi)
+    db.session.flush()
+    payload = kpi.to_dict()
+    publish_on_commit(project_id, 'kpi.created', payload)
     db.session.commit()
-    return jsonify(kpi.to_dict()), 201
+    return jsonify(payload), 201
 
 @project_bp.route('/kpis/<int:kpi_id>', methods=['PUT'])
 def update_kpi(kpi_id):
@@ -115,14 +239,91 @@ def update_kpi(kpi_id):
     kpi.is_active = data.get('is_active', kpi.is_active)
     kpi.updated_at = datetime.utcnow()
     
+    payload = kpi.to_dict()
+    publish_on_commit(kpi.project_id, 'kpi.updated', payload)
     db.session.commit()
-    return jsonify(kpi.to_dict())
+    return jsonify(payload)
 
 # Tarefas
 @project_bp.route('/projects/<int:project_id>/tasks', methods=['GET'])
 def get_project_tasks(project_id):
-    tasks = Task.query.filter_by(project_id=project_id).order_by(Task.order_index).all()
-    return jsonify([task.to_dict() for task in tasks])
+    # Versão de todas as tarefas do projeto (não só das filtradas): subtasks_count
+    # de uma tarefa muda quando uma filha fora do filtro é criada ou excluída
+    count, updated_at = db.session.execute(db.select(*version_columns(Task, project_id))).one()
+
+    def build():
+        try:
+            fields = parse_fields(TASK_FIELDS)
+            # Contagem de subtarefas na mesma consulta, em vez de um SELECT por tarefa
+            query = db.session.query(Task, Task.subtasks_count_column()).filter(Task.project_id == project_id)
+            query = apply_filters(query, {
+                'status': (Task.status, str),
+                'priority': (Task.priority, str),
+                'assigned_to': (Task.assigned_to, int),
+            })
+            order_index = db.func.coalesce(Task.order_index, 0)
+            rows, next_cursor = keyset_paginate(query, [order_index, Task.id], lambda row: [row[0].order_index or 0, row[0].id])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return paginated_response(
+            [project_fields(task.to_dict(subtasks_count), fields) for task, subtasks_count in rows], next_cursor
+        )
+
+    return conditional_response((count, updated_at), None, build)
+
+@project_bp.route('/projects/<int:project_id>/tasks/tree', methods=['GET'])
+def get_project_task_tree(project_id):
+    """Hierarquia completa de tarefas com progresso e horas acumulados por subárvore.
+
+    Uma única consulta recursiva; root_id limita a uma subárvore e
+    max_depth aos níveis devolvidos (os totais continuam completos).
+    """
+    version = db.session.query(*version_columns(Task, project_id)).filter(Project.id == project_id).first()
+    if version is None:
+        abort(404)
+    count, updated_at = version
+
+    def build():
+        try:
+            root_id = int(request.args['root_id']) if request.args.get('root_id') else None
+            max_depth = int(request.args['max_depth']) if request.args.get('max_depth') else None
+        except ValueError:
+            return jsonify({'error': 'Parâmetros root_id e max_depth devem ser números inteiros'}), 400
+        if max_depth is not None and not 0 <= max_depth <= MAX_TREE_DEPTH:
+            return jsonify({'error': f'Parâmetro max_depth deve estar entre 0 e {MAX_TREE_DEPTH}'}), 400
+        roots, rollup, nodes = load_task_tree(project_id, root_id, max_depth)
+        if root_id is not None and not roots:
+            return jsonify({'error': 'Tarefa não encontrada no projeto'}), 404
+        return jsonify({
+            'project_id': project_id,
+            'root_id': root_id,
+            'count': nodes,
+            # Tarefas fora da árvore: ciclo em parent_task_id ou abaixo da profundidade máxima
+            'detached': count - nodes if root_id is None else 0,
+            'rollup': rollup,
+            'items': roots
+        })
+
+    return conditional_response((count, updated_at), None, build)
+
+@project_bp.route('/projects/<int:project_id>/tasks/export', methods=['GET'])
+def export_project_tasks(project_id):
+    Project.query.get_or_404(project_id)
+    try:
+        fields = parse_fields(TASK_FIELDS) or list(TASK_FIELDS)
+        columns = [
+            Task.subtasks_count_column() if field == 'subtasks_count' else getattr(Task, field) for field in fields
+        ]
+        query = apply_filters(db.session.query(*columns).filter(Task.project_id == project_id), {
+            'status': (Task.status, str),
+            'priority': (Task.priority, str),
+            'assigned_to': (Task.assigned_to, int),
+        })
+        export_format, compress = export_options()
+        query = query.order_by(db.func.coalesce(Task.order_index, 0), Task.id)
+        return stream_export(query, fields, export_format, compress, f'project-{project_id}-tasks')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
 @project_bp.route('/projects/<int:project_id>/tasks', methods=['POST'])
 def create_task(project_id):
@@ -141,13 +342,51 @@ def create_task(project_id):
         order_index=data.get('order_index', 0)
     )
     db.session.add(task)
+    db.session.flush()
+    contribution = task_contribution(task)
+    progress = apply_progress_changes(project_id, [(task.id, None, progress_state(task))])
+    apply_stats_delta(project_id, merge_deltas(stats_delta(after=contribution), progress))
+    history.record_task_events(project_id, [(task.id, None, history.task_state(task))])
+    payload = task.to_dict()
+    publish_on_commit(project_id, 'task.created', payload)
     db.session.commit()
-    return jsonify(task.to_dict()), 201
+    return jsonify(payload), 201
+
+@project_bp.route('/projects/<int:project_id>/tasks:bulk', methods=['POST'])
+def bulk_tasks(project_id):
+    Project.query.get_or_404(project_id)
+    data = request.json
+    operations = {name: data.get(name) or [] for name in ('create', 'update', 'delete')}
+    
+    if not all(isinstance(items, list) for items in operations.values()):
+        return jsonify({'error': 'Campos create, update e delete devem ser listas'}), 400
+    if sum(len(items) for items in operations.values()) > MAX_BULK_ITEMS:
+        return jsonify({'error': f'Lote excede o limite de {MAX_BULK_ITEMS} itens'}), 413
+    
+    try:
+        results = bulk_task_operations(project_id, operations['create'], operations['update'], operations['delete'])
+    except BulkValidationError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e), 'results': e.results}), 400
+    publish_on_commit(project_id, 'tasks.bulk', {
+        operation: [result['id'] for result in results[operation]] for operation in ('create', 'update', 'delete')
+    })
+    db.session.commit()
+    
+    return jsonify({
+        'results': results,
+        'created': len(results['create']),
+        'updated': len(results['update']),
+        'deleted': len(results['delete'])
+    })
 
 @project_bp.route('/tasks/<int:task_id>', methods=['PUT'])
 def update_task(task_id):
     task = Task.query.get_or_404(task_id)
     data = request.json
+    before = task_contribution(task)
+    before_state = history.task_state(task)
+    before_progress = progress_state(task)
     
     task.title = data.get('title', task.title)
     task.description = data.get('description', task.description)
@@ -163,35 +402,58 @@ def update_task(task_id):
         task.end_date = datetime.fromisoformat(data['end_date'])
     
     task.updated_at = datetime.utcnow()
+    contribution = task_contribution(task)
+    # Numa tarefa com subtarefas o progresso enviado é substituído pelo das folhas
+    progress = apply_progress_changes(task.project_id, [(task.id, before_progress, progress_state(task))])
+    apply_stats_delta(task.project_id, merge_deltas(stats_delta(before, contribution), progress))
+    history.record_task_events(task.project_id, [(task.id, before_state, history.task_state(task))])
+    payload = task.to_dict()
+    publish_on_commit(task.project_id, 'task.updated', payload)
     db.session.commit()
-    return jsonify(task.to_dict())
+    return jsonify(payload)
 
 @project_bp.route('/tasks/<int:task_id>', methods=['DELETE'])
 def delete_task(task_id):
     task = Task.query.get_or_404(task_id)
+    project_id = task.project_id
+    before = task_contribution(task)
+    subtasks_count = db.session.query(db.func.count(Task.id)).filter(
+        Task.parent_task_id == task_id, Task.project_id == project_id
+    ).scalar()
+    before_progress = progress_state(task, subtasks_count)
+    history.record_task_events(project_id, [(task.id, history.task_state(task), None)])
     db.session.delete(task)
+    progress = apply_progress_changes(project_id, [(task_id, before_progress, None)])
+    apply_stats_delta(project_id, merge_deltas(stats_delta(before=before), progress))
+    publish_on_commit(project_id, 'task.deleted', {'id': task_id})
     db.session.commit()
     return '', 204
 
 # Geração de tarefas com IA (simulado)
 @project_bp.route('/projects/<int:project_id>/generate-tasks', methods=['POST'])
 def generate_tasks(project_id):
+    """Cria as tarefas sugeridas para o projeto (com Prefer: respond-async, como job)"""
+    Project.query.get_or_404(project_id)
     data = request.json
-    objective = data.get('objective', '')
+    options = {'project_id': project_id, 'objective': data.get('objective', '')}
     
-    # Simulação de IA - tarefas baseadas no objetivo
-    task_templates = [
-        {"title": "Análise de Requisitos", "description": "Definir e documentar todos os requisitos do projeto", "estimated_hours": 16},
-        {"title": "Planejamento Detalhado", "description": "Criar cronograma detalhado e alocar recursos", "estimated_hours": 12},
-        {"title": "Desenvolvimento/Implementação", "description": "Executar as atividades principais do projeto", "estimated_hours": 40},
-        {"title": "Testes e Validação", "description": "Realizar testes e validar resultados", "estimated_hours": 20},
-        {"title": "Documentação", "description": "Criar documentação técnica e de usuário", "estimated_hours": 8},
-        {"title": "Treinamento", "description": "Treinar equipe e usuários finais", "estimated_hours": 12},
-        {"title": "Entrega e Implantação", "description": "Entregar e implantar a solução", "estimated_hours": 16}
-    ]
+    if wants_async():
+        return enqueue_job('project.generate_tasks', options)
+    result = generate_tasks_job(options)
+    db.session.commit()
+    return jsonify(result)
+
+@job_handler('project.generate_tasks')
+def generate_tasks_job(options, job=None):
+    """Insere as tarefas geradas na sessão, sem commit (feito pela rota ou pelo executor de jobs)"""
+    project_id = options['project_id']
+    if db.session.get(Project, project_id) is None:
+        raise ValueError('Projeto não encontrado')
     
     generated_tasks = []
-    for i, template in enumerate(task_templates):
+    created = []
+    deltas = []
+    for i, template in enumerate(templates.PROJECT_TASK_TEMPLATES):
         task = Task(
             title=template['title'],
             description=template['description'],
@@ -202,30 +464,71 @@ def generate_tasks(project_id):
             priority='medium'
         )
         db.session.add(task)
-        generated_tasks.append(template)
+        created.append(task)
+        deltas.append(task_contribution(task))
+        generated_tasks.append(dict(template))
     
-    db.session.commit()
+    db.session.flush()
+    progress = apply_progress_changes(project_id, [(task.id, None, progress_state(task)) for task in created])
+    apply_stats_delta(project_id, merge_deltas(*deltas, progress))
+    history.record_task_events(project_id, [(task.id, None, history.task_state(task)) for task in created])
+    # Publicado só quando a rota ou o executor de jobs confirmar a transação
+    publish_on_commit(project_id, 'tasks.generated', {'ids': [task.id for task in created]})
     
-    return jsonify({
+    return {
         'generated_tasks': generated_tasks,
         'count': len(generated_tasks),
         'generated_at': datetime.utcnow().isoformat()
-    })
+    }
+
+# Eventos em tempo real
+@project_bp.route('/projects/<int:project_id>/events', methods=['GET'])
+def project_events(project_id):
+    """Stream SSE das mudanças do projeto (tarefas, KPIs e o próprio projeto).
+
+    Retoma a partir do cabeçalho Last-Event-ID (enviado pelo EventSource ao
+    reconectar) ou do parâmetro last_event_id.
+    """
+    # HEAD (adicionado pelo Flask às rotas GET) não tem corpo: não ocupa uma assinatura
+    if request.method == 'HEAD':
+        response = jsonify({'error': 'Use GET para abrir o stream de eventos'})
+        response.status_code = 405
+        response.headers['Allow'] = 'GET'
+        return response
+    if db.session.query(Project.id).filter(Project.id == project_id).first() is None:
+        abort(404)
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    if last_event_id is not None:
+        try:
+            last_event_id = int(last_event_id)
+        except ValueError:
+            return jsonify({'error': 'Last-Event-ID deve ser um número inteiro'}), 400
+    try:
+        return stream_events(project_id, last_event_id)
+    except EventStreamLimitError as e:
+        response = jsonify({'error': str(e)})
+        response.status_code = 503
+        response.headers['Retry-After'] = '5'
+        return response
 
 # Dashboard Analytics
 @project_bp.route('/projects/<int:project_id>/analytics', methods=['GET'])
 def get_project_analytics(project_id):
-    project = Project.query.get_or_404(project_id)
-    tasks = Task.query.filter_by(project_id=project_id).all()
-    
-    # Calcular métricas
-    total_tasks = len(tasks)
-    completed_tasks = len([t for t in tasks if t.status == 'done'])
-    in_progress_tasks = len([t for t in tasks if t.status == 'in_progress'])
-    todo_tasks = len([t for t in tasks if t.status == 'todo'])
+    version = db.session.query(
+        Project.updated_at, ProjectStats.updated_at, *version_columns(Task, project_id)
+    ).outerjoin(ProjectStats, ProjectStats.project_id == Project.id).filter(Project.id == project_id).first()
+    if version is None:
+        abort(404)
+    return conditional_response(tuple(version), latest(version[0], version[1], version[3]),
+                                lambda: build_project_analytics(project_id))
+
+def build_project_analytics(project_id):
+    project = db.session.get(Project, project_id)
     
-    total_estimated_hours = sum([t.estimated_hours or 0 for t in tasks])
-    total_actual_hours = sum([t.actual_hours or 0 for t in tasks])
+    # Métricas vêm do rollup mantido incrementalmente (leitura por chave primária)
+    stats = get_project_stats(project_id)
+    total_estimated_hours = stats.estimated_hours
+    total_actual_hours = stats.actual_hours
     
     # Simulação de previsões de IA
     completion_prediction = {
@@ -235,14 +538,15 @@ def get_project_analytics(project_id):
         'success_probability': 92
     }
     
-    return jsonify({
+    analytics = {
         'project_id': project_id,
         'progress': project.progress,
+        'weighted_progress': stats.weighted_progress,
         'tasks_summary': {
-            'total': total_tasks,
-            'completed': completed_tasks,
-            'in_progress': in_progress_tasks,
-            'todo': todo_tasks
+            'total': stats.task_count,
+            'completed': stats.done_count,
+            'in_progress': stats.in_progress_count,
+            'todo': stats.todo_count
         },
         'time_tracking': {
             'estimated_hours': total_estimated_hours,
@@ -255,5 +559,106 @@ def get_project_analytics(project_id):
             'variance': ((project.budget or 0) - (project.actual_cost or 0))
         },
         'predictions': completion_prediction
+    }
+    
+    # Quebras por status, prioridade e responsável exigem agregação sobre as tarefas
+    if request.args.get('breakdown', '').lower() in ('1', 'true', 'yes'):
+        summary = aggregate_project_tasks(project_id)
+        analytics['status_breakdown'] = summary['by_status']
+        analytics['priority_breakdown'] = summary['by_priority']
+        analytics['assignee_breakdown'] = summary['by_assignee']
+    
+    return jsonify(analytics)
+
+
+# Séries históricas: lidas só do rollup diário/semanal mantido a partir do log de eventos
+@project_bp.route('/projects/<int:project_id>/burnup', methods=['GET'])
+def get_project_burnup(project_id):
+    return history_series(project_id, history.burnup, request.args.get('period', 'day'))
+
+@project_bp.route('/projects/<int:project_id>/burndown', methods=['GET'])
+def get_project_burndown(project_id):
+    return history_series(project_id, history.burndown, request.args.get('period', 'day'))
+
+@project_bp.route('/projects/<int:project_id>/throughput', methods=['GET'])
+def get_project_throughput(project_id):
+    return history_series(project_id, history.throughput, 'week')
+
+def history_series(project_id, build, period):
+    """Resposta de uma série entre from e to (YYYY-MM-DD) por dia ou semana"""
+    Project.query.get_or_404(project_id)
+    try:
+        start, end = history.parse_series_range(request.args, period)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({
+        'project_id': project_id,
+        'period': period,
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'series': build(history.rollup_series(project_id, period, start, end))
     })
 
+# Cronograma (caminho crítico) a partir das dependências persistidas
+@project_bp.route('/projects/<int:project_id>/schedule', methods=['GET'])
+def get_project_schedule(project_id):
+    project = Project.query.get_or_404(project_id)
+    
+    # Apenas as colunas necessárias, sem materializar objetos ORM
+    tasks = db.session.query(Task.id, Task.title, Task.estimated_hours).filter(Task.project_id == project_id).all()
+    dependencies = db.session.query(
+        TaskDependency.task_id, TaskDependency.depends_on_task_id, TaskDependency.dependency_type
+    ).join(Task, Task.id == TaskDependency.task_id).filter(Task.project_id == project_id).all()
+    
+    try:
+        results, project_duration, critical = critical_path(
+            {task_id: duration_days(hours) for task_id, _, hours in tasks}, dependencies
+        )
+    except ScheduleCycleError as e:
+        return jsonify({'error': str(e), 'tasks': e.task_ids}), 400
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    start = project.start_date or datetime.utcnow()
+    base = datetime(start.year, start.month, start.day)
+    titles = {task_id: title for task_id, title, _ in tasks}
+    
+    # Os deslocamentos são dias úteis: o calendário de trabalho pula fins de semana.
+    # Inícios caem no começo do expediente e términos no fim do dia em que o trabalho
+    # acaba. Os deslocamentos se repetem muito entre tarefas; cada data é calculada uma vez
+    calendar = WorkCalendar(base)
+    dates = {}
+    def to_date(offset, finish=False):
+        date = dates.get((offset, finish))
+        if date is None:
+            hours = max(offset, 0.0) * HOURS_PER_DAY
+            day = calendar.end_at(hours) if finish and hours > 0 else calendar.time_at(hours)
+            date = dates[(offset, finish)] = (base + timedelta(days=day)).isoformat()
+        return date
+    
+    try:
+        # Nenhuma data passa do término do projeto
+        project_end = to_date(project_duration, finish=True)
+    except OverflowError:
+        return jsonify({'error': 'Cronograma ultrapassa a data máxima suportada'}), 400
+    
+    schedule = []
+    for task_id, result in results.items():
+        schedule.append({
+            'task_id': task_id,
+            'title': titles[task_id],
+            **result,
+            'early_start_date': to_date(result['early_start']),
+            'early_finish_date': to_date(result['early_finish'], finish=True),
+            'late_start_date': to_date(result['late_start']),
+            'late_finish_date': to_date(result['late_finish'], finish=True)
+        })
+    
+    return jsonify({
+        'project_id': project_id,
+        'project_start': to_date(0.0),
+        'project_end': project_end,
+        'duration_days': project_duration,
+        'critical_path': critical,
+        'tasks': schedule
+    })
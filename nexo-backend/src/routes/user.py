@@ -1,12 +1,19 @@
 from flask import Blueprint, jsonify, request
 from src.models.user import User, db
+from src.utils.pagination import keyset_paginate, paginated_response, parse_fields, project_fields
 
 user_bp = Blueprint('user', __name__)
 
+USER_FIELDS = ('id', 'username', 'email')
+
 @user_bp.route('/users', methods=['GET'])
 def get_users():
-    users = User.query.all()
-    return jsonify([user.to_dict() for user in users])
+    try:
+        fields = parse_fields(USER_FIELDS)
+        users, next_cursor = keyset_paginate(User.query, [User.id], lambda user: [user.id])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return paginated_response([project_fields(user.to_dict(), fields) for user in users], next_cursor)
 
 @user_bp.route('/users', methods=['POST'])
 def create_user():
@@ -0,0 +1,65 @@
+from src.models.user import db
+from src.models.project import Task
+
+
+def _empty_bucket():
+    return {'count': 0, 'estimated_hours': 0.0, 'actual_hours': 0.0, 'progress_sum': 0.0}
+
+
+def _add(bucket, count, estimated, actual, progress):
+    bucket['count'] += count
+    bucket['estimated_hours'] += estimated
+    bucket['actual_hours'] += actual
+    bucket['progress_sum'] += progress
+
+
+def _finish(buckets):
+    """Converte a soma de progresso em média e descarta o acumulador"""
+    result = {}
+    for key, bucket in buckets.items():
+        count = bucket['count']
+        result[key] = {
+            'count': count,
+            'estimated_hours': bucket['estimated_hours'],
+            'actual_hours': bucket['actual_hours'],
+            'average_progress': round(bucket['progress_sum'] / count, 2) if count else 0.0
+        }
+    return result
+
+
+def aggregate_project_tasks(project_id):
+    """Agrega as tarefas do projeto no banco com um único GROUP BY.
+
+    O agrupamento é por (status, priority, assigned_to); como o número de
+    combinações é pequeno, os totais por status, prioridade e responsável
+    são derivados em Python a partir das mesmas linhas agregadas.
+    """
+    rows = db.session.query(
+        Task.status,
+        Task.priority,
+        Task.assigned_to,
+        db.func.count(Task.id),
+        db.func.coalesce(db.func.sum(Task.estimated_hours), 0.0),
+        db.func.coalesce(db.func.sum(Task.actual_hours), 0.0),
+        db.func.coalesce(db.func.sum(Task.progress), 0.0)
+    ).filter(Task.project_id == project_id).group_by(Task.status, Task.priority, Task.assigned_to).all()
+
+    totals = _empty_bucket()
+    by_status, by_priority, by_assignee = {}, {}, {}
+    for status, priority, assigned_to, count, estimated, actual, progress in rows:
+        values = (count, float(estimated), float(actual), float(progress))
+        _add(totals, *values)
+        # Chaves JSON precisam ser strings; valores nulos ganham um rótulo próprio
+        _add(by_status.setdefault(status or 'unknown', _empty_bucket()), *values)
+        _add(by_priority.setdefault(priority or 'unknown', _empty_bucket()), *values)
+        assignee = str(assigned_to) if assigned_to is not None else 'unassigned'
+        _add(by_assignee.setdefault(assignee, _empty_bucket()), *values)
+
+    return {
+        'total': totals['count'],
+        'estimated_hours': totals['estimated_hours'],
+        'actual_hours': totals['actual_hours'],
+        'by_status': _finish(by_status),
+        'by_priority': _finish(by_priority),
+        'by_assignee': _finish(by_assignee)
+    }
@@ -0,0 +1,321 @@
+import math
+from datetime import datetime
+from types import SimpleNamespace
+from src.models.user import db
+from src.models.project import Task, TaskDependency
+from src.services.history import record_task_events
+from src.services.progress import (
+    PROGRESS_FIELDS, SUBTREE_COLUMNS, apply_progress_changes, progress_state, subtasks_count_column
+)
+from src.services.stats import apply_stats_delta, merge_deltas, stats_delta, task_contribution
+
+# Limite de itens (criações + atualizações + exclusões) por requisição
+MAX_BULK_ITEMS = 5000
+
+NUMBER = (int, float)
+
+# Campos graváveis de uma tarefa e seus tipos aceitos
+TASK_FIELD_TYPES = {
+    'title': str,
+    'description': str,
+    'status': str,
+    'priority': str,
+    'start_date': 'date',
+    'end_date': 'date',
+    'estimated_hours': NUMBER,
+    'actual_hours': NUMBER,
+    'progress': NUMBER,
+    'assigned_to': int,
+    'parent_task_id': int,
+    'order_index': int
+}
+
+# Valores aceitos em campos de texto enumerados
+TASK_FIELD_CHOICES = {
+    'status': ('todo', 'in_progress', 'done', 'blocked'),
+    'priority': ('low', 'medium', 'high', 'urgent')
+}
+
+# Limites (mínimo, máximo) dos campos numéricos; None = sem limite
+TASK_FIELD_RANGES = {
+    'progress': (0, 100),
+    'estimated_hours': (0, None),
+    'actual_hours': (0, None)
+}
+
+# Colunas lidas para calcular o delta do rollup de estatísticas
+STATS_FIELDS = ('status', 'estimated_hours', 'actual_hours', 'progress')
+
+
+class BulkValidationError(ValueError):
+    """Um ou mais itens do lote são inválidos; nada foi gravado"""
+
+    def __init__(self, results):
+        self.results = results
+        super().__init__('Dados inválidos no lote')
+
+
+def parse_fields(item, field_types):
+    """Valida e converte os campos conhecidos de um item (campos fora de field_types são ignorados).
+
+    Retorna (valores, erros).
+    """
+    values, errors = {}, []
+    for field, value in item.items():
+        expected = field_types.get(field)
+        if expected is None or value is None:
+            if expected is not None:
+                values[field] = None
+            continue
+        if expected == 'date':
+            try:
+                values[field] = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                errors.append(f'Campo {field} deve ser uma data ISO 8601')
+        elif isinstance(value, bool) != (expected is bool) or not isinstance(value, expected):
+            errors.append(f'Campo {field} tem tipo inválido')
+        else:
+            values[field] = value
+    return values, errors
+
+
+def is_task_id(value):
+    """Ids de tarefa são inteiros (bool não conta); qualquer outro valor é rejeitado antes de buscas"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def parse_task_fields(item, partial=False):
+    """Valida e converte os campos de uma tarefa. Retorna (valores, erros)"""
+    if not isinstance(item, dict):
+        return {}, ['Item deve ser um objeto']
+    values, errors = parse_fields(item, TASK_FIELD_TYPES)
+    for field, choices in TASK_FIELD_CHOICES.items():
+        if values.get(field) is not None and values[field] not in choices:
+            errors.append(f"Campo {field} deve ser um de: {', '.join(choices)}")
+    for field, (minimum, maximum) in TASK_FIELD_RANGES.items():
+        value = values.get(field)
+        if value is None:
+            continue
+        if not math.isfinite(value) or value < minimum or (maximum is not None and value > maximum):
+            limit = f'entre {minimum} e {maximum}' if maximum is not None else f'maior ou igual a {minimum}'
+            errors.append(f'Campo {field} deve ser {limit}')
+    if not partial and not item.get('title'):
+        errors.insert(0, 'Campo title é obrigatório')
+    if isinstance(values.get('title'), str) and len(values['title']) > 200:
+        errors.append('Campo title deve ter no máximo 200 caracteres')
+    if partial and 'title' in values and not values['title']:
+        errors.append('Campo title não pode ser vazio')
+    return values, errors
+
+
+def check_parents(project_id, moves, deleted=()):
+    """Valida os novos pais de um lote contra a árvore como ficará depois dele.
+
+    moves é uma lista de (task_id, parent_id), com task_id None para
+    tarefas novas (que ainda não podem ser pai de ninguém); deleted são as
+    tarefas excluídas no mesmo lote, cujas subtarefas viram raízes. O pai
+    precisa existir no projeto, não ser excluído no lote, não ser a própria
+    tarefa nem uma das suas subtarefas. Os ancestrais de todos os pais são
+    lidos numa única consulta recursiva. Retorna a mensagem de erro (ou None)
+    de cada item de moves, na mesma ordem.
+    """
+    parent_ids = {parent_id for _, parent_id in moves if parent_id is not None}
+    if not parent_ids:
+        return [None] * len(moves)
+    ancestors = db.select(Task.id).where(Task.id.in_(parent_ids)).cte('parent_ancestors', recursive=True)
+    ancestors = ancestors.union(
+        db.select(Task.parent_task_id).join(ancestors, Task.id == ancestors.c.id)
+        .where(Task.parent_task_id.isnot(None), Task.project_id == project_id)
+    )
+    stored = {
+        row.id: row.parent_task_id
+        for row in db.session.execute(
+            db.select(Task.id, Task.parent_task_id)
+            .where(Task.id.in_(db.select(ancestors.c.id)), Task.project_id == project_id)
+        )
+    }
+    deleted = set(deleted)
+    # Árvore depois do lote: pais alterados, e subtarefas de excluídas sem pai
+    final = dict(stored)
+    final.update((task_id, parent_id) for task_id, parent_id in moves if task_id is not None)
+    for task_id, parent_id in final.items():
+        if parent_id in deleted:
+            final[task_id] = None
+
+    errors = []
+    for task_id, parent_id in moves:
+        if parent_id is None:
+            errors.append(None)
+        elif parent_id not in stored:
+            errors.append(f'Tarefa pai {parent_id} não encontrada no projeto')
+        elif parent_id in deleted:
+            errors.append(f'Tarefa pai {parent_id} excluída no mesmo lote')
+        elif parent_id == task_id:
+            errors.append('Tarefa não pode ser pai de si mesma')
+        else:
+            # Sobe a partir do novo pai; chegar à própria tarefa fecharia um ciclo
+            current, seen = parent_id, set()
+            while current is not None and current != task_id and current not in seen:
+                seen.add(current)
+                current = final.get(current)
+            cycle = current is not None and current == task_id
+            errors.append(f'Tarefa pai {parent_id} é subtarefa da tarefa {task_id}' if cycle else None)
+    return errors
+
+
+def bulk_task_operations(project_id, creates, updates, deletes):
+    """Executa criações, atualizações parciais e exclusões de tarefas em lote.
+
+    Todos os itens são validados antes de qualquer escrita; se algum for
+    inválido, BulkValidationError traz o resultado por item. Caso contrário
+    cada tipo de operação vira uma única instrução executemany (INSERT,
+    UPDATE por chave primária e DELETE ... IN), tudo na transação da sessão,
+    e o rollup de estatísticas recebe um único delta (o log de eventos, um único
+    INSERT); o progresso derivado é propagado uma vez para o lote todo. O
+    commit fica com o chamador.
+    """
+    results = {'create': [], 'update': [], 'delete': []}
+    failed = False
+
+    parsed_creates = []
+    for index, item in enumerate(creates):
+        values, errors = parse_task_fields(item)
+        parsed_creates.append((index, values, errors))
+
+    # Estado atual das tarefas afetadas, lido em uma consulta
+    update_ids = [item.get('id') for item in updates if isinstance(item, dict)]
+    target_ids = [task_id for task_id in update_ids + list(deletes) if is_task_id(task_id)]
+    current = {}
+    if target_ids:
+        rows = db.session.query(
+            Task.id, Task.project_id, Task.parent_task_id, *[getattr(Task, f) for f in STATS_FIELDS],
+            *[getattr(Task, column) for column in SUBTREE_COLUMNS], subtasks_count_column().label('subtasks_count')
+        ).filter(Task.id.in_(target_ids)).all()
+        current = {row.id: row for row in rows if row.project_id == project_id}
+
+    parsed_updates = []
+    seen = set()
+    for index, item in enumerate(updates):
+        task_id = item.get('id') if isinstance(item, dict) else None
+        values, errors = parse_task_fields({k: v for k, v in item.items() if k != 'id'} if isinstance(item, dict) else item, partial=True)
+        if not is_task_id(task_id) or task_id not in current:
+            errors.append(f'Tarefa {task_id} não encontrada no projeto')
+        elif task_id in seen:
+            errors.append(f'Tarefa {task_id} repetida no lote')
+        else:
+            seen.add(task_id)
+        parsed_updates.append((index, task_id, values, errors))
+
+    delete_ids = []
+    for index, task_id in enumerate(deletes):
+        if not is_task_id(task_id) or task_id not in current:
+            failed = True
+            results['delete'].append({'index': index, 'id': task_id, 'errors': [f'Tarefa {task_id} não encontrada no projeto']})
+        elif task_id in seen:
+            failed = True
+            results['delete'].append({'index': index, 'id': task_id, 'errors': [f'Tarefa {task_id} atualizada e excluída no mesmo lote']})
+        else:
+            seen.add(task_id)
+            delete_ids.append(task_id)
+            results['delete'].append({'index': index, 'id': task_id, 'status': 'deleted'})
+
+    # Pais novos validados contra a árvore resultante do lote inteiro
+    moves = [(None, values.get('parent_task_id')) for _, values, _ in parsed_creates]
+    # Itens já inválidos (inclusive o id) ficam de fora: o lote falha de qualquer jeito
+    moves += [(task_id, values.get('parent_task_id')) if not errors and 'parent_task_id' in values else (None, None)
+              for _, task_id, values, errors in parsed_updates]
+    parent_errors = check_parents(project_id, moves, delete_ids)
+
+    new_rows = []
+    for (index, values, errors), parent_error in zip(parsed_creates, parent_errors):
+        if parent_error:
+            errors.append(parent_error)
+        if errors:
+            failed = True
+            results['create'].append({'index': index, 'errors': errors})
+            continue
+        values.setdefault('status', 'todo')
+        values.setdefault('priority', 'medium')
+        values.setdefault('order_index', 0)
+        values.setdefault('actual_hours', 0.0)
+        values.setdefault('progress', 0.0)
+        values.setdefault('estimated_hours', None)
+        values['project_id'] = project_id
+        new_rows.append(values)
+        results['create'].append({'index': index, 'status': 'created'})
+
+    update_rows = []
+    for (index, task_id, values, errors), parent_error in zip(parsed_updates, parent_errors[len(parsed_creates):]):
+        if parent_error:
+            errors.append(parent_error)
+        if errors:
+            failed = True
+            results['update'].append({'index': index, 'id': task_id, 'errors': errors})
+            continue
+        values['id'] = task_id
+        update_rows.append(values)
+        results['update'].append({'index': index, 'id': task_id, 'status': 'updated'})
+
+    if failed:
+        # Itens válidos não foram executados porque o lote é tudo-ou-nada
+        for items in results.values():
+            for result in items:
+                if 'status' in result:
+                    result['status'] = 'skipped'
+        raise BulkValidationError(results)
+
+    deltas = []
+    changes = []
+    progress_changes = []
+    if new_rows:
+        # Um único executemany exige o mesmo conjunto de colunas; campos ausentes viram NULL
+        columns = set().union(*new_rows)
+        rows = [{column: row.get(column) for column in columns} for row in new_rows]
+        ids = db.session.scalars(
+            db.insert(Task).returning(Task.id, sort_by_parameter_order=True), rows
+        ).all()
+        for result, task_id in zip(results['create'], ids):
+            result['id'] = task_id
+        deltas.extend(task_contribution(SimpleNamespace(**row)) for row in rows)
+        changes.extend((task_id, None, SimpleNamespace(**row)) for task_id, row in zip(ids, rows))
+        progress_changes.extend(
+            (task_id, None, progress_state(SimpleNamespace(**{field: row.get(field) for field in PROGRESS_FIELDS})))
+            for task_id, row in zip(ids, rows)
+        )
+
+    if update_rows:
+        now = datetime.utcnow()
+        for row in update_rows:
+            row['updated_at'] = now
+            before = current[row['id']]
+            after = SimpleNamespace(**{field: row.get(field, getattr(before, field)) for field in STATS_FIELDS})
+            deltas.append(stats_delta(task_contribution(before), task_contribution(after)))
+            changes.append((row['id'], before, after))
+            progress_changes.append((row['id'], progress_state(before), progress_state(SimpleNamespace(
+                **{field: row.get(field, getattr(before, field)) for field in PROGRESS_FIELDS}
+            ))))
+        # UPDATE por chave primária agrupado pelo conjunto de colunas de cada linha
+        db.session.execute(db.update(Task), update_rows)
+
+    if delete_ids:
+        for task_id in delete_ids:
+            deltas.append(stats_delta(before=task_contribution(current[task_id])))
+            changes.append((task_id, current[task_id], None))
+            progress_changes.append((task_id, progress_state(current[task_id], current[task_id].subtasks_count), None))
+        db.session.execute(
+            db.delete(TaskDependency).where(
+                db.or_(TaskDependency.task_id.in_(delete_ids), TaskDependency.depends_on_task_id.in_(delete_ids))
+            )
+        )
+        db.session.execute(
+            db.update(Task).where(Task.parent_task_id.in_(delete_ids)).values(parent_task_id=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.execute(
+            db.delete(Task).where(Task.id.in_(delete_ids)).execution_options(synchronize_session=False)
+        )
+
+    deltas.append(apply_progress_changes(project_id, progress_changes))
+    apply_stats_delta(project_id, merge_deltas(*deltas))
+    record_task_events(project_id, changes)
+    return results
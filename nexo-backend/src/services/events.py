@@ -0,0 +1,406 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict, deque, namedtuple
+from flask import Response, current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from src.models.user import db
+
+# data já serializado em JSON: codificado uma vez, enviado a todas as conexões
+ProjectEvent = namedtuple('ProjectEvent', ['id', 'project_id', 'type', 'data'])
+
+# Intervalo (ms) sugerido ao EventSource para reconectar
+RETRY_MS = 3000
+
+
+class EventStreamLimitError(Exception):
+    """Limite de conexões SSE do processo atingido"""
+
+
+class MemoryEventBackend:
+    """Eventos em memória do processo, entregues na hora aos assinantes.
+
+    Guarda os últimos buffer_size eventos de cada projeto para retomar
+    conexões (Last-Event-ID). Os ids partem do instante de criação em
+    milissegundos, então um id de antes de um reinício é sempre menor que
+    o primeiro id atual e é reconhecido como perdido.
+    """
+
+    def __init__(self, buffer_size=500):
+        self.buffer_size = buffer_size
+        self._first_id = int(time.time() * 1000)
+        self._last_id = self._first_id
+        self._buffers = defaultdict(lambda: deque(maxlen=buffer_size))
+        # Id do último evento descartado do buffer de cada projeto
+        self._dropped = {}
+        self._listener = None
+        self._lock = threading.Lock()
+
+    def listen(self, callback):
+        self._listener = callback
+
+    def append(self, project_id, event_type, data):
+        with self._lock:
+            self._last_id += 1
+            item = ProjectEvent(self._last_id, project_id, event_type, data)
+            buffer = self._buffers[project_id]
+            if len(buffer) == buffer.maxlen:
+                self._dropped[project_id] = buffer[0].id
+            buffer.append(item)
+            # Entrega sob o lock: os assinantes recebem os eventos na ordem dos ids
+            if self._listener is not None:
+                self._listener(item)
+        return item
+
+    def last_id(self):
+        return self._last_id
+
+    def since(self, project_id, after_id):
+        """Eventos do projeto com id > after_id, ou None se algum já saiu do buffer"""
+        with self._lock:
+            if after_id < self._first_id or after_id > self._last_id or after_id < self._dropped.get(project_id, 0):
+                return None
+            return [item for item in self._buffers.get(project_id, ()) if item.id > after_id]
+
+
+class SQLiteEventBackend:
+    """Eventos compartilhados entre workers por um arquivo SQLite local.
+
+    Cada publicação é um INSERT; uma thread por processo consulta os ids
+    novos a cada poll_interval segundos (só enquanto houver assinantes) e
+    os entrega localmente, inclusive os publicados pelo próprio processo,
+    então todos os workers veem a mesma ordem. Eventos mais antigos que
+    retention segundos são apagados de tempos em tempos. Mesmos pragmas do
+    backend de rate limit: perder eventos numa queda é aceitável.
+    """
+
+    PRUNE_EVERY = 100
+    POLL_BATCH = 500
+
+    def __init__(self, path, poll_interval=0.5, retention=3600):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._local = threading.local()
+        self._listener = None
+        self._active = threading.Event()
+        self._thread = None
+        self._appended = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS project_event ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, project_id INTEGER NOT NULL, '
+            'type TEXT NOT NULL, data TEXT NOT NULL, created REAL NOT NULL)'
+        )
+        connection.execute('CREATE INDEX IF NOT EXISTS ix_project_event_project ON project_event (project_id, id)')
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, isolation_level=None, timeout=5)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=OFF')
+            self._local.connection = connection
+        return connection
+
+    def listen(self, callback):
+        self._listener = callback
+
+    def set_active(self, active):
+        """Liga a consulta periódica enquanto houver assinantes neste processo"""
+        if not active:
+            self._active.clear()
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._poll, args=(self.last_id(),),
+                                                name='nexo-events', daemon=True)
+                self._thread.start()
+        self._active.set()
+
+    def append(self, project_id, event_type, data, now=None):
+        now = time.time() if now is None else now
+        connection = self._connection()
+        (event_id,) = connection.execute(
+            'INSERT INTO project_event (project_id, type, data, created) VALUES (?, ?, ?, ?) RETURNING id',
+            (project_id, event_type, data, now)
+        ).fetchone()
+        with self._lock:
+            self._appended += 1
+            prune = self._appended % self.PRUNE_EVERY == 0
+        if prune:
+            connection.execute('DELETE FROM project_event WHERE created < ?', (now - self.retention,))
+        return ProjectEvent(event_id, project_id, event_type, data)
+
+    def last_id(self):
+        row = self._connection().execute("SELECT seq FROM sqlite_sequence WHERE name = 'project_event'").fetchone()
+        return row[0] if row else 0
+
+    def since(self, project_id, after_id):
+        """Eventos do projeto com id > after_id, ou None se algum já foi apagado"""
+        connection = self._connection()
+        last_id = self.last_id()
+        (oldest,) = connection.execute('SELECT min(id) FROM project_event').fetchone()
+        if after_id > last_id or after_id < (oldest if oldest is not None else last_id + 1) - 1:
+            return None
+        rows = connection.execute(
+            'SELECT id, project_id, type, data FROM project_event WHERE project_id = ? AND id > ? ORDER BY id',
+            (project_id, after_id)
+        )
+        return [ProjectEvent(*row) for row in rows]
+
+    def _poll(self, cursor):
+        while True:
+            self._active.wait()
+            try:
+                rows = self._connection().execute(
+                    'SELECT id, project_id, type, data FROM project_event WHERE id > ? ORDER BY id LIMIT ?',
+                    (cursor, self.POLL_BATCH)
+                ).fetchall()
+            except sqlite3.Error:
+                rows = []
+            for row in rows:
+                cursor = row[0]
+                if self._listener is not None:
+                    self._listener(ProjectEvent(*row))
+            if len(rows) < self.POLL_BATCH:
+                time.sleep(self.poll_interval)
+
+
+def create_event_backend(storage, **options):
+    """Backend a partir da configuração: 'memory' ou 'sqlite:///caminho/arquivo.db'"""
+    if not storage or storage == 'memory':
+        return MemoryEventBackend()
+    if storage.startswith('sqlite:///'):
+        return SQLiteEventBackend(storage[len('sqlite:///'):], **options)
+    raise ValueError(f'Backend de eventos não suportado: {storage}')
+
+
+class Subscription:
+    """Fila de uma conexão SSE, limitada a max_pending eventos.
+
+    Se o cliente não consome a tempo e a fila enche, os eventos pendentes
+    são descartados e a conexão recebe um evento reset (recarregar tudo),
+    em vez de a memória crescer sem limite.
+    """
+
+    def __init__(self, project_id, max_pending):
+        self.project_id = project_id
+        self.max_pending = max_pending
+        self.overflowed = False
+        self._queue = deque()
+        self._condition = threading.Condition()
+
+    def push(self, item):
+        with self._condition:
+            if len(self._queue) >= self.max_pending:
+                self._queue.clear()
+                self.overflowed = True
+            else:
+                self._queue.append(item)
+            self._condition.notify()
+
+    def get(self, timeout):
+        """(eventos pendentes, houve estouro) esperando até timeout segundos"""
+        with self._condition:
+            if not self._queue and not self.overflowed:
+                self._condition.wait(timeout)
+            items = list(self._queue)
+            self._queue.clear()
+            overflowed, self.overflowed = self.overflowed, False
+        return items, overflowed
+
+
+class EventBus:
+    """Pub/sub de mudanças por projeto entre as rotas e os streams SSE.
+
+    Configuração: EVENTS_BACKEND ('memory' ou sqlite:///arquivo.db para
+    vários workers), EVENTS_HEARTBEAT (segundos entre comentários de
+    keep-alive), EVENTS_STREAM_TIMEOUT (duração máxima de uma conexão; o
+    EventSource reconecta sozinho com Last-Event-ID), EVENTS_MAX_PENDING
+    (fila por conexão) e EVENTS_MAX_CONNECTIONS (streams por processo); no
+    SQLite, EVENTS_POLL_INTERVAL e EVENTS_RETENTION (segundos). O backend
+    só é criado no primeiro uso.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._backend = None
+        self._subscribers = defaultdict(set)
+        self._count = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('EVENTS_BACKEND', os.environ.get('EVENTS_BACKEND', 'memory'))
+        app.config.setdefault('EVENTS_HEARTBEAT', 15)
+        app.config.setdefault('EVENTS_STREAM_TIMEOUT', 300)
+        app.config.setdefault('EVENTS_MAX_PENDING', 256)
+        app.config.setdefault('EVENTS_MAX_CONNECTIONS', 200)
+        app.config.setdefault('EVENTS_POLL_INTERVAL', 0.5)
+        app.config.setdefault('EVENTS_RETENTION', 3600)
+        self.app = app
+        app.extensions['events'] = self
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    config = self.app.config
+                    backend = create_event_backend(
+                        config['EVENTS_BACKEND'],
+                        poll_interval=config['EVENTS_POLL_INTERVAL'],
+                        retention=config['EVENTS_RETENTION']
+                    )
+                    backend.listen(self._dispatch)
+                    self._backend = backend
+        return self._backend
+
+    def publish(self, project_id, event_type, data):
+        return self.backend.append(project_id, event_type, json.dumps(data, separators=(',', ':')))
+
+    def subscribe(self, project_id):
+        backend = self.backend
+        with self._lock:
+            if self._count >= self.app.config['EVENTS_MAX_CONNECTIONS']:
+                raise EventStreamLimitError('Limite de conexões de eventos atingido, tente novamente em instantes')
+            subscription = Subscription(project_id, self.app.config['EVENTS_MAX_PENDING'])
+            self._subscribers[project_id].add(subscription)
+            self._count += 1
+        if hasattr(backend, 'set_active'):
+            backend.set_active(True)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.project_id)
+            if subscribers is not None and subscription in subscribers:
+                subscribers.discard(subscription)
+                self._count -= 1
+                if not subscribers:
+                    del self._subscribers[subscription.project_id]
+            idle = self._count == 0
+        if idle and hasattr(self.backend, 'set_active'):
+            self.backend.set_active(False)
+
+    def _dispatch(self, item):
+        with self._lock:
+            subscribers = list(self._subscribers.get(item.project_id, ()))
+        for subscription in subscribers:
+            subscription.push(item)
+
+
+def get_event_bus():
+    return current_app.extensions['events']
+
+
+def publish_on_commit(project_id, event_type, data):
+    """Agenda a publicação do evento para depois do commit da sessão atual.
+
+    Nada é publicado se a transação for desfeita, e quem recebe o evento
+    já encontra a mudança no banco. Vale para rotas e jobs; sem EventBus
+    registrado na aplicação (scripts), não faz nada.
+    """
+    bus = current_app.extensions.get('events')
+    if bus is not None:
+        db.session.info.setdefault('pending_events', []).append((bus, project_id, event_type, data))
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_pending_events(session):
+    for bus, project_id, event_type, data in session.info.pop('pending_events', ()):
+        try:
+            bus.publish(project_id, event_type, data)
+        except Exception:
+            # Falha ao notificar não desfaz uma mudança já confirmada
+            current_app.logger.exception('Falha ao publicar evento %s do projeto %s', event_type, project_id)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_pending_events(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop('pending_events', None)
+
+
+def format_event(item=None, event_type=None, data=None, event_id=None):
+    """Mensagem SSE (id, event, data) terminada por linha em branco"""
+    if item is not None:
+        event_id, event_type, data = item.id, item.type, item.data
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event_type}')
+    lines.append(f'data: {data}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def stream_events(project_id, last_event_id=None):
+    """Resposta text/event-stream com os eventos do projeto.
+
+    Começa com ready (id do último evento, para retomar dali) ou, com
+    last_event_id, com os eventos perdidos desde ele; se eles já não
+    estão disponíveis, envia reset e o cliente deve recarregar os dados.
+    Levanta EventStreamLimitError acima de EVENTS_MAX_CONNECTIONS.
+    """
+    bus = get_event_bus()
+    config = bus.app.config
+    heartbeat, timeout = config['EVENTS_HEARTBEAT'], config['EVENTS_STREAM_TIMEOUT']
+    # Assina antes de ler o histórico: nada publicado no meio se perde (duplicados são filtrados pelo id)
+    subscription = bus.subscribe(project_id)
+
+    def reset():
+        return format_event(event_type='reset', data=json.dumps({'project_id': project_id}), event_id=bus.backend.last_id())
+
+    def generate():
+        try:
+            yield f'retry: {RETRY_MS}\n\n'
+            sent = bus.backend.last_id()
+            if last_event_id is None:
+                yield format_event(event_type='ready', data=json.dumps({'project_id': project_id}), event_id=sent)
+            else:
+                missed = bus.backend.since(project_id, last_event_id)
+                if missed is None:
+                    yield reset()
+                else:
+                    if missed:
+                        yield ''.join(format_event(item) for item in missed)
+                    sent = missed[-1].id if missed else last_event_id
+
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                items, overflowed = subscription.get(min(heartbeat, remaining))
+                if overflowed:
+                    yield reset()
+                    sent = bus.backend.last_id()
+                    continue
+                chunk = ''.join(format_event(item) for item in items if item.id > sent)
+                if chunk:
+                    sent = items[-1].id
+                    yield chunk
+                elif not items:
+                    # Comentário de keep-alive: mantém proxies e o EventSource cientes da conexão
+                    yield ': ping\n\n'
+        finally:
+            bus.unsubscribe(subscription)
+
+    # Sem stream_with_context: o contexto da requisição (e a sessão do banco) é
+    # encerrado antes do stream, que não segura conexão durante minutos
+    response = Response(generate(), mimetype='text/event-stream')
+    # O finally do gerador só roda se ele chegou a começar; close() é chamado pelo servidor
+    # mesmo quando o corpo nunca é lido (cliente que desconecta antes do primeiro chunk)
+    response.call_on_close(lambda: bus.unsubscribe(subscription))
+    response.headers['Cache-Control'] = 'no-cache'
+    # Sem buffer em proxies (nginx) para os eventos saírem na hora
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,100 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from flask import Response, stream_with_context
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8'
+}
+
+# Linhas buscadas do cursor por vez e tamanho mínimo de cada pedaço enviado
+EXPORT_CHUNK_ROWS = 1000
+EXPORT_BUFFER_SIZE = 64 * 1024
+
+# Planilhas interpretam células que começam com estes caracteres como fórmula
+# (injeção de CSV); o texto exportado recebe um apóstrofo na frente
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f'Tipo não serializável: {type(value).__name__}')
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def ndjson_chunks(names, rows):
+    """Um objeto JSON por linha, agrupado em pedaços de ~EXPORT_BUFFER_SIZE"""
+    encoder = json.JSONEncoder(default=_json_default, ensure_ascii=False, separators=(',', ':'))
+    buffer, size = [], 0
+    for row in rows:
+        line = encoder.encode(dict(zip(names, row)))
+        buffer.append(line)
+        size += len(line) + 1
+        if size >= EXPORT_BUFFER_SIZE:
+            buffer.append('')
+            yield '\n'.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        buffer.append('')
+        yield '\n'.join(buffer)
+
+
+def csv_chunks(names, rows):
+    """CSV com cabeçalho, reaproveitando um único buffer entre os pedaços"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(names)
+    for row in rows:
+        writer.writerow([_csv_value(value) for value in row])
+        if buffer.tell() >= EXPORT_BUFFER_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def gzip_chunks(chunks):
+    """Comprime o fluxo em gzip à medida que os pedaços são gerados"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_export(query, names, export_format, compress=False, filename='export'):
+    """Resposta em streaming com as linhas de query (tuplas de colunas).
+
+    As linhas são lidas do cursor em blocos de EXPORT_CHUNK_ROWS via
+    yield_per, sem instanciar objetos do ORM, e serializadas em pedaços de
+    tamanho fixo, então a memória usada não depende do número de linhas.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Formato inválido: use {' ou '.join(EXPORT_FORMATS)}")
+    serialize = ndjson_chunks if export_format == 'ndjson' else csv_chunks
+
+    def generate():
+        chunks = (chunk.encode('utf-8') for chunk in serialize(names, query.yield_per(EXPORT_CHUNK_ROWS)))
+        yield from gzip_chunks(chunks) if compress else chunks
+
+    response = Response(stream_with_context(generate()), content_type=EXPORT_FORMATS[export_format])
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    response.headers['Vary'] = 'Accept-Encoding'
+    if compress:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
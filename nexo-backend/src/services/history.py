@@ -0,0 +1,306 @@
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+import click
+from flask.cli import AppGroup
+from src.models.user import db
+from src.models.project import ProjectRollup, Task, TaskEvent
+from src.services.stats import merge_deltas, stats_delta
+
+PERIODS = ('day', 'week')
+
+ROLLUP_COLUMNS = (
+    'scope_tasks', 'scope_hours', 'done_tasks', 'done_hours', 'actual_hours', 'completed', 'reopened'
+)
+# Colunas de estado: o valor em uma data é a soma acumulada dos deltas
+CUMULATIVE_COLUMNS = ('scope_tasks', 'scope_hours', 'done_tasks', 'done_hours')
+
+# Campos da tarefa registrados no log; mudanças só em outros campos não geram evento
+TRACKED_FIELDS = ('status', 'estimated_hours', 'actual_hours', 'progress')
+
+# Maior número de períodos devolvido por uma consulta de série
+MAX_SERIES_PERIODS = 366
+DEFAULT_SERIES_PERIODS = {'day': 30, 'week': 12}
+
+
+def task_state(task):
+    """Cópia dos campos registrados da tarefa (antes de alterá-la no lugar)"""
+    return SimpleNamespace(**{field: getattr(task, field) for field in TRACKED_FIELDS})
+
+
+def history_contribution(state):
+    """Contribuição de um estado de tarefa para as colunas de estado do rollup"""
+    estimated = state.estimated_hours or 0.0
+    done = state.status == 'done'
+    return {
+        'scope_tasks': 1,
+        'scope_hours': estimated,
+        'done_tasks': 1 if done else 0,
+        'done_hours': estimated if done else 0.0,
+        'actual_hours': state.actual_hours or 0.0
+    }
+
+
+def history_delta(before=None, after=None):
+    """Delta do rollup entre dois estados (None representa tarefa inexistente)"""
+    delta = stats_delta(
+        history_contribution(before) if before is not None else None,
+        history_contribution(after) if after is not None else None
+    )
+    was_done = before is not None and before.status == 'done'
+    is_done = after is not None and after.status == 'done'
+    if is_done and not was_done:
+        delta['completed'] = 1
+    elif was_done and after is not None and not is_done:
+        delta['reopened'] = 1
+    return delta
+
+
+def period_start(day, period):
+    return day - timedelta(days=day.weekday()) if period == 'week' else day
+
+
+def apply_rollup_delta(project_id, delta, day):
+    """Soma o delta às linhas diária e semanal do dia com UPDATE col = col + :delta (INSERT se não existir)"""
+    if not delta:
+        return
+    for period in PERIODS:
+        start = period_start(day, period)
+        result = db.session.execute(
+            db.update(ProjectRollup)
+            .where(
+                ProjectRollup.project_id == project_id,
+                ProjectRollup.period == period,
+                ProjectRollup.period_start == start
+            )
+            .values(**{column: getattr(ProjectRollup, column) + value for column, value in delta.items()})
+        )
+        if result.rowcount == 0:
+            db.session.execute(db.insert(ProjectRollup).values(
+                project_id=project_id, period=period, period_start=start,
+                **{column: delta.get(column, 0) for column in ROLLUP_COLUMNS}
+            ))
+
+
+def record_task_events(project_id, changes, now=None):
+    """Grava no log as mudanças de tarefas de um projeto e atualiza o rollup, na transação da sessão.
+
+    changes é uma lista de (task_id, before, after) com estados de tarefa
+    (objetos com os campos de TRACKED_FIELDS; None para tarefa inexistente).
+    Atualizações que não mudam nenhum campo registrado são ignoradas. Os
+    eventos viram um único INSERT executemany e o rollup um delta por período.
+    """
+    now = now or datetime.utcnow()
+    rows = []
+    deltas = []
+    for task_id, before, after in changes:
+        if before is not None and after is not None and all(
+            getattr(before, field) == getattr(after, field) for field in TRACKED_FIELDS
+        ):
+            continue
+        state = after if after is not None else before
+        rows.append({
+            'project_id': project_id,
+            'task_id': task_id,
+            'event_type': 'created' if before is None else 'deleted' if after is None else 'updated',
+            'previous_status': before.status if before is not None else None,
+            'status': state.status,
+            'estimated_hours': state.estimated_hours,
+            'actual_hours': state.actual_hours,
+            'progress': state.progress,
+            'occurred_at': now
+        })
+        deltas.append(history_delta(before, after))
+    if rows:
+        db.session.execute(db.insert(TaskEvent), rows)
+        apply_rollup_delta(project_id, merge_deltas(*deltas), now.date())
+
+
+def delete_project_history(project_id):
+    """Remove o log e o rollup de um projeto (exclusão do projeto)"""
+    db.session.execute(db.delete(TaskEvent).where(TaskEvent.project_id == project_id))
+    db.session.execute(db.delete(ProjectRollup).where(ProjectRollup.project_id == project_id))
+
+
+def rebuild_project_rollups(project_id=None):
+    """Recalcula o rollup reaplicando o log de eventos. Retorna quantos eventos foram lidos"""
+    query = db.session.query(TaskEvent).order_by(TaskEvent.task_id, TaskEvent.id)
+    delete = db.delete(ProjectRollup)
+    if project_id is not None:
+        query = query.filter(TaskEvent.project_id == project_id)
+        delete = delete.where(ProjectRollup.project_id == project_id)
+    db.session.execute(delete)
+
+    totals = {}
+    last_task_id, before, count = None, None, 0
+    for event in query.yield_per(1000):
+        if event.task_id != last_task_id:
+            last_task_id, before = event.task_id, None
+        after = None if event.event_type == 'deleted' else task_state(event)
+        day = event.occurred_at.date()
+        for period in PERIODS:
+            key = (event.project_id, period, period_start(day, period))
+            totals[key] = merge_deltas(totals.get(key, {}), history_delta(before, after))
+        before = after
+        count += 1
+
+    rows = [
+        {'project_id': pid, 'period': period, 'period_start': start,
+         **{column: delta.get(column, 0) for column in ROLLUP_COLUMNS}}
+        for (pid, period, start), delta in totals.items()
+    ]
+    if rows:
+        db.session.execute(db.insert(ProjectRollup), rows)
+    return count
+
+
+def backfill_task_events(project_id=None):
+    """Cria eventos 'created' (na data de criação, com o estado atual) para tarefas sem histórico.
+
+    Usado uma vez em bancos anteriores ao log, para que escopo e concluídas
+    das tarefas antigas entrem nas séries. Retorna quantos eventos foram criados.
+    """
+    logged = db.select(TaskEvent.task_id)
+    query = db.session.query(Task.id, Task.project_id, Task.created_at, *[getattr(Task, f) for f in TRACKED_FIELDS]).filter(
+        Task.id.notin_(logged)
+    )
+    if project_id is not None:
+        query = query.filter(Task.project_id == project_id)
+    rows = [{
+        'project_id': row.project_id,
+        'task_id': row.id,
+        'event_type': 'created',
+        'previous_status': None,
+        'status': row.status,
+        'estimated_hours': row.estimated_hours,
+        'actual_hours': row.actual_hours,
+        'progress': row.progress,
+        'occurred_at': row.created_at or datetime.utcnow()
+    } for row in query]
+    if rows:
+        db.session.execute(db.insert(TaskEvent), rows)
+    return len(rows)
+
+
+def parse_series_range(args, period):
+    """(início, fim) da série a partir de from/to (YYYY-MM-DD); padrão: últimos 30 dias ou 12 semanas"""
+    if period not in PERIODS:
+        raise ValueError('Parâmetro period deve ser day ou week')
+    try:
+        end = date.fromisoformat(args['to']) if args.get('to') else datetime.utcnow().date()
+        step = 7 if period == 'week' else 1
+        start = date.fromisoformat(args['from']) if args.get('from') else end - timedelta(days=step * (DEFAULT_SERIES_PERIODS[period] - 1))
+    except ValueError:
+        raise ValueError('Parâmetros from e to devem estar no formato YYYY-MM-DD')
+    start, end = period_start(start, period), period_start(end, period)
+    if start > end:
+        raise ValueError('Parâmetro from deve ser anterior a to')
+    if (end - start).days // step + 1 > MAX_SERIES_PERIODS:
+        raise ValueError(f'Intervalo excede {MAX_SERIES_PERIODS} períodos')
+    return start, end
+
+
+def rollup_series(project_id, period, start, end):
+    """Série por período entre start e end, lida só das linhas de rollup.
+
+    Cada ponto traz os deltas do período e os valores acumulados das
+    colunas de estado no fim dele (a base anterior a start vem de um SUM).
+    """
+    base = db.session.query(*[db.func.coalesce(db.func.sum(getattr(ProjectRollup, c)), 0) for c in CUMULATIVE_COLUMNS]).filter(
+        ProjectRollup.project_id == project_id,
+        ProjectRollup.period == period,
+        ProjectRollup.period_start < start
+    ).one()
+    rows = {
+        row.period_start: row for row in ProjectRollup.query.filter(
+            ProjectRollup.project_id == project_id,
+            ProjectRollup.period == period,
+            ProjectRollup.period_start.between(start, end)
+        )
+    }
+
+    totals = dict(zip(CUMULATIVE_COLUMNS, (float(value) for value in base)))
+    step = timedelta(days=7 if period == 'week' else 1)
+    series = []
+    current = start
+    while current <= end:
+        row = rows.get(current)
+        point = {'date': current.isoformat()}
+        for column in ROLLUP_COLUMNS:
+            point[f'{column}_delta' if column in CUMULATIVE_COLUMNS else column] = getattr(row, column) if row else 0
+        for column in CUMULATIVE_COLUMNS:
+            totals[column] += getattr(row, column) if row else 0
+            point[column] = round(totals[column], 2)
+        series.append(point)
+        current += step
+    return series
+
+
+def burnup(series):
+    return [{
+        'date': point['date'],
+        'scope_tasks': int(point['scope_tasks']),
+        'scope_hours': point['scope_hours'],
+        'done_tasks': int(point['done_tasks']),
+        'done_hours': point['done_hours']
+    } for point in series]
+
+
+def burndown(series):
+    return [{
+        'date': point['date'],
+        'remaining_tasks': int(point['scope_tasks'] - point['done_tasks']),
+        'remaining_hours': round(point['scope_hours'] - point['done_hours'], 2)
+    } for point in series]
+
+
+def throughput(series):
+    return [{
+        'week_start': point['date'],
+        'completed': point['completed'],
+        'reopened': point['reopened'],
+        'completed_hours': round(point['done_hours_delta'], 2),
+        'actual_hours': round(point['actual_hours'], 2)
+    } for point in series]
+
+
+def recent_velocity(project_id, now=None, weeks=6):
+    """Horas trabalhadas por dia útil nas últimas semanas completas do rollup (None sem histórico)"""
+    now = now or datetime.utcnow()
+    end = period_start(now.date(), 'week')
+    rows = db.session.query(ProjectRollup.period_start, ProjectRollup.actual_hours).filter(
+        ProjectRollup.project_id == project_id,
+        ProjectRollup.period == 'week',
+        ProjectRollup.period_start >= end - timedelta(weeks=weeks),
+        ProjectRollup.period_start < end
+    ).all()
+    if not rows:
+        return None
+    worked = sum(hours for _, hours in rows)
+    if worked <= 0:
+        return None
+    # Semanas antes do primeiro registro não contam como semanas paradas
+    first = min(start for start, _ in rows)
+    working_days = (end - first).days // 7 * 5
+    return worked / working_days if working_days else None
+
+
+history_cli = AppGroup('history', help='Log de eventos de tarefas e séries históricas.')
+
+
+@history_cli.command('rebuild')
+@click.option('--project-id', type=int, default=None, help='Reconstruir apenas este projeto.')
+def rebuild_command(project_id):
+    """Recalcula o rollup diário/semanal reaplicando o log de eventos"""
+    count = rebuild_project_rollups(project_id)
+    db.session.commit()
+    click.echo(f'Rollup reconstruído a partir de {count} evento(s).')
+
+
+@history_cli.command('backfill')
+@click.option('--project-id', type=int, default=None, help='Apenas tarefas deste projeto.')
+def backfill_command(project_id):
+    """Registra as tarefas sem histórico (bancos anteriores ao log) e reconstrói o rollup"""
+    created = backfill_task_events(project_id)
+    rebuild_project_rollups(project_id)
+    db.session.commit()
+    click.echo(f'{created} evento(s) criado(s) para tarefas sem histórico.')
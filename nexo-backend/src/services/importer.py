@@ -0,0 +1,529 @@
+import csv
+import json
+import time
+from itertools import islice
+from types import SimpleNamespace
+import click
+from flask.cli import AppGroup
+from sqlalchemy.exc import SQLAlchemyError
+from src.models.user import db
+from src.models.project import Project, Task, TaskDependency, ProjectKPI, ProjectStats
+from src.services.bulk import NUMBER, TASK_FIELD_TYPES, check_parents, parse_fields, parse_task_fields
+from src.services.scheduling import DEPENDENCY_TYPES, FINISH_TO_START
+from src.services.history import record_task_events
+from src.services.progress import reconcile_progress
+from src.services.stats import STATS_COLUMNS, apply_stats_delta, merge_deltas, task_contribution
+
+DEFAULT_CHUNK_SIZE = 1000
+MAX_CHUNK_SIZE = 10000
+# Erros detalhados no relatório (os demais só entram na contagem)
+MAX_REPORTED_ERRORS = 100
+
+RECORD_TYPES = ('project', 'task', 'dependency', 'kpi')
+
+PROJECT_FIELD_TYPES = {
+    'name': str,
+    'description': str,
+    'smart_objective': str,
+    'start_date': 'date',
+    'end_date': 'date',
+    'status': str,
+    'progress': NUMBER,
+    'budget': NUMBER,
+    'actual_cost': NUMBER,
+    'user_id': int
+}
+
+KPI_FIELD_TYPES = {
+    'kpi_type': str,
+    'target_value': NUMBER,
+    'current_value': NUMBER,
+    'unit': str,
+    'is_active': bool
+}
+
+# Colunas de referência no CSV, convertidas como no NDJSON
+REFERENCE_FIELD_TYPES = {'project_id': int, 'task_id': int, 'depends_on_task_id': int}
+
+# Separador da lista de dependências (depends_on) numa célula CSV
+CSV_LIST_SEPARATOR = '|'
+
+
+def _csv_value(value, expected):
+    """Converte uma célula CSV para o tipo esperado; valores inválidos seguem como texto e falham na validação"""
+    if value == '':
+        return None
+    try:
+        if expected is int:
+            return int(value)
+        if expected == NUMBER:
+            return float(value)
+        if expected is bool:
+            lowered = value.strip().lower()
+            if lowered in ('1', 'true', 'sim', 'yes'):
+                return True
+            if lowered in ('0', 'false', 'não', 'nao', 'no'):
+                return False
+    except ValueError:
+        pass
+    return value
+
+
+def read_ndjson(lines):
+    """Registros de um fluxo NDJSON; linhas inválidas viram ValueError no lugar do registro"""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield ValueError('JSON inválido')
+
+
+def read_csv(lines):
+    """Registros de um CSV com coluna type; células vazias viram null"""
+    field_types = {**PROJECT_FIELD_TYPES, **TASK_FIELD_TYPES, **KPI_FIELD_TYPES, **REFERENCE_FIELD_TYPES}
+    for row in csv.DictReader(line.lstrip('\ufeff') for line in lines):
+        record = {}
+        for field, value in row.items():
+            if field is None or value is None:
+                continue
+            if field == 'depends_on':
+                record[field] = [key for key in value.split(CSV_LIST_SEPARATOR) if key] if value else None
+            else:
+                record[field] = _csv_value(value, field_types.get(field, str))
+        yield record
+
+
+READERS = {'ndjson': read_ndjson, 'csv': read_csv}
+
+
+def external_key(value):
+    """Normaliza uma chave externa para texto (None continua None)"""
+    if value is None or value == '':
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+class Importer:
+    """Importação em lotes de projetos, tarefas, dependências e KPIs.
+
+    Projetos e tarefas são referenciados por uma chave externa (key); as
+    tarefas apontam para o projeto (project) e para a tarefa pai (parent)
+    por essa chave, e suas dependências (depends_on) por chaves de tarefas.
+    Chaves são sempre tratadas como texto; inteiros em depends_on e nos
+    registros de dependência referenciam tarefas já existentes no banco.
+    As chaves são resolvidas em memória para os ids gerados; referências a
+    registros que ainda não apareceram ficam pendentes até o registro chegar,
+    em qualquer lote posterior. Cada lote é inserido com um executemany por
+    tabela e gravado em uma transação própria.
+    """
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE, default_user_id=None):
+        self.chunk_size = chunk_size
+        self.default_user_id = default_user_id
+        self.project_keys = {}
+        self.task_keys = {}
+        # Projeto de cada tarefa com chave: o pai precisa estar no mesmo projeto da filha
+        self.task_key_projects = {}
+        self.known_projects = set()
+        # Projetos com tarefas importadas, cujo progresso derivado é recalculado no fim
+        self.task_projects = set()
+        # Tarefas à espera da tarefa pai, indexadas pela chave do pai
+        self.pending_parents = {}
+        # Dependências à espera de uma das pontas, indexadas pela chave que falta
+        self.pending_dependencies = {}
+        self.counts = {'project': 0, 'task': 0, 'dependency': 0, 'kpi': 0}
+        self.error_count = 0
+        self.errors = []
+        self.rows = 0
+        self.chunks = 0
+
+    def error(self, line, messages):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'errors': messages})
+
+    def run(self, records):
+        """Importa um iterável de registros e devolve o relatório"""
+        started = time.perf_counter()
+        numbered = enumerate(records, 1)
+        aborted = None
+        while True:
+            chunk = list(islice(numbered, self.chunk_size))
+            if not chunk:
+                break
+            counts, project_keys = dict(self.counts), len(self.project_keys)
+            try:
+                self.import_chunk(chunk)
+                db.session.commit()
+            except SQLAlchemyError as e:
+                db.session.rollback()
+                # O relatório só inclui o que foi efetivamente gravado
+                self.counts = counts
+                self.project_keys = dict(islice(self.project_keys.items(), project_keys))
+                aborted = f'Lote {self.chunks + 1} (linhas {chunk[0][0]}-{chunk[-1][0]}) não gravado: {e}'
+                break
+            self.rows += len(chunk)
+            self.chunks += 1
+        if aborted is None:
+            self.report_unresolved()
+        if self.task_projects:
+            # Pais chegam em qualquer lote: o progresso derivado é recalculado uma vez, em lote
+            reconcile_progress(db.session.connection(), sorted(self.task_projects))
+            db.session.commit()
+        elapsed = time.perf_counter() - started
+        return {
+            'imported': self.counts,
+            'rows': self.rows,
+            'chunks': self.chunks,
+            'seconds': round(elapsed, 3),
+            'rows_per_second': round(self.rows / elapsed, 1) if elapsed > 0 else None,
+            'error_count': self.error_count,
+            'errors': self.errors,
+            'aborted': aborted,
+            'projects': self.project_keys
+        }
+
+    def import_chunk(self, chunk):
+        by_type = {record_type: [] for record_type in RECORD_TYPES}
+        for line, record in chunk:
+            if isinstance(record, Exception):
+                self.error(line, [str(record)])
+            elif not isinstance(record, dict) or record.get('type') not in by_type:
+                self.error(line, [f"Campo type deve ser um de: {', '.join(RECORD_TYPES)}"])
+            else:
+                by_type[record['type']].append((line, record))
+
+        # Ordem de inserção: pais antes dos filhos
+        self.import_projects(by_type['project'])
+        dependencies = self.import_tasks(by_type['task'])
+        dependencies.extend(self.parse_dependencies(by_type['dependency']))
+        self.import_dependencies(dependencies)
+        self.import_kpis(by_type['kpi'])
+
+    def check_key(self, key, keys, batch_keys, line, label):
+        """Valida uma chave externa nova; devolve False (e registra o erro) se inválida ou repetida"""
+        if key is None:
+            return True
+        if key in keys or key in batch_keys:
+            self.error(line, [f'Chave de {label} repetida: {key}'])
+            return False
+        batch_keys.add(key)
+        return True
+
+    def resolve_projects(self, entries):
+        """Resolve project/project_id de cada registro; devolve os ids (None quando inválido)"""
+        wanted = {
+            record['project_id'] for _, record in entries
+            if record.get('project') is None and isinstance(record.get('project_id'), int)
+        } - self.known_projects
+        if wanted:
+            self.known_projects.update(
+                project_id for (project_id,) in db.session.query(Project.id).filter(Project.id.in_(wanted))
+            )
+        resolved = []
+        for line, record in entries:
+            key = external_key(record.get('project'))
+            if key is not None:
+                project_id = self.project_keys.get(key)
+                if project_id is None:
+                    self.error(line, [f'Projeto {key} não encontrado no arquivo (deve aparecer antes)'])
+            else:
+                project_id = record.get('project_id')
+                if project_id not in self.known_projects:
+                    self.error(line, [f'Projeto {project_id} não encontrado'])
+                    project_id = None
+            resolved.append(project_id)
+        return resolved
+
+    def import_projects(self, entries):
+        rows, keys = [], []
+        batch_keys = set()
+        for line, record in entries:
+            values, errors = parse_fields(record, PROJECT_FIELD_TYPES)
+            if not values.get('name'):
+                errors.insert(0, 'Campo name é obrigatório')
+            elif len(values['name']) > 200:
+                errors.append('Campo name deve ter no máximo 200 caracteres')
+            if values.get('user_id') is None:
+                values['user_id'] = self.default_user_id
+                if values['user_id'] is None:
+                    errors.append('Campo user_id é obrigatório')
+            if errors:
+                self.error(line, errors)
+                continue
+            key = external_key(record.get('key'))
+            if not self.check_key(key, self.project_keys, batch_keys, line, 'projeto'):
+                continue
+            values.setdefault('status', 'planning')
+            values.setdefault('progress', 0.0)
+            values.setdefault('actual_cost', 0.0)
+            rows.append(values)
+            keys.append(key)
+        if not rows:
+            return
+
+        ids = self.insert_returning(Project, rows)
+        db.session.execute(
+            db.insert(ProjectStats),
+            [{'project_id': project_id, **{column: 0 for column in STATS_COLUMNS}} for project_id in ids]
+        )
+        for key, project_id in zip(keys, ids):
+            self.known_projects.add(project_id)
+            if key is not None:
+                self.project_keys[key] = project_id
+        self.counts['project'] += len(ids)
+
+    def import_tasks(self, entries):
+        """Insere as tarefas do lote; devolve as dependências declaradas em depends_on"""
+        candidates = []
+        for (line, record), project_id in zip(entries, self.resolve_projects(entries)):
+            if project_id is None:
+                continue
+            values, errors = parse_task_fields(record)
+            depends_on = record.get('depends_on') or []
+            if not isinstance(depends_on, list):
+                errors.append('Campo depends_on deve ser uma lista')
+            parent = external_key(record.get('parent'))
+            if parent is not None:
+                values['parent_task_id'] = self.task_keys.get(parent)
+                if values['parent_task_id'] is not None and self.task_key_projects[parent] != project_id:
+                    errors.append(f'Tarefa pai {parent} pertence a outro projeto')
+            if errors:
+                self.error(line, errors)
+                continue
+            values['project_id'] = project_id
+            candidates.append((line, record, values, parent, depends_on))
+
+        # parent_task_id numérico aponta para uma tarefa já gravada: mesma validação do lote de tarefas
+        moves = {}
+        for index, (_, _, values, parent, _) in enumerate(candidates):
+            if parent is None and values.get('parent_task_id') is not None:
+                moves.setdefault(values['project_id'], []).append(index)
+        rejected = set()
+        for project_id, indexes in moves.items():
+            errors = check_parents(project_id, [(None, candidates[index][2]['parent_task_id']) for index in indexes])
+            for index, error in zip(indexes, errors):
+                if error is not None:
+                    self.error(candidates[index][0], [error])
+                    rejected.add(index)
+
+        rows, meta = [], []
+        batch_keys = set()
+        for index, (line, record, values, parent, depends_on) in enumerate(candidates):
+            if index in rejected:
+                continue
+            key = external_key(record.get('key'))
+            if not self.check_key(key, self.task_keys, batch_keys, line, 'tarefa'):
+                continue
+            values.setdefault('parent_task_id', None)
+            values.setdefault('status', 'todo')
+            values.setdefault('priority', 'medium')
+            values.setdefault('order_index', 0)
+            values.setdefault('actual_hours', 0.0)
+            values.setdefault('progress', 0.0)
+            values.setdefault('estimated_hours', None)
+            rows.append(values)
+            meta.append((line, key, parent, depends_on))
+        if not rows:
+            return []
+
+        columns = set().union(*rows)
+        rows = [{column: row.get(column) for column in columns} for row in rows]
+        ids = self.insert_returning(Task, rows)
+
+        deltas = {}
+        changes = {}
+        dependencies = []
+        parent_updates = []
+        for row, task_id, (line, key, parent, depends_on) in zip(rows, ids, meta):
+            state = SimpleNamespace(**row)
+            deltas.setdefault(row['project_id'], []).append(task_contribution(state))
+            changes.setdefault(row['project_id'], []).append((task_id, None, state))
+            if key is not None:
+                self.task_keys[key] = task_id
+                self.task_key_projects[key] = row['project_id']
+                # Filhas de lotes anteriores que esperavam por esta tarefa
+                for child_id, child_line, child_project in self.pending_parents.pop(key, ()):
+                    if child_project != row['project_id']:
+                        self.error(child_line, [f'Tarefa pai {key} pertence a outro projeto; tarefa importada sem pai'])
+                    else:
+                        parent_updates.append({'child_id': child_id, 'parent_id': task_id})
+            for dependency in depends_on:
+                if not self.is_task_id(dependency):
+                    dependency = external_key(dependency)
+                dependencies.append((line, task_id, dependency, FINISH_TO_START))
+        # Pais que aparecem depois da filha no mesmo lote ou ainda não apareceram
+        for row, task_id, (line, key, parent, depends_on) in zip(rows, ids, meta):
+            if parent is not None and row['parent_task_id'] is None:
+                parent_id = self.task_keys.get(parent)
+                if parent_id is None:
+                    self.pending_parents.setdefault(parent, []).append((task_id, line, row['project_id']))
+                elif self.task_key_projects[parent] != row['project_id']:
+                    self.error(line, [f'Tarefa pai {parent} pertence a outro projeto; tarefa importada sem pai'])
+                else:
+                    parent_updates.append({'child_id': task_id, 'parent_id': parent_id})
+        if parent_updates:
+            # executemany direto no Core, sem o custo por linha do UPDATE por chave primária do ORM
+            table = Task.__table__
+            db.session.execute(
+                table.update().where(table.c.id == db.bindparam('child_id')).values(parent_task_id=db.bindparam('parent_id')),
+                parent_updates
+            )
+        self.task_projects.update(deltas)
+        for project_id, project_deltas in deltas.items():
+            apply_stats_delta(project_id, merge_deltas(*project_deltas))
+            record_task_events(project_id, changes[project_id])
+        self.counts['task'] += len(ids)
+        return dependencies
+
+    def parse_dependencies(self, entries):
+        dependencies = []
+        for line, record in entries:
+            task = external_key(record.get('task')) or record.get('task_id')
+            depends_on = external_key(record.get('depends_on')) or record.get('depends_on_task_id')
+            if task is None or depends_on is None:
+                self.error(line, ['Campos task e depends_on são obrigatórios'])
+                continue
+            dependencies.append((line, task, depends_on, record.get('dependency_type') or FINISH_TO_START))
+        return dependencies
+
+    @staticmethod
+    def is_task_id(reference):
+        return isinstance(reference, int) and not isinstance(reference, bool)
+
+    def resolve_task(self, reference):
+        """Id de uma tarefa a partir de um id inteiro ou de uma chave externa (texto)"""
+        if isinstance(reference, str):
+            return self.task_keys.get(reference)
+        return reference if self.is_task_id(reference) else None
+
+    def import_dependencies(self, dependencies):
+        rows = []
+        for line, task, depends_on, dependency_type in dependencies:
+            if dependency_type not in DEPENDENCY_TYPES:
+                self.error(line, [f'Tipo de dependência inválido: {dependency_type}'])
+                continue
+            self.queue_dependency(rows, line, task, depends_on, dependency_type)
+        self.insert_dependencies(rows)
+
+    def queue_dependency(self, rows, line, task, depends_on, dependency_type):
+        task_id, depends_on_id = self.resolve_task(task), self.resolve_task(depends_on)
+        if task_id is None:
+            self.pending_dependencies.setdefault(task, []).append((line, task, depends_on, dependency_type))
+        elif depends_on_id is None:
+            self.pending_dependencies.setdefault(depends_on, []).append((line, task_id, depends_on, dependency_type))
+        elif task_id == depends_on_id:
+            self.error(line, ['Tarefa não pode depender de si mesma'])
+        else:
+            rows.append((line, {'task_id': task_id, 'depends_on_task_id': depends_on_id, 'dependency_type': dependency_type}))
+
+    def insert_dependencies(self, rows):
+        # Dependências que esperavam por tarefas registradas neste lote
+        for key in [key for key in self.pending_dependencies if key in self.task_keys]:
+            for pending in self.pending_dependencies.pop(key):
+                self.queue_dependency(rows, *pending)
+        rows = self.check_dependencies(rows)
+        if rows:
+            db.session.execute(db.insert(TaskDependency), rows)
+            self.counts['dependency'] += len(rows)
+
+    def check_dependencies(self, rows):
+        """Descarta (com erro na linha) dependências com tarefas inexistentes ou de projetos diferentes.
+
+        Ids inteiros chegam sem validação: uma consulta por lote traz o projeto
+        de todas as tarefas citadas, inclusive as inseridas neste lote.
+        """
+        if not rows:
+            return []
+        task_ids = {row[key] for _, row in rows for key in ('task_id', 'depends_on_task_id')}
+        projects = dict(db.session.execute(db.select(Task.id, Task.project_id).where(Task.id.in_(task_ids))).all())
+        valid = []
+        for line, row in rows:
+            project_id = projects.get(row['task_id'])
+            if project_id is None:
+                self.error(line, [f"Tarefa {row['task_id']} não encontrada; dependência ignorada"])
+            elif row['depends_on_task_id'] not in projects:
+                self.error(line, [f"Tarefa {row['depends_on_task_id']} não encontrada; dependência ignorada"])
+            elif projects[row['depends_on_task_id']] != project_id:
+                self.error(line, [f"Tarefa {row['depends_on_task_id']} pertence a outro projeto; dependência ignorada"])
+            else:
+                valid.append(row)
+        return valid
+
+    def import_kpis(self, entries):
+        rows = []
+        for (line, record), project_id in zip(entries, self.resolve_projects(entries)):
+            if project_id is None:
+                continue
+            values, errors = parse_fields(record, KPI_FIELD_TYPES)
+            if not values.get('kpi_type'):
+                errors.insert(0, 'Campo kpi_type é obrigatório')
+            if errors:
+                self.error(line, errors)
+                continue
+            values.setdefault('current_value', 0.0)
+            values.setdefault('is_active', True)
+            values['project_id'] = project_id
+            rows.append(values)
+        if rows:
+            columns = set().union(*rows)
+            db.session.execute(db.insert(ProjectKPI), [{column: row.get(column) for column in columns} for row in rows])
+            self.counts['kpi'] += len(rows)
+
+    def insert_returning(self, model, rows):
+        """executemany de INSERT devolvendo os ids na ordem das linhas"""
+        columns = set().union(*rows)
+        rows = [{column: row.get(column) for column in columns} for row in rows]
+        return db.session.scalars(
+            db.insert(model).returning(model.id, sort_by_parameter_order=True), rows
+        ).all()
+
+    def report_unresolved(self):
+        for parent, children in self.pending_parents.items():
+            for _, line, _ in children:
+                self.error(line, [f'Tarefa pai {parent} não encontrada; tarefa importada sem pai'])
+        for key, dependencies in self.pending_dependencies.items():
+            for dependency in dependencies:
+                self.error(dependency[0], [f'Tarefa {key} não encontrada; dependência ignorada'])
+
+
+def import_data(lines, import_format='ndjson', chunk_size=DEFAULT_CHUNK_SIZE, default_user_id=None):
+    """Importa linhas de texto NDJSON ou CSV. Retorna o relatório da importação"""
+    if import_format not in READERS:
+        raise ValueError(f"Formato inválido: use {' ou '.join(READERS)}")
+    if not isinstance(chunk_size, int) or not 1 <= chunk_size <= MAX_CHUNK_SIZE:
+        raise ValueError(f'chunk_size deve estar entre 1 e {MAX_CHUNK_SIZE}')
+    return Importer(chunk_size, default_user_id).run(READERS[import_format](lines))
+
+
+data_cli = AppGroup('data', help='Importação de dados.')
+
+
+@data_cli.command('import')
+@click.argument('file', type=click.File('r', encoding='utf-8'))
+@click.option('--format', 'import_format', type=click.Choice(list(READERS)), default=None,
+              help='Formato do arquivo (padrão: pela extensão, ndjson se desconhecida).')
+@click.option('--chunk-size', type=click.IntRange(1, MAX_CHUNK_SIZE), default=DEFAULT_CHUNK_SIZE,
+              help='Registros por lote (uma transação por lote).')
+@click.option('--user-id', type=int, default=None, help='Dono dos projetos sem user_id.')
+def import_command(file, import_format, chunk_size, user_id):
+    """Importa projetos, tarefas, dependências e KPIs de um arquivo NDJSON ou CSV"""
+    if import_format is None:
+        import_format = 'csv' if file.name.endswith('.csv') else 'ndjson'
+    report = import_data(file, import_format, chunk_size, user_id)
+    imported = report['imported']
+    click.echo(
+        f"{report['rows']} registros em {report['seconds']}s ({report['rows_per_second']} registros/s): "
+        f"{imported['project']} projetos, {imported['task']} tarefas, "
+        f"{imported['dependency']} dependências, {imported['kpi']} KPIs"
+    )
+    for error in report['errors']:
+        click.echo(f"linha {error['line']}: {'; '.join(error['errors'])}", err=True)
+    if report['error_count'] > len(report['errors']):
+        click.echo(f"... e mais {report['error_count'] - len(report['errors'])} erro(s)", err=True)
+    if report['aborted']:
+        click.echo(report['aborted'], err=True)
+        raise SystemExit(1)
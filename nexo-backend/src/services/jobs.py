@@ -0,0 +1,223 @@
+import json
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from src.models.user import db
+from src.models.database import READ_BIND_KEY
+from src.models.job import ACTIVE_STATUSES, CANCELLED, DONE, FAILED, QUEUED, RUNNING, Job
+
+logger = logging.getLogger(__name__)
+
+# kind -> função(payload, contexto) que devolve o resultado (serializável em JSON)
+JOB_HANDLERS = {}
+
+
+class JobLimitError(Exception):
+    """Limite de jobs simultâneos atingido (por dono ou na fila do processo)"""
+
+    def __init__(self, message, status_code=429):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class JobCancelled(Exception):
+    """Levantada pelo handler quando o cancelamento do job foi pedido"""
+
+
+def job_handler(kind):
+    """Registra a função que executa os jobs de um tipo.
+
+    O handler recebe o payload e um JobContext e roda num contexto de
+    aplicação próprio; as escritas dele são confirmadas na mesma transação
+    que marca o job como concluído (e descartadas se ele falhar ou for
+    cancelado), então o handler não deve chamar commit.
+    """
+    def decorator(f):
+        JOB_HANDLERS[kind] = f
+        return f
+    return decorator
+
+
+class JobContext:
+    """Passado ao handler para checar cancelamento entre etapas"""
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+
+    def cancelled(self):
+        # Consulta direta (o pedido pode ter chegado por outro worker), pela conexão
+        # de leitura quando existe: não abre transação de escrita no SQLite
+        query = db.select(Job.cancel_requested).where(Job.id == self.job_id)
+        engine = db.engines.get(READ_BIND_KEY)
+        if engine is None:
+            return bool(db.session.execute(query).scalar())
+        with engine.connect() as connection:
+            return bool(connection.execute(query).scalar())
+
+    def check_cancelled(self):
+        if self.cancelled():
+            raise JobCancelled()
+
+
+class JobExecutor:
+    """Executa jobs persistidos na tabela Job num pool de threads limitado.
+
+    JOBS_MAX_WORKERS limita as threads do processo, JOBS_MAX_PENDING os jobs
+    aceitos e ainda não finalizados neste processo, JOBS_PER_USER os jobs
+    ativos de cada dono e JOBS_STALE_AFTER (segundos) o tempo após o qual um
+    job ativo é considerado perdido (worker reiniciado). Com JOBS_EAGER o job
+    roda na própria requisição, o que permite testar tudo em processo.
+    O pool só é criado no primeiro job.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self._pool = None
+        self._futures = {}
+        self._lock = threading.RLock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('JOBS_MAX_WORKERS', 4)
+        app.config.setdefault('JOBS_MAX_PENDING', 100)
+        app.config.setdefault('JOBS_PER_USER', 2)
+        app.config.setdefault('JOBS_STALE_AFTER', 15 * 60)
+        app.config.setdefault('JOBS_EAGER', False)
+        self.app = app
+        app.extensions['jobs'] = self
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.app.config['JOBS_MAX_WORKERS'], thread_name_prefix='nexo-job'
+                    )
+        return self._pool
+
+    def stale_before(self):
+        return datetime.utcnow() - timedelta(seconds=self.app.config['JOBS_STALE_AFTER'])
+
+    def submit(self, kind, payload, owner, user_id=None):
+        """Persiste o job como queued e o agenda. Levanta JobLimitError se algum limite foi atingido"""
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f'Tipo de job desconhecido: {kind}')
+        with self._lock:
+            if len(self._futures) >= self.app.config['JOBS_MAX_PENDING']:
+                raise JobLimitError('Fila de jobs cheia, tente novamente em instantes', 503)
+            active = db.session.query(db.func.count(Job.id)).filter(
+                Job.owner == owner,
+                Job.status.in_(ACTIVE_STATUSES),
+                Job.created_at >= self.stale_before()
+            ).scalar()
+            if active >= self.app.config['JOBS_PER_USER']:
+                raise JobLimitError(f"Limite de {self.app.config['JOBS_PER_USER']} job(s) em andamento atingido")
+            # id definido aqui: ler job.id depois do commit abriria outra transação na sessão da requisição
+            job_id = uuid.uuid4().hex
+            job = Job(id=job_id, kind=kind, owner=owner, user_id=user_id, payload=json.dumps(payload))
+            db.session.add(job)
+            db.session.commit()
+            if not self.app.config['JOBS_EAGER']:
+                self._futures[job_id] = self.pool.submit(self._run, job_id)
+
+        if self.app.config['JOBS_EAGER']:
+            self._run(job_id)
+            db.session.expire(job)
+        return job
+
+    def _run(self, job_id):
+        try:
+            with self.app.app_context():
+                self._execute(job_id)
+        except Exception:
+            logger.exception('Falha ao executar o job %s', job_id)
+        finally:
+            with self._lock:
+                self._futures.pop(job_id, None)
+
+    def _execute(self, job_id):
+        # Só começa se ainda estiver na fila (pode ter sido cancelado antes)
+        started = db.session.execute(
+            db.update(Job).where(Job.id == job_id, Job.status == QUEUED)
+            .values(status=RUNNING, started_at=datetime.utcnow())
+        )
+        db.session.commit()
+        if started.rowcount == 0:
+            return
+
+        job = db.session.get(Job, job_id)
+        kind, payload = job.kind, json.loads(job.payload or 'null')
+        # Encerra a transação de leitura: o handler não deve segurar o banco enquanto trabalha
+        db.session.commit()
+        context = JobContext(job_id)
+        try:
+            result = JOB_HANDLERS[kind](payload, context)
+            if context.cancelled():
+                raise JobCancelled()
+        except JobCancelled:
+            db.session.rollback()
+            self._finish(job_id, CANCELLED)
+        except Exception as e:
+            db.session.rollback()
+            logger.exception('Job %s (%s) falhou', job_id, kind)
+            self._finish(job_id, FAILED, error=str(e) or e.__class__.__name__)
+        else:
+            # Resultado e escritas do handler na mesma transação
+            self._finish(job_id, DONE, result=json.dumps(result))
+
+    def _finish(self, job_id, status, result=None, error=None):
+        db.session.execute(
+            db.update(Job).where(Job.id == job_id)
+            .values(status=status, result=result, error=error, finished_at=datetime.utcnow())
+        )
+        db.session.commit()
+
+    def cancel(self, job):
+        """Cancela um job na fila na hora; em execução, pede o cancelamento ao handler"""
+        if job.status == QUEUED:
+            cancelled = db.session.execute(
+                db.update(Job).where(Job.id == job.id, Job.status == QUEUED)
+                .values(status=CANCELLED, cancel_requested=True, finished_at=datetime.utcnow())
+            )
+            if cancelled.rowcount:
+                future = self._futures.get(job.id)
+                if future is not None:
+                    future.cancel()
+        else:
+            db.session.execute(
+                db.update(Job).where(Job.id == job.id, Job.status.in_(ACTIVE_STATUSES)).values(cancel_requested=True)
+            )
+        db.session.commit()
+        db.session.refresh(job)
+        return job
+
+    def expire_stale(self, job):
+        """Marca como falho um job ativo há mais de JOBS_STALE_AFTER (o worker que o executava se perdeu)"""
+        if job.status in ACTIVE_STATUSES and job.created_at and job.created_at < self.stale_before() \
+                and job.id not in self._futures:
+            self._finish(job.id, FAILED, error='Job interrompido antes de terminar')
+            db.session.refresh(job)
+        return job
+
+    def wait(self, job_id, timeout=None):
+        """Espera o job terminar neste processo (testes e scripts)"""
+        future = self._futures.get(job_id)
+        if future is not None:
+            try:
+                future.result(timeout)
+            except Exception:
+                pass
+
+    def shutdown(self, wait=True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+
+def get_executor():
+    return current_app.extensions['jobs']
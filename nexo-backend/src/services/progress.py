@@ -0,0 +1,371 @@
+from datetime import datetime
+from types import SimpleNamespace
+import click
+from flask.cli import AppGroup
+from src.models.user import db
+from src.models.project import Project, ProjectStats, Task
+
+# Somas das folhas, na mesma ordem: por subárvore em Task e por projeto em ProjectStats
+SUBTREE_COLUMNS = (
+    'subtree_leaf_count', 'subtree_estimated_hours', 'subtree_progress_sum', 'subtree_weighted_progress_sum'
+)
+LEAF_COLUMNS = ('leaf_count', 'leaf_estimated_hours', 'leaf_progress_sum', 'leaf_weighted_progress_sum')
+# Campos da tarefa que mudam o rollup de progresso
+PROGRESS_FIELDS = ('parent_task_id', 'estimated_hours', 'progress')
+
+# Tolerância do reconciliador para as somas de ponto flutuante
+FLOAT_TOLERANCE = 1e-6
+
+
+def subtasks_count_column():
+    """Subtarefas no mesmo projeto, como subconsulta correlacionada (define quem é folha)"""
+    child = db.aliased(Task)
+    return db.select(db.func.count(child.id)).where(
+        child.parent_task_id == Task.id, child.project_id == Task.project_id
+    ).correlate(Task).scalar_subquery()
+
+
+def progress_state(task, subtasks_count=None):
+    """Cópia dos campos do rollup de progresso de uma tarefa (ou linha com as mesmas colunas).
+
+    Tire antes de alterar a tarefa; para exclusões informe subtasks_count,
+    as subtarefas que ela tinha no projeto.
+    """
+    state = SimpleNamespace(**{field: getattr(task, field) for field in PROGRESS_FIELDS})
+    state.subtree = [getattr(task, column, None) or 0 for column in SUBTREE_COLUMNS]
+    state.subtasks_count = subtasks_count
+    return state
+
+
+def leaf_values(estimated_hours, progress):
+    """Contribuição de uma folha: (1, horas, progresso, progresso * horas)"""
+    estimated = estimated_hours or 0.0
+    progress = progress or 0.0
+    return [1, estimated, progress, progress * estimated]
+
+
+def rollup_progress(values):
+    """Progresso ponderado pelas horas estimadas das folhas (média simples se nenhuma tem estimativa).
+
+    Mesma regra de ProjectStats.weighted_progress.
+    """
+    count, estimated, progress_sum, weighted_sum = values
+    if estimated > 0:
+        return round(weighted_sum / estimated, 2)
+    return round(progress_sum / count, 2) if count else 0.0
+
+
+def _add(target, values, sign=1):
+    for index, value in enumerate(values):
+        target[index] += sign * value
+
+
+class _Node:
+    """Estado de uma tarefa durante a simulação das mudanças"""
+    __slots__ = ('parent_id', 'estimated_hours', 'progress', 'subtree', 'children')
+
+    def __init__(self, parent_id, estimated_hours, progress, subtree, children):
+        self.parent_id = parent_id
+        self.estimated_hours = estimated_hours
+        self.progress = progress
+        self.subtree = subtree
+        self.children = children
+
+
+def _load_ancestors(project_id, task_ids):
+    """As tarefas e todos os seus ancestrais no projeto, já com as mudanças gravadas"""
+    ancestors = db.select(Task.id).where(Task.id.in_(task_ids)).cte('ancestors', recursive=True)
+    # UNION (e não UNION ALL): um ciclo de parent_task_id não faz a recursão girar
+    ancestors = ancestors.union(
+        db.select(Task.parent_task_id).join(ancestors, Task.id == ancestors.c.id)
+        .where(Task.parent_task_id.isnot(None))
+    )
+    rows = db.session.execute(
+        db.select(
+            Task.id, Task.parent_task_id, Task.estimated_hours, Task.progress,
+            *[getattr(Task, column) for column in SUBTREE_COLUMNS], subtasks_count_column()
+        ).where(Task.id.in_(db.select(ancestors.c.id)), Task.project_id == project_id)
+    )
+    return {
+        row[0]: _Node(row[1], row[2], row[3], [value or 0 for value in row[4:8]], row[8])
+        for row in rows
+    }
+
+
+def apply_progress_changes(project_id, changes):
+    """Mantém o progresso derivado depois de criar, alterar ou excluir tarefas de um projeto.
+
+    changes é uma lista de (task_id, antes, depois) com estados de
+    progress_state() (None para tarefa criada/excluída), na ordem em que as
+    mudanças foram feitas, e deve ser chamada depois de elas irem para a
+    sessão. Só as tarefas mudadas e seus ancestrais são lidos (uma consulta
+    recursiva): o estado anterior é reconstruído a partir das mudanças, que
+    são então reaplicadas em memória propagando as diferenças das somas de
+    folhas até a raiz. Tarefas com subtarefas recebem o progresso das
+    folhas; uma tarefa que perde a última subtarefa volta a ser folha com o
+    progresso que já exibia. As tarefas afetadas são gravadas com um único
+    UPDATE em lote.
+    Retorna o delta do rollup do projeto (somas de folhas e de progresso)
+    para somar ao das próprias tarefas em apply_stats_delta.
+    """
+    if not changes:
+        return {}
+    start = set()
+    for task_id, before, after in changes:
+        if after is not None:
+            start.add(task_id)
+        for state in (before, after):
+            if state is not None and state.parent_task_id is not None:
+                start.add(state.parent_task_id)
+    nodes = _load_ancestors(project_id, start) if start else {}
+    stored = {task_id: node.progress for task_id, node in nodes.items()}
+
+    # Volta ao estado anterior: contagem de subtarefas e campos próprios de cada tarefa mudada
+    for task_id, before, after in changes:
+        if after is not None and after.parent_task_id in nodes:
+            nodes[after.parent_task_id].children -= 1
+        if before is not None and before.parent_task_id in nodes:
+            nodes[before.parent_task_id].children += 1
+    for task_id, before, after in changes:
+        if before is None:
+            nodes.pop(task_id, None)
+            continue
+        node = nodes.get(task_id)
+        if node is None:
+            node = nodes[task_id] = _Node(None, None, None, None, before.subtasks_count or 0)
+        node.parent_id = before.parent_task_id
+        node.estimated_hours = before.estimated_hours
+        node.progress = before.progress
+        node.subtree = list(before.subtree)
+
+    leaf_delta = [0, 0.0, 0.0, 0.0]
+    touched = set()
+
+    def propagate(task_id, delta):
+        seen = set()
+        while task_id in nodes and task_id not in seen:
+            seen.add(task_id)
+            touched.add(task_id)
+            _add(nodes[task_id].subtree, delta)
+            task_id = nodes[task_id].parent_id
+
+    def attach(task_id, parent_id):
+        node = nodes[task_id]
+        node.parent_id = parent_id
+        parent = nodes.get(parent_id)
+        if parent is None:
+            return
+        delta = list(node.subtree)
+        if parent.children == 0:
+            # O pai deixa de ser folha: sai a contribuição própria, entram as folhas da subtarefa
+            _add(leaf_delta, leaf_values(parent.estimated_hours, parent.progress), -1)
+            _add(delta, parent.subtree, -1)
+        parent.children += 1
+        propagate(parent_id, delta)
+
+    def detach(task_id):
+        node = nodes[task_id]
+        parent = nodes.get(node.parent_id)
+        if parent is not None:
+            parent.children -= 1
+            delta = [-value for value in node.subtree]
+            if parent.children == 0:
+                # Volta a ser folha com o progresso gravado (o derivado, salvo se enviado no lote)
+                own = leaf_values(parent.estimated_hours, parent.progress)
+                _add(leaf_delta, own)
+                delta = [a - b for a, b in zip(own, parent.subtree)]
+            propagate(node.parent_id, delta)
+        node.parent_id = None
+
+    for task_id, before, after in changes:
+        if before is None:
+            own = leaf_values(after.estimated_hours, after.progress)
+            nodes[task_id] = _Node(None, after.estimated_hours, after.progress, list(own), 0)
+            _add(leaf_delta, own)
+            touched.add(task_id)
+            attach(task_id, after.parent_task_id)
+        elif after is None:
+            node = nodes[task_id]
+            if node.children == 0:
+                _add(leaf_delta, leaf_values(node.estimated_hours, node.progress), -1)
+            detach(task_id)
+            # Subtarefas que restarem viram raízes (parent_task_id anulado na exclusão)
+            del nodes[task_id]
+            touched.discard(task_id)
+        else:
+            node = nodes[task_id]
+            moved = after.parent_task_id != before.parent_task_id
+            if moved:
+                detach(task_id)
+            if node.children == 0:
+                delta = leaf_values(after.estimated_hours, after.progress)
+                _add(delta, node.subtree, -1)
+                _add(leaf_delta, delta)
+                propagate(task_id, delta)
+            node.estimated_hours = after.estimated_hours
+            node.progress = after.progress
+            touched.add(task_id)
+            if moved:
+                attach(task_id, after.parent_task_id)
+
+    rows = []
+    delta = dict(zip(LEAF_COLUMNS, leaf_delta))
+    delta['progress_sum'] = delta['weighted_progress_sum'] = 0.0
+    for task_id in touched:
+        node = nodes[task_id]
+        progress = rollup_progress(node.subtree) if node.children else node.progress
+        rows.append({'task_id': task_id, 'new_progress': progress, **dict(zip(SUBTREE_COLUMNS, node.subtree))})
+        # O progresso gravado pela rota/serviço entra no rollup pelo delta dele; aqui só a diferença
+        previous = stored.get(task_id)
+        if progress != previous:
+            estimated = node.estimated_hours or 0.0
+            delta['progress_sum'] += (progress or 0.0) - (previous or 0.0)
+            delta['weighted_progress_sum'] += ((progress or 0.0) - (previous or 0.0)) * estimated
+    if rows:
+        _write_progress(db.session, rows)
+        # As linhas foram gravadas por fora do ORM: recarrega o que estiver na sessão
+        for obj in list(db.session.identity_map.values()):
+            if isinstance(obj, Task) and obj.id in touched:
+                db.session.expire(obj, ['progress', 'updated_at', *SUBTREE_COLUMNS])
+    return {column: value for column, value in delta.items() if value}
+
+
+def _write_progress(executor, rows):
+    """UPDATE em lote de progress e das somas de folhas (executor: sessão ou conexão)"""
+    table = Task.__table__
+    values = {column: db.bindparam(f'new_{column}') for column in SUBTREE_COLUMNS}
+    executor.execute(
+        table.update().where(table.c.id == db.bindparam('task_id'))
+        .values(progress=db.bindparam('new_progress'), **values),
+        [
+            {
+                'task_id': row['task_id'], 'new_progress': row['new_progress'],
+                **{f'new_{column}': row[column] for column in SUBTREE_COLUMNS}
+            }
+            for row in rows
+        ]
+    )
+
+
+def update_project_progress(executor, project_ids):
+    """Grava Project.progress a partir das somas de folhas do rollup (ProjectStats.weighted_progress)"""
+    progress = db.select(ProjectStats.weighted_progress_column()).where(
+        ProjectStats.project_id == Project.id
+    ).scalar_subquery()
+    executor.execute(
+        db.update(Project).where(Project.id.in_(list(project_ids)))
+        .values(progress=db.func.coalesce(progress, Project.progress))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def reconcile_progress(connection, project_ids=None):
+    """Recalcula em lote o progresso derivado das tarefas e dos projetos.
+
+    Lê as tarefas uma vez, percorre cada árvore a partir das raízes (tarefas
+    sem pai no projeto) e soma as folhas de baixo para cima; tarefas num
+    ciclo de parent_task_id não são alcançáveis e ficam com os próprios
+    valores. Só as tarefas com somas ou progresso divergentes são gravadas,
+    e o rollup dos projetos recebe as somas de folhas recalculadas. Usa só a
+    conexão (Core), então serve também às migrações.
+    Retorna (tarefas corrigidas, projetos reconciliados).
+    """
+    query = db.select(
+        Task.id, Task.project_id, Task.parent_task_id, Task.estimated_hours, Task.progress,
+        *[getattr(Task, column) for column in SUBTREE_COLUMNS]
+    )
+    projects_query = db.select(Project.id)
+    if project_ids is not None:
+        project_ids = list(project_ids)
+        query = query.where(Task.project_id.in_(project_ids))
+        projects_query = projects_query.where(Project.id.in_(project_ids))
+    tasks = {row.id: row for row in connection.execute(query)}
+
+    children = {}
+    roots = []
+    for row in tasks.values():
+        parent = tasks.get(row.parent_task_id)
+        if parent is not None and parent.project_id == row.project_id:
+            children.setdefault(row.parent_task_id, []).append(row.id)
+        else:
+            roots.append(row.id)
+    order = list(roots)
+    for task_id in order:
+        order.extend(children.get(task_id, ()))
+    reachable = set(order)
+    # Tarefas fora de qualquer árvore (ciclos) ficam com os próprios valores
+    order.extend(task_id for task_id in tasks if task_id not in reachable)
+
+    subtree = {}
+    progress = {}
+    for task_id in reversed(order):
+        row = tasks[task_id]
+        kids = [kid for kid in children.get(task_id, ()) if kid in subtree] if task_id in reachable else []
+        if kids:
+            values = [0, 0.0, 0.0, 0.0]
+            for kid in kids:
+                _add(values, subtree[kid])
+            progress[task_id] = rollup_progress(values)
+        else:
+            values = leaf_values(row.estimated_hours, row.progress)
+            progress[task_id] = row.progress
+        subtree[task_id] = values
+
+    rows = []
+    project_values = {}
+    for task_id, row in tasks.items():
+        sums = project_values.setdefault(row.project_id, [0, 0.0, 0.0, 0.0, 0.0, 0.0])
+        # Folha é quem não tem subtarefas no projeto, como em compute_project_stats
+        if task_id not in children:
+            _add(sums, leaf_values(row.estimated_hours, row.progress))
+        stored = [row[5 + index] or 0 for index in range(len(SUBTREE_COLUMNS))]
+        progress_changed = progress[task_id] != row.progress
+        if progress_changed or any(
+            abs(a - b) > FLOAT_TOLERANCE for a, b in zip(stored, subtree[task_id])
+        ):
+            rows.append({'task_id': task_id, 'new_progress': progress[task_id],
+                         **dict(zip(SUBTREE_COLUMNS, subtree[task_id]))})
+        if progress_changed:
+            difference = (progress[task_id] or 0.0) - (row.progress or 0.0)
+            sums[4] += difference
+            sums[5] += difference * (row.estimated_hours or 0.0)
+    if rows:
+        _write_progress(connection, rows)
+
+    project_list = [row[0] for row in connection.execute(projects_query)]
+    if project_list:
+        stats = ProjectStats.__table__
+        values = {column: db.bindparam(f'new_{column}') for column in LEAF_COLUMNS}
+        connection.execute(
+            stats.update().where(stats.c.project_id == db.bindparam('stats_project_id')).values(
+                progress_sum=stats.c.progress_sum + db.bindparam('progress_delta'),
+                weighted_progress_sum=stats.c.weighted_progress_sum + db.bindparam('weighted_delta'),
+                updated_at=datetime.utcnow(),
+                **values
+            ),
+            [
+                {
+                    'stats_project_id': pid,
+                    **{f'new_{column}': value for column, value in zip(LEAF_COLUMNS, sums[:4])},
+                    'progress_delta': sums[4], 'weighted_delta': sums[5]
+                }
+                for pid in project_list
+                for sums in [project_values.get(pid, [0, 0.0, 0.0, 0.0, 0.0, 0.0])]
+            ]
+        )
+        update_project_progress(connection, project_list)
+    return len(rows), len(project_list)
+
+
+progress_cli = AppGroup('progress', help='Manutenção do progresso derivado das tarefas.')
+
+
+@progress_cli.command('reconcile')
+@click.option('--project-id', type=int, default=None, help='Reconciliar apenas este projeto.')
+def reconcile_command(project_id):
+    """Recalcula o progresso das tarefas com subtarefas e dos projetos a partir das folhas"""
+    updated, projects = reconcile_progress(
+        db.session.connection(), None if project_id is None else [project_id]
+    )
+    db.session.commit()
+    click.echo(f'Progresso reconciliado em {projects} projeto(s); {updated} tarefa(s) corrigida(s).')
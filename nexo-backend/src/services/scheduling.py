@@ -0,0 +1,300 @@
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import Iterable
+import heapq
+import math
+
+HOURS_PER_DAY = 8
+# Distância máxima (em dias) de um feriado ao início do calendário
+MAX_CALENDAR_DAYS = 366 * 100
+
+# Tipos de dependência aceitos (predecessora -> sucessora)
+FINISH_TO_START = 'finish_to_start'
+START_TO_START = 'start_to_start'
+FINISH_TO_FINISH = 'finish_to_finish'
+START_TO_FINISH = 'start_to_finish'
+DEPENDENCY_TYPES = (FINISH_TO_START, START_TO_START, FINISH_TO_FINISH, START_TO_FINISH)
+
+# Folga máxima (em dias) para uma tarefa ser considerada crítica
+CRITICAL_EPSILON = 1e-9
+
+
+class ScheduleCycleError(ValueError):
+    """O grafo de dependências contém ciclo"""
+
+    def __init__(self, task_ids):
+        self.task_ids = task_ids
+        super().__init__('Dependências circulares envolvendo as tarefas: ' + ', '.join(str(t) for t in task_ids[:20]))
+
+
+def duration_days(estimated_hours):
+    """Duração em dias úteis a partir das horas estimadas"""
+    return (estimated_hours or 0) / HOURS_PER_DAY
+
+
+def critical_path(durations, dependencies):
+    """Método do caminho crítico (CPM) em O(V+E).
+
+    durations: {task_id: duração em dias}
+    dependencies: iterável de (task_id, depends_on_task_id, dependency_type)
+
+    Faz a passada para frente em ordem topológica (Kahn) e a passada para
+    trás na ordem inversa, respeitando os quatro tipos de dependência.
+    Retorna (resultado por tarefa, duração do projeto, caminho crítico).
+    Dependências para tarefas desconhecidas são ignoradas.
+    """
+    index = {task_id: i for i, task_id in enumerate(durations)}
+    ids = list(durations)
+    duration = [durations[task_id] for task_id in ids]
+    n = len(ids)
+
+    successors = [[] for _ in range(n)]
+    predecessors = [[] for _ in range(n)]
+    indegree = [0] * n
+    for task_id, depends_on, dependency_type in dependencies:
+        succ = index.get(task_id)
+        pred = index.get(depends_on)
+        if succ is None or pred is None:
+            continue
+        kind = dependency_type or FINISH_TO_START
+        if kind not in DEPENDENCY_TYPES:
+            raise ValueError(f'Tipo de dependência inválido: {kind}')
+        successors[pred].append((succ, kind))
+        predecessors[succ].append((pred, kind))
+        indegree[succ] += 1
+
+    order = []
+    queue = deque(i for i in range(n) if indegree[i] == 0)
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for succ, _ in successors[node]:
+            indegree[succ] -= 1
+            if indegree[succ] == 0:
+                queue.append(succ)
+    if len(order) < n:
+        raise ScheduleCycleError([ids[i] for i in range(n) if indegree[i] > 0])
+
+    # Passada para frente: início mais cedo
+    early_start = [0.0] * n
+    for node in order:
+        start = 0.0
+        d = duration[node]
+        for pred, kind in predecessors[node]:
+            if kind == FINISH_TO_START:
+                bound = early_start[pred] + duration[pred]
+            elif kind == START_TO_START:
+                bound = early_start[pred]
+            elif kind == FINISH_TO_FINISH:
+                bound = early_start[pred] + duration[pred] - d
+            else:  # START_TO_FINISH
+                bound = early_start[pred] - d
+            if bound > start:
+                start = bound
+        early_start[node] = start
+
+    project_duration = max((early_start[i] + duration[i] for i in range(n)), default=0.0)
+
+    # Passada para trás: término mais tarde
+    late_finish = [project_duration] * n
+    for node in reversed(order):
+        finish = project_duration
+        d = duration[node]
+        for succ, kind in successors[node]:
+            late_start_succ = late_finish[succ] - duration[succ]
+            if kind == FINISH_TO_START:
+                bound = late_start_succ
+            elif kind == START_TO_START:
+                bound = late_start_succ + d
+            elif kind == FINISH_TO_FINISH:
+                bound = late_finish[succ]
+            else:  # START_TO_FINISH
+                bound = late_finish[succ] + d
+            if bound < finish:
+                finish = bound
+        late_finish[node] = finish
+
+    results = {}
+    critical = []
+    for node in order:
+        slack = late_finish[node] - duration[node] - early_start[node]
+        is_critical = slack <= CRITICAL_EPSILON
+        results[ids[node]] = {
+            'duration_days': duration[node],
+            'early_start': early_start[node],
+            'early_finish': early_start[node] + duration[node],
+            'late_start': late_finish[node] - duration[node],
+            'late_finish': late_finish[node],
+            'slack': max(0.0, slack),
+            'critical': is_critical
+        }
+        if is_critical:
+            critical.append(ids[node])
+    critical.sort(key=lambda task_id: (results[task_id]['early_start'], results[task_id]['early_finish']))
+    return results, project_duration, critical
+
+
+class WorkCalendar:
+    """Calendário de trabalho de um recurso em coordenadas numéricas.
+
+    O tempo é medido em dias (float) a partir do dia 0 do cronograma. Os
+    primeiros dias, até a semana do último feriado, ficam numa tabela em
+    que cum[d] guarda as horas de trabalho disponíveis antes do dia d;
+    depois dela o calendário só repete a semana, então a conversão entre
+    tempo de calendário e horas trabalhadas pula semanas inteiras com
+    aritmética. O custo não depende da distância no tempo.
+    """
+
+    def __init__(self, start_date, hours_per_day=HOURS_PER_DAY, working_days=(0, 1, 2, 3, 4), holidays=()):
+        if isinstance(hours_per_day, bool) or not isinstance(hours_per_day, (int, float)) \
+                or not math.isfinite(hours_per_day) or hours_per_day <= 0:
+            raise ValueError('Capacidade diária do recurso deve ser um número maior que zero')
+        if isinstance(working_days, (str, bytes)) or not isinstance(working_days, Iterable) or not all(
+            isinstance(day, int) and not isinstance(day, bool) and 0 <= day <= 6 for day in working_days
+        ):
+            raise ValueError('working_days deve ser uma lista de dias da semana entre 0 (segunda) e 6 (domingo)')
+        working_days = frozenset(working_days)
+        if not working_days:
+            raise ValueError('Recurso precisa de pelo menos um dia útil na semana')
+        start_weekday = start_date.weekday()
+        start_ordinal = start_date.toordinal()
+        self.hours_per_day = float(hours_per_day)
+        self.working_days = working_days
+
+        # Feriados em dias úteis a partir do início; depois do último a semana se repete
+        offsets = {
+            day - start_ordinal for day in holidays
+            if day >= start_ordinal and (start_weekday + day - start_ordinal) % 7 in working_days
+        }
+        if offsets and max(offsets) >= MAX_CALENDAR_DAYS:
+            raise ValueError(f'Feriados devem estar a menos de {MAX_CALENDAR_DAYS} dias do início')
+        horizon = 7 * (max(offsets, default=0) // 7 + 1)
+
+        self.week = [
+            self.hours_per_day if (start_weekday + day) % 7 in working_days else 0.0 for day in range(7)
+        ]
+        self.week_prefix = [0.0]
+        for capacity in self.week:
+            self.week_prefix.append(self.week_prefix[-1] + capacity)
+        self.week_hours = self.week_prefix[-1]
+
+        self.capacity = [0.0 if day in offsets else self.week[day % 7] for day in range(horizon)]
+        self.cum = [0.0]
+        for capacity in self.capacity:
+            self.cum.append(self.cum[-1] + capacity)
+        self.horizon = horizon
+
+    def work_at(self, t):
+        """Horas de trabalho acumuladas até o instante t"""
+        day = int(t)
+        if day < self.horizon:
+            return self.cum[day] + (t - day) * self.capacity[day]
+        weeks, weekday = divmod(day - self.horizon, 7)
+        return self.cum[-1] + weeks * self.week_hours + self.week_prefix[weekday] + (t - day) * self.week[weekday]
+
+    def time_at(self, hours):
+        """Primeiro instante em que as horas acumuladas atingem hours"""
+        if hours < self.cum[-1]:
+            # bisect_right devolve o último dia com cum <= hours, que sempre tem capacidade
+            day = bisect_right(self.cum, hours) - 1
+            return day + (hours - self.cum[day]) / self.capacity[day]
+        weeks, rest = divmod(hours - self.cum[-1], self.week_hours)
+        weekday = bisect_right(self.week_prefix, rest) - 1
+        return self.horizon + 7 * weeks + weekday + (rest - self.week_prefix[weekday]) / self.week[weekday]
+
+    def end_at(self, hours):
+        """Instante em que o trabalho acumulado completa hours (fim do expediente, não o próximo dia útil)"""
+        if hours <= self.cum[-1]:
+            day = bisect_left(self.cum, hours) - 1
+            return day + (hours - self.cum[day]) / self.capacity[day]
+        weeks, rest = divmod(hours - self.cum[-1], self.week_hours)
+        if rest == 0:
+            # Fim exato de uma semana: o trabalho termina no último dia útil dela
+            weeks, rest = weeks - 1, self.week_hours
+        weekday = bisect_left(self.week_prefix, rest) - 1
+        return self.horizon + 7 * weeks + weekday + (rest - self.week_prefix[weekday]) / self.week[weekday]
+
+    def finish(self, start, hours):
+        """(início efetivo, término) de hours de trabalho a partir de start"""
+        worked = self.work_at(start)
+        begin = self.time_at(worked)
+        return begin, (self.end_at(worked + hours) if hours > 0 else begin)
+
+
+PRIORITY_WEIGHTS = {'urgent': 3, 'high': 2, 'medium': 1, 'low': 0}
+
+
+def resource_schedule(hours, dependencies, resources, assignments=None, priorities=None):
+    """Escalonamento por lista com restrição de recursos (serial, com fila de prioridade).
+
+    hours: horas estimadas por tarefa (índice = posição)
+    dependencies: lista de listas com os índices das predecessoras de cada tarefa
+    resources: {resource_id: WorkCalendar}, cada recurso executa uma tarefa por vez
+    assignments: recurso fixo por tarefa (None = qualquer recurso)
+    priorities: peso de prioridade de negócio por tarefa (desempate)
+
+    A prioridade de cada tarefa é o comprimento do caminho restante até o
+    fim do projeto (em horas); entre as tarefas liberadas, a de maior
+    prioridade é alocada no recurso que a termina mais cedo. Tarefas sem
+    dependência entre si rodam em paralelo quando há recursos livres.
+    Retorna listas (início, término, recurso) indexadas por tarefa.
+    """
+    n = len(hours)
+    assignments = assignments or [None] * n
+    priorities = priorities or [0] * n
+
+    successors = [[] for _ in range(n)]
+    indegree = [0] * n
+    for task, preds in enumerate(dependencies):
+        for pred in preds:
+            if not 0 <= pred < n or pred == task:
+                raise ValueError(f'Dependência inválida na tarefa {task}: {pred}')
+            successors[pred].append(task)
+            indegree[task] += 1
+
+    order = []
+    remaining = indegree[:]
+    queue = deque(i for i in range(n) if remaining[i] == 0)
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for succ in successors[node]:
+            remaining[succ] -= 1
+            if remaining[succ] == 0:
+                queue.append(succ)
+    if len(order) < n:
+        raise ScheduleCycleError([i for i in range(n) if remaining[i] > 0])
+
+    # Comprimento do caminho restante (regra "maior caminho restante primeiro")
+    rank = [0.0] * n
+    for node in reversed(order):
+        rank[node] = hours[node] + max((rank[succ] for succ in successors[node]), default=0.0)
+
+    resource_ids = list(resources)
+    available = {resource_id: 0.0 for resource_id in resource_ids}
+    ready_at = [0.0] * n
+    start = [0.0] * n
+    finish = [0.0] * n
+    assigned = [None] * n
+
+    heap = [(-rank[i], -priorities[i], i) for i in range(n) if indegree[i] == 0]
+    heapq.heapify(heap)
+    while heap:
+        _, _, task = heapq.heappop(heap)
+        candidates = [assignments[task]] if assignments[task] is not None else resource_ids
+        best = None
+        for resource_id in candidates:
+            begin, end = resources[resource_id].finish(max(ready_at[task], available[resource_id]), hours[task])
+            if best is None or end < best[1]:
+                best = (begin, end, resource_id)
+        start[task], finish[task], assigned[task] = best
+        available[best[2]] = best[1]
+
+        for succ in successors[task]:
+            if finish[task] > ready_at[succ]:
+                ready_at[succ] = finish[task]
+            indegree[succ] -= 1
+            if indegree[succ] == 0:
+                heapq.heappush(heap, (-rank[succ], -priorities[succ], succ))
+
+    return start, finish, assigned
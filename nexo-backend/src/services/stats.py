@@ -0,0 +1,234 @@
+from datetime import datetime
+import click
+from flask.cli import AppGroup
+from src.models.user import db
+from src.models.project import Project, Task, ProjectStats
+from src.services.progress import LEAF_COLUMNS, subtasks_count_column, update_project_progress
+
+# Status com contador próprio no rollup; outros status entram só no total
+STATUS_COLUMNS = {
+    'todo': 'todo_count',
+    'in_progress': 'in_progress_count',
+    'done': 'done_count',
+    'blocked': 'blocked_count'
+}
+
+STATS_COLUMNS = (
+    'task_count', 'todo_count', 'in_progress_count', 'done_count', 'blocked_count',
+    'estimated_hours', 'actual_hours', 'progress_sum', 'weighted_progress_sum', *LEAF_COLUMNS
+)
+
+# Tolerância do verificador para as somas de ponto flutuante
+FLOAT_TOLERANCE = 1e-6
+
+
+def task_contribution(task):
+    """Contribuição de uma tarefa para as colunas do rollup"""
+    estimated = task.estimated_hours or 0.0
+    progress = task.progress or 0.0
+    values = {
+        'task_count': 1,
+        'estimated_hours': estimated,
+        'actual_hours': task.actual_hours or 0.0,
+        'progress_sum': progress,
+        'weighted_progress_sum': progress * estimated
+    }
+    column = STATUS_COLUMNS.get(task.status)
+    if column:
+        values[column] = 1
+    return values
+
+
+def stats_delta(before=None, after=None):
+    """Diferença entre duas contribuições (None representa tarefa inexistente)"""
+    delta = {}
+    for column, value in (after or {}).items():
+        delta[column] = delta.get(column, 0) + value
+    for column, value in (before or {}).items():
+        delta[column] = delta.get(column, 0) - value
+    return {column: value for column, value in delta.items() if value}
+
+
+def merge_deltas(*deltas):
+    """Soma vários deltas, para aplicar uma única atualização por projeto"""
+    merged = {}
+    for delta in deltas:
+        for column, value in delta.items():
+            merged[column] = merged.get(column, 0) + value
+    return {column: value for column, value in merged.items() if value}
+
+
+def apply_stats_delta(project_id, delta):
+    """Aplica um delta ao rollup com UPDATE col = col + :delta.
+
+    O incremento é feito pelo banco, então escritas concorrentes não se
+    sobrescrevem. Se o projeto ainda não tem linha de rollup (bancos
+    anteriores à tabela), ela é reconstruída a partir das tarefas, o que
+    já inclui a mudança pendente na sessão. Quando as somas de folhas mudam,
+    Project.progress é regravado a partir delas.
+    """
+    if not delta:
+        return
+    values = {column: getattr(ProjectStats, column) + value for column, value in delta.items()}
+    values['updated_at'] = datetime.utcnow()
+    result = db.session.execute(
+        db.update(ProjectStats).where(ProjectStats.project_id == project_id).values(**values)
+    )
+    if result.rowcount == 0:
+        rebuild_project_stats(project_id)
+    elif any(column in delta for column in LEAF_COLUMNS):
+        update_project_progress(db.session, [project_id])
+
+
+def compute_project_stats(project_id=None, executor=None):
+    """Recalcula o rollup a partir da tabela de tarefas (GROUP BY projeto, status).
+
+    executor é a sessão (padrão) ou uma conexão, como nas migrações.
+    """
+    executor = executor or db.session
+    progress = db.func.coalesce(Task.progress, 0.0)
+    estimated = db.func.coalesce(Task.estimated_hours, 0.0)
+    query = db.select(
+        Task.project_id,
+        Task.status,
+        db.func.count(Task.id),
+        db.func.sum(estimated),
+        db.func.sum(db.func.coalesce(Task.actual_hours, 0.0)),
+        db.func.sum(progress),
+        db.func.sum(progress * estimated)
+    )
+    if project_id is not None:
+        query = query.where(Task.project_id == project_id)
+
+    computed = {}
+    for row_project_id, status, count, est, act, prog, weighted in executor.execute(query.group_by(Task.project_id, Task.status)):
+        values = computed.setdefault(row_project_id, {column: 0 for column in STATS_COLUMNS})
+        values['task_count'] += count
+        values['estimated_hours'] += float(est or 0)
+        values['actual_hours'] += float(act or 0)
+        values['progress_sum'] += float(prog or 0)
+        values['weighted_progress_sum'] += float(weighted or 0)
+        column = STATUS_COLUMNS.get(status)
+        if column:
+            values[column] += count
+
+    # Folhas: tarefas sem subtarefas no projeto
+    leaves = db.select(
+        Task.project_id,
+        db.func.count(Task.id),
+        db.func.sum(estimated),
+        db.func.sum(progress),
+        db.func.sum(progress * estimated)
+    ).where(subtasks_count_column() == 0)
+    if project_id is not None:
+        leaves = leaves.where(Task.project_id == project_id)
+    for row_project_id, *sums in executor.execute(leaves.group_by(Task.project_id)):
+        values = computed.setdefault(row_project_id, {column: 0 for column in STATS_COLUMNS})
+        for column, value in zip(LEAF_COLUMNS, sums):
+            values[column] = value or 0
+    return computed
+
+
+def rebuild_project_stats(project_id=None):
+    """Reconstrói o rollup de um projeto (ou de todos). Retorna quantos projetos foram gravados"""
+    computed = compute_project_stats(project_id)
+    if project_id is not None:
+        project_ids = [project_id]
+    else:
+        project_ids = [row[0] for row in db.session.query(Project.id)]
+
+    for pid in project_ids:
+        values = computed.get(pid, {column: 0 for column in STATS_COLUMNS})
+        db.session.merge(ProjectStats(project_id=pid, updated_at=datetime.utcnow(), **values))
+    if project_ids:
+        db.session.flush()
+        update_project_progress(db.session, project_ids)
+    return len(project_ids)
+
+
+def check_project_stats(project_id=None):
+    """Compara o rollup gravado com um recálculo completo e lista as divergências"""
+    computed = compute_project_stats(project_id)
+    query = db.session.query(Project.id)
+    if project_id is not None:
+        query = query.filter(Project.id == project_id)
+    stored_query = ProjectStats.query
+    if project_id is not None:
+        stored_query = stored_query.filter(ProjectStats.project_id == project_id)
+    stored = {stats.project_id: stats for stats in stored_query}
+
+    mismatches = []
+    for (pid,) in query:
+        expected = computed.get(pid, {column: 0 for column in STATS_COLUMNS})
+        stats = stored.get(pid)
+        if stats is None:
+            mismatches.append({'project_id': pid, 'field': None, 'stored': None, 'expected': expected})
+            continue
+        for column in STATS_COLUMNS:
+            if abs((getattr(stats, column) or 0) - expected[column]) > FLOAT_TOLERANCE:
+                mismatches.append({
+                    'project_id': pid, 'field': column,
+                    'stored': getattr(stats, column), 'expected': expected[column]
+                })
+    return mismatches
+
+
+def create_missing_stats(executor):
+    """Grava o rollup dos projetos que ainda não têm linha em project_stats.
+
+    Projetos novos já nascem com a linha; isto cobre bancos anteriores à
+    tabela (migração 3). Retorna os ids dos projetos completados.
+    """
+    missing = [row[0] for row in executor.execute(
+        db.select(Project.id).where(~db.exists().where(ProjectStats.project_id == Project.id))
+    )]
+    if missing:
+        computed = compute_project_stats(executor=executor)
+        now = datetime.utcnow()
+        executor.execute(db.insert(ProjectStats), [
+            {'project_id': pid, 'updated_at': now, **computed.get(pid, {column: 0 for column in STATS_COLUMNS})}
+            for pid in missing
+        ])
+        update_project_progress(executor, missing)
+    return missing
+
+
+def get_project_stats(project_id):
+    """Leitura do rollup por chave primária.
+
+    Sem linha gravada, devolve um rollup recalculado na hora e não gravado:
+    leituras não escrevem no banco (a linha é criada junto com o projeto ou
+    pela migração).
+    """
+    stats = db.session.get(ProjectStats, project_id)
+    if stats is None:
+        values = compute_project_stats(project_id).get(project_id, {column: 0 for column in STATS_COLUMNS})
+        stats = ProjectStats(project_id=project_id, **values)
+    return stats
+
+
+stats_cli = AppGroup('stats', help='Manutenção do rollup de estatísticas dos projetos.')
+
+
+@stats_cli.command('rebuild')
+@click.option('--project-id', type=int, default=None, help='Reconstruir apenas este projeto.')
+def rebuild_command(project_id):
+    """Recalcula o rollup a partir das tarefas"""
+    count = rebuild_project_stats(project_id)
+    db.session.commit()
+    click.echo(f'Rollup reconstruído para {count} projeto(s).')
+
+
+@stats_cli.command('check')
+@click.option('--project-id', type=int, default=None, help='Verificar apenas este projeto.')
+def check_command(project_id):
+    """Verifica se o rollup confere com um recálculo completo"""
+    mismatches = check_project_stats(project_id)
+    for mismatch in mismatches:
+        click.echo(
+            f"projeto {mismatch['project_id']}: {mismatch['field'] or 'rollup ausente'} "
+            f"gravado={mismatch['stored']} esperado={mismatch['expected']}"
+        )
+    if mismatches:
+        raise SystemExit(1)
+    click.echo('Rollup consistente.')
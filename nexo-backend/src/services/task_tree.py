@@ -0,0 +1,117 @@
+from src.models.user import db
+from src.models.project import Task
+from src.services.progress import leaf_values, rollup_progress
+
+# Colunas de cada nó da árvore (sem description, que pode ser grande)
+TREE_COLUMNS = (
+    'id', 'parent_task_id', 'title', 'status', 'priority', 'progress', 'estimated_hours', 'actual_hours',
+    'assigned_to', 'start_date', 'end_date', 'order_index'
+)
+# Profundidade máxima percorrida pela consulta recursiva; nós mais fundos ficam de fora
+MAX_TREE_DEPTH = 100
+
+
+def task_tree_query(project_id, root_id=None):
+    """Consulta WITH RECURSIVE com todas as tarefas da árvore, em ordem de profundidade.
+
+    A âncora são as raízes do projeto (sem pai no projeto) ou só root_id;
+    cada passo desce um nível pelo índice de parent_task_id. Como cada
+    tarefa tem um único pai, uma tarefa só se repete se a descida voltar à
+    âncora: raízes não têm pai e nunca são alcançadas de novo, e root_id
+    pode estar num ciclo de parent_task_id, por isso a recursão não desce
+    de volta a ele. Tarefas em ciclos fora da âncora não são alcançáveis.
+    Dentro de cada nível a ordem é (order_index, id), a mesma da listagem.
+    """
+    columns = [getattr(Task, column) for column in TREE_COLUMNS]
+    if root_id is None:
+        parent = db.aliased(Task)
+        anchor = db.select(db.literal(0).label('depth'), *columns).outerjoin(
+            parent, db.and_(parent.id == Task.parent_task_id, parent.project_id == Task.project_id)
+        ).where(Task.project_id == project_id, parent.id.is_(None))
+    else:
+        anchor = db.select(db.literal(0).label('depth'), *columns).where(
+            Task.project_id == project_id, Task.id == root_id
+        )
+    tree = anchor.cte('task_tree', recursive=True)
+    child = db.aliased(Task)
+    step = [child.project_id == project_id, tree.c.depth < MAX_TREE_DEPTH]
+    if root_id is not None:
+        step.append(child.id != root_id)
+    # As colunas já vêm na recursão: nenhum join extra com task por linha no final
+    tree = tree.union_all(
+        db.select(tree.c.depth + 1, *[getattr(child, column) for column in TREE_COLUMNS])
+        .join(tree, child.parent_task_id == tree.c.id)
+        .where(*step)
+    )
+    return db.select(tree).order_by(tree.c.depth, db.func.coalesce(tree.c.order_index, 0), tree.c.id)
+
+
+def _rollup(totals):
+    count, done, actual = totals[:3]
+    # Horas estimadas e progresso vêm das folhas, como o progresso derivado gravado
+    # (src.services.progress); tarefas e horas reais somam a subárvore toda
+    return {
+        'tasks': count,
+        'done_tasks': done,
+        'estimated_hours': round(totals[4], 2),
+        'actual_hours': round(actual, 2),
+        'progress': rollup_progress(totals[3:])
+    }
+
+
+def build_task_tree(rows, max_depth=None):
+    """Monta a árvore em O(n) a partir das linhas ordenadas por profundidade.
+
+    Na ida, cada nó é pendurado no pai (já visto, pois está num nível
+    anterior); na volta, em ordem inversa, os totais de cada nó são somados
+    aos do pai, então cada subárvore chega completa ao seu topo. Um nó com
+    subtarefas contribui com as folhas delas no lugar das próprias horas
+    estimadas e do próprio progresso. Nós abaixo
+    de max_depth entram nos totais mas não na resposta.
+    Retorna (raízes, totais do projeto, número de nós).
+    """
+    nodes = {}
+    roots = []
+    entries = []
+    for row in rows:
+        depth, task_id, parent_id = row[0], row[1], row[2]
+        node = dict(zip(TREE_COLUMNS, row[1:]))
+        for column in ('start_date', 'end_date'):
+            if node[column] is not None:
+                node[column] = node[column].isoformat()
+        node['depth'] = depth
+        node['subtasks_count'] = 0
+        node['children'] = []
+        parent = nodes.get(parent_id) if depth else None
+        if parent is not None:
+            parent['subtasks_count'] += 1
+            if max_depth is None or depth <= max_depth:
+                parent['children'].append(node)
+        else:
+            roots.append(node)
+        nodes[task_id] = node
+        entries.append((node, parent, [
+            1, 1 if node['status'] == 'done' else 0, node['actual_hours'] or 0.0,
+            *leaf_values(node['estimated_hours'], node['progress'])
+        ]))
+
+    totals = {}
+    project_totals = [0, 0, 0.0, 0, 0.0, 0.0, 0.0]
+    for node, parent, own in reversed(entries):
+        subtree = totals.pop(node['id'], None)
+        if subtree is not None:
+            own = [a + b for a, b in zip(own[:3], subtree[:3])] + subtree[3:]
+        node['rollup'] = _rollup(own)
+        target = totals.get(parent['id']) if parent is not None else project_totals
+        if target is None:
+            totals[parent['id']] = own
+        else:
+            for index, value in enumerate(own):
+                target[index] += value
+    return roots, _rollup(project_totals), len(entries)
+
+
+def load_task_tree(project_id, root_id=None, max_depth=None):
+    """Árvore de tarefas do projeto (ou da subárvore de root_id) com uma única consulta"""
+    rows = db.session.execute(task_tree_query(project_id, root_id))
+    return build_task_tree(rows, max_depth)
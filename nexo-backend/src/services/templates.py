@@ -0,0 +1,258 @@
+from functools import lru_cache
+import random
+
+# Catálogos das respostas simuladas de IA, montados uma vez na importação:
+# cada requisição sorteia as entradas e formata só as escolhidas
+
+DEFAULT_CATEGORY = 'geral'
+# Resultados determinísticos (com seed) guardados por catálogo
+MEMO_SIZE = 1024
+
+SMART_OBJECTIVE_TEMPLATES = {
+    'tecnologia': (
+        "Desenvolver e lançar {description} em {timeline}, alcançando 85% de satisfação dos usuários através de testes beta com pelo menos 100 usuários, medindo NPS e tempo de resposta do sistema.",
+        "Implementar {description} reduzindo o tempo de processamento em 40% nos próximos {timeline}, com monitoramento contínuo de performance e relatórios semanais de otimização.",
+        "Criar {description} que aumente a eficiência operacional em 30% até {timeline}, medindo através de métricas de produtividade e feedback da equipe."
+    ),
+    'marketing': (
+        "Executar campanha de {description} aumentando o engajamento em 50% nos próximos {timeline}, medindo através de métricas de redes sociais e conversões.",
+        "Implementar estratégia de {description} gerando 200 leads qualificados por mês até {timeline}, com acompanhamento via CRM e relatórios de ROI.",
+        "Desenvolver {description} aumentando o reconhecimento da marca em 35% nos próximos {timeline}, medindo através de pesquisas de mercado mensais."
+    ),
+    'vendas': (
+        "Implementar processo de {description} aumentando as vendas em 25% nos próximos {timeline}, com acompanhamento semanal de pipeline e conversões.",
+        "Desenvolver {description} reduzindo o ciclo de vendas em 20% até {timeline}, medindo tempo médio de fechamento e satisfação do cliente.",
+        "Executar {description} aumentando a taxa de retenção de clientes em 30% nos próximos {timeline}, com métricas de churn e NPS."
+    ),
+    'geral': (
+        "Implementar {description} melhorando a eficiência em 25% nos próximos {timeline}, com medições mensais de KPIs específicos e relatórios de progresso.",
+        "Desenvolver {description} até {timeline}, alcançando 90% de satisfação dos stakeholders através de pesquisas regulares e marcos de entrega.",
+        "Executar {description} reduzindo custos em 15% nos próximos {timeline}, com acompanhamento orçamentário semanal e análise de ROI."
+    )
+}
+
+SMART_METRICS = (
+    "Acompanhamento semanal de progresso",
+    "Relatórios mensais de performance",
+    "Revisões quinzenais com stakeholders",
+    "Dashboard em tempo real de KPIs",
+    "Análise de ROI trimestral"
+)
+
+# Objetivos SMART do endpoint de projetos; {deadline} é o mês/ano corrente
+PROJECT_SMART_OBJECTIVE_TEMPLATES = (
+    "Aumentar a eficiência operacional em 25% nos próximos 6 meses através da implementação de {description}, medindo o tempo de execução de processos-chave e estabelecendo marcos mensais de progresso.",
+    "Desenvolver e lançar {description} até {deadline}, alcançando 80% de satisfação dos usuários através de pesquisas de feedback e métricas de engajamento.",
+    "Reduzir custos operacionais em 15% no próximo trimestre implementando {description}, com acompanhamento semanal do orçamento e relatórios de economia gerados.",
+    "Melhorar a qualidade do produto/serviço relacionado a {description} em 30% nos próximos 4 meses, utilizando métricas de qualidade específicas e avaliações regulares."
+)
+
+KPI_SUGGESTIONS = {
+    'tecnologia': (
+        {'name': 'Tempo de Resposta', 'type': 'performance', 'unit': 'ms', 'target': '< 200'},
+        {'name': 'Uptime', 'type': 'reliability', 'unit': '%', 'target': '99.9'},
+        {'name': 'Bugs por Release', 'type': 'quality', 'unit': 'count', 'target': '< 5'},
+        {'name': 'Cobertura de Testes', 'type': 'quality', 'unit': '%', 'target': '> 80'},
+        {'name': 'Satisfação do Usuário', 'type': 'satisfaction', 'unit': 'NPS', 'target': '> 50'}
+    ),
+    'marketing': (
+        {'name': 'Taxa de Conversão', 'type': 'conversion', 'unit': '%', 'target': '> 3'},
+        {'name': 'Custo por Lead', 'type': 'cost', 'unit': 'R$', 'target': '< 50'},
+        {'name': 'Engajamento', 'type': 'engagement', 'unit': '%', 'target': '> 5'},
+        {'name': 'Alcance', 'type': 'reach', 'unit': 'pessoas', 'target': '> 10000'},
+        {'name': 'ROI', 'type': 'financial', 'unit': '%', 'target': '> 300'}
+    ),
+    'vendas': (
+        {'name': 'Taxa de Fechamento', 'type': 'conversion', 'unit': '%', 'target': '> 20'},
+        {'name': 'Ticket Médio', 'type': 'revenue', 'unit': 'R$', 'target': '> 1000'},
+        {'name': 'Ciclo de Vendas', 'type': 'time', 'unit': 'dias', 'target': '< 30'},
+        {'name': 'Retenção de Clientes', 'type': 'retention', 'unit': '%', 'target': '> 85'},
+        {'name': 'LTV/CAC', 'type': 'financial', 'unit': 'ratio', 'target': '> 3'}
+    ),
+    'geral': (
+        {'name': 'Prazo', 'type': 'time', 'unit': 'dias', 'target': 'Dentro do cronograma'},
+        {'name': 'Orçamento', 'type': 'cost', 'unit': 'R$', 'target': 'Dentro do orçamento'},
+        {'name': 'Qualidade', 'type': 'quality', 'unit': '%', 'target': '> 90'},
+        {'name': 'Satisfação', 'type': 'satisfaction', 'unit': 'score', 'target': '> 4.5'},
+        {'name': 'Produtividade', 'type': 'efficiency', 'unit': '%', 'target': '> 85'}
+    )
+}
+
+# Multiplicadores baseados na complexidade
+COMPLEXITY_MULTIPLIERS = {
+    'low': {'tasks': 0.7, 'hours': 0.8},
+    'medium': {'tasks': 1.0, 'hours': 1.0},
+    'high': {'tasks': 1.5, 'hours': 1.3}
+}
+
+
+def _task_template(title, category, base_hours):
+    # Descrição e prioridade só dependem do template: calculadas uma vez
+    return {
+        'title': title,
+        'category': category,
+        'base_hours': base_hours,
+        'description': f"Executar {title.lower()} conforme especificações do projeto",
+        'priority': 'high' if category in ('planning', 'execution') else 'medium'
+    }
+
+
+TASK_TEMPLATES = {
+    'tecnologia': tuple(_task_template(*entry) for entry in (
+        ('Análise de Requisitos Técnicos', 'planning', 20),
+        ('Arquitetura do Sistema', 'design', 24),
+        ('Setup do Ambiente de Desenvolvimento', 'setup', 8),
+        ('Desenvolvimento do Backend', 'development', 60),
+        ('Desenvolvimento do Frontend', 'development', 50),
+        ('Integração de APIs', 'integration', 16),
+        ('Testes Unitários', 'testing', 20),
+        ('Testes de Integração', 'testing', 16),
+        ('Testes de Performance', 'testing', 12),
+        ('Documentação Técnica', 'documentation', 16),
+        ('Deploy e Configuração', 'deployment', 12),
+        ('Monitoramento e Logs', 'monitoring', 8)
+    )),
+    'marketing': tuple(_task_template(*entry) for entry in (
+        ('Pesquisa de Mercado', 'research', 16),
+        ('Definição de Personas', 'strategy', 12),
+        ('Criação de Conteúdo', 'content', 30),
+        ('Design de Materiais', 'design', 20),
+        ('Configuração de Campanhas', 'setup', 8),
+        ('Lançamento da Campanha', 'execution', 4),
+        ('Monitoramento de Métricas', 'monitoring', 12),
+        ('Otimização de Performance', 'optimization', 16),
+        ('Relatórios de Resultados', 'reporting', 8),
+        ('Análise de ROI', 'analysis', 6)
+    )),
+    'geral': tuple(_task_template(*entry) for entry in (
+        ('Planejamento Inicial', 'planning', 16),
+        ('Definição de Escopo', 'planning', 12),
+        ('Alocação de Recursos', 'resource', 8),
+        ('Execução Principal', 'execution', 40),
+        ('Controle de Qualidade', 'quality', 16),
+        ('Testes e Validação', 'testing', 20),
+        ('Documentação', 'documentation', 12),
+        ('Treinamento da Equipe', 'training', 16),
+        ('Entrega Final', 'delivery', 8),
+        ('Avaliação de Resultados', 'evaluation', 6)
+    ))
+}
+
+# Tarefas padrão criadas por POST /projects/<id>/generate-tasks
+PROJECT_TASK_TEMPLATES = (
+    {"title": "Análise de Requisitos", "description": "Definir e documentar todos os requisitos do projeto", "estimated_hours": 16},
+    {"title": "Planejamento Detalhado", "description": "Criar cronograma detalhado e alocar recursos", "estimated_hours": 12},
+    {"title": "Desenvolvimento/Implementação", "description": "Executar as atividades principais do projeto", "estimated_hours": 40},
+    {"title": "Testes e Validação", "description": "Realizar testes e validar resultados", "estimated_hours": 20},
+    {"title": "Documentação", "description": "Criar documentação técnica e de usuário", "estimated_hours": 8},
+    {"title": "Treinamento", "description": "Treinar equipe e usuários finais", "estimated_hours": 12},
+    {"title": "Entrega e Implantação", "description": "Entregar e implantar a solução", "estimated_hours": 16}
+)
+
+
+def normalize_text(value):
+    """Texto livre normalizado (espaços colapsados) para formatar e indexar o cache"""
+    return ' '.join(str(value).split()) if value else ''
+
+
+def normalize_category(value, catalog):
+    """Categoria do catálogo (sem diferenciar maiúsculas); desconhecidas caem em 'geral'"""
+    key = normalize_text(value).lower()
+    return key if key in catalog else DEFAULT_CATEGORY
+
+
+def parse_seed(value):
+    """Seed opcional da requisição: inteiro ou None"""
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError('Campo seed deve ser um inteiro')
+    return value
+
+
+def seeded(build):
+    """Executa build com o gerador global (sem seed) ou com um gerador próprio memoizado por seed.
+
+    Os resultados memoizados são compartilhados entre requisições e não
+    devem ser alterados por quem os recebe.
+    """
+    memo = lru_cache(maxsize=MEMO_SIZE)(lambda seed, *args: build(random.Random(seed), *args))
+
+    def run(*args, seed=None):
+        if seed is None:
+            return build(random, *args)
+        return memo(seed, *args)
+
+    run.cache_info = memo.cache_info
+    run.cache_clear = memo.cache_clear
+    return run
+
+
+@seeded
+def smart_objective(rng, description, industry, timeline):
+    return {
+        'smart_objective': rng.choice(SMART_OBJECTIVE_TEMPLATES[industry]).format(
+            description=description, timeline=timeline
+        ),
+        'suggested_metrics': rng.sample(SMART_METRICS, 3),
+        'confidence': rng.randint(85, 95)
+    }
+
+
+@seeded
+def project_smart_objective(rng, description, deadline):
+    return {
+        'smart_objective': rng.choice(PROJECT_SMART_OBJECTIVE_TEMPLATES).format(
+            description=description, deadline=deadline
+        )
+    }
+
+
+@seeded
+def kpi_suggestions(rng, project_type):
+    suggested = KPI_SUGGESTIONS[project_type]
+    return {
+        'suggested_kpis': [dict(kpi) for kpi in rng.sample(suggested, min(4, len(suggested)))],
+        'total_suggestions': len(suggested),
+        'confidence': rng.randint(80, 95)
+    }
+
+
+@seeded
+def generated_tasks(rng, project_type, complexity):
+    multiplier = COMPLEXITY_MULTIPLIERS[complexity]
+    templates = TASK_TEMPLATES[project_type]
+
+    # Selecionar tarefas baseadas na complexidade
+    num_tasks = int(len(templates) * multiplier['tasks'])
+    selected_templates = rng.sample(templates, min(num_tasks, len(templates)))
+
+    tasks = []
+    development = []
+    for i, template in enumerate(selected_templates):
+        task = {
+            'title': template['title'],
+            'description': template['description'],
+            'category': template['category'],
+            'estimated_hours': int(template['base_hours'] * multiplier['hours']),
+            'priority': template['priority'],
+            'order_index': i,
+            'dependencies': []
+        }
+
+        # Adicionar dependências lógicas
+        if template['category'] == 'development' and i > 0:
+            task['dependencies'] = [0]  # Depende do planejamento
+        elif template['category'] == 'testing' and i > 1:
+            task['dependencies'] = list(development)
+        if template['category'] == 'development':
+            development.append(i)
+
+        tasks.append(task)
+
+    return {
+        'generated_tasks': tasks,
+        'total_estimated_hours': sum(task['estimated_hours'] for task in tasks),
+        'complexity': complexity,
+        'confidence': rng.randint(85, 95)
+    }
@@ -0,0 +1,188 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+import click
+from flask import Response, current_app, request
+from flask.cli import AppGroup
+from werkzeug.wsgi import wrap_file
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional: sem ele só há variantes gzip
+    brotli = None
+
+# Arquivos com hash no nome (ex.: assets/index-B3x9kQ1a.js, padrão do Vite) nunca mudam de conteúdo
+HASHED_ASSET_PATTERN = re.compile(r'(^|/)assets/|[.-](?=[A-Za-z0-9_-]*\d)[A-Za-z0-9_-]{8,}\.[^./]+$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+# Variantes pré-comprimidas, em ordem de preferência
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml', 'application/xml')
+MIN_COMPRESS_SIZE = 1024
+# Arquivos até este tamanho ficam em memória (com suas variantes)
+MEMORY_LIMIT = 256 * 1024
+
+
+def is_compressible(mimetype):
+    return mimetype.startswith(COMPRESSIBLE_TYPES)
+
+
+class Asset:
+    __slots__ = ('path', 'mimetype', 'size', 'mtime', 'etag', 'immutable', 'data', 'variants')
+
+    def __init__(self, path, relative):
+        stat = os.stat(path)
+        self.path = path
+        self.mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        self.immutable = bool(HASHED_ASSET_PATTERN.search(relative))
+        with open(path, 'rb') as f:
+            content = f.read()
+        self.etag = hashlib.sha1(content).hexdigest()
+        self.data = content if self.size <= MEMORY_LIMIT else None
+        # encoding -> (caminho, tamanho, conteúdo em memória ou None)
+        self.variants = {}
+        for encoding, suffix in ENCODINGS:
+            variant_path = path + suffix
+            if os.path.isfile(variant_path):
+                size = os.path.getsize(variant_path)
+                data = None
+                if size <= MEMORY_LIMIT:
+                    with open(variant_path, 'rb') as f:
+                        data = f.read()
+                self.variants[encoding] = (variant_path, size, data)
+        # Sem .gz pré-gerado, arquivos pequenos e compressíveis são comprimidos uma vez aqui
+        if 'gzip' not in self.variants and self.data is not None and self.size >= MIN_COMPRESS_SIZE \
+                and is_compressible(self.mimetype):
+            compressed = gzip.compress(self.data, compresslevel=9, mtime=0)
+            if len(compressed) < self.size:
+                self.variants['gzip'] = (None, len(compressed), compressed)
+
+
+class StaticAssets:
+    """Serve o frontend compilado a partir de um manifesto montado uma única vez.
+
+    A pasta estática é percorrida no primeiro acesso (processos que só
+    atendem a API nunca pagam a varredura); depois disso cada requisição só
+    consulta o dicionário do manifesto. Variantes .br/.gz são escolhidas pelo
+    Accept-Encoding, arquivos com hash no nome recebem Cache-Control
+    immutable e os demais (index.html) são revalidados por ETag.
+    Caminhos desconhecidos caem no index.html (rotas do SPA).
+    """
+
+    def __init__(self, app=None):
+        self.root = None
+        self._manifest = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.root = app.static_folder
+        self._manifest = None
+        app.extensions['static_assets'] = self
+
+    @property
+    def manifest(self):
+        if self._manifest is None:
+            with self._lock:
+                if self._manifest is None:
+                    self._manifest = self.scan(self.root) if self.root and os.path.isdir(self.root) else {}
+        return self._manifest
+
+    @staticmethod
+    def scan(root):
+        manifest = {}
+        suffixes = tuple(suffix for _, suffix in ENCODINGS)
+        for directory, _, files in os.walk(root):
+            for name in files:
+                path = os.path.join(directory, name)
+                relative = os.path.relpath(path, root).replace(os.sep, '/')
+                # Variantes só entram junto com o original
+                if name.endswith(suffixes) and os.path.isfile(path.rsplit('.', 1)[0]):
+                    continue
+                manifest[relative] = Asset(path, relative)
+        return manifest
+
+    def serve(self, path):
+        if self.root is None:
+            return "Static folder not configured", 404
+        asset = self.manifest.get(path) if path else None
+        if asset is None:
+            asset = self.manifest.get('index.html')
+            if asset is None:
+                return "index.html not found", 404
+        return self.response(asset)
+
+    def response(self, asset):
+        encoding = None
+        accepted = request.accept_encodings
+        for candidate, _ in ENCODINGS:
+            if candidate in asset.variants and accepted[candidate]:
+                encoding = candidate
+                break
+
+        if encoding is None:
+            path, size, data = asset.path, asset.size, asset.data
+            etag = asset.etag
+        else:
+            path, size, data = asset.variants[encoding]
+            etag = f'{asset.etag}-{encoding}'
+
+        if data is not None:
+            body = data
+        else:
+            body = wrap_file(request.environ, open(path, 'rb'))
+        response = Response(body, mimetype=asset.mimetype, direct_passthrough=data is None)
+        response.content_length = size
+        if encoding is not None:
+            response.headers['Content-Encoding'] = encoding
+        if asset.variants:
+            response.vary.add('Accept-Encoding')
+        response.set_etag(etag)
+        response.last_modified = asset.mtime
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL if asset.immutable else REVALIDATE_CACHE_CONTROL
+        return response.make_conditional(request)
+
+
+def compress_assets(root, min_size=MIN_COMPRESS_SIZE):
+    """Gera as variantes .gz (e .br, com o pacote brotli) dos arquivos compressíveis de root"""
+    written = []
+    suffixes = tuple(suffix for _, suffix in ENCODINGS)
+    for directory, _, files in os.walk(root):
+        for name in files:
+            if name.endswith(suffixes):
+                continue
+            path = os.path.join(directory, name)
+            mimetype = mimetypes.guess_type(path)[0] or ''
+            if not is_compressible(mimetype) or os.path.getsize(path) < min_size:
+                continue
+            with open(path, 'rb') as f:
+                content = f.read()
+            compressors = [('.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+            if brotli is not None:
+                compressors.append(('.br', lambda data: brotli.compress(data, quality=11)))
+            for suffix, compress in compressors:
+                compressed = compress(content)
+                if len(compressed) < len(content):
+                    with open(path + suffix, 'wb') as f:
+                        f.write(compressed)
+                    written.append(path + suffix)
+    return written
+
+
+assets_cli = AppGroup('assets', help='Arquivos estáticos do frontend.')
+
+
+@assets_cli.command('compress')
+def compress_command():
+    """Pré-comprime os arquivos estáticos (gzip e, se instalado, brotli)"""
+    written = compress_assets(current_app.static_folder)
+    if brotli is None:
+        click.echo('Pacote brotli não instalado: apenas variantes gzip geradas.')
+    click.echo(f'{len(written)} variante(s) gerada(s).')
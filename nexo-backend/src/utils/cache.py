@@ -0,0 +1,67 @@
+from collections import OrderedDict
+import threading
+import time
+
+
+class TTLCache:
+    """Cache LRU com expiração por entrada, seguro entre threads.
+
+    maxsize=None desliga a evicção por LRU (as entradas só saem ao expirar);
+    ttl limita a vida de qualquer entrada, mesmo que expires_at seja maior.
+    Os instantes são timestamps Unix (time.time()).
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._next_purge = 1024
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, expires_at=None):
+        if self.ttl is not None:
+            limit = time.time() + self.ttl
+            expires_at = limit if expires_at is None else min(expires_at, limit)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+            elif len(self._data) >= self._next_purge:
+                # Sem limite de tamanho: remove expirados sempre que o cache dobra
+                self._purge_expired()
+                self._next_purge = max(1024, 2 * len(self._data))
+
+    def pop(self, key, default=None):
+        with self._lock:
+            item = self._data.pop(key, None)
+        return default if item is None else item[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def _purge_expired(self):
+        now = time.time()
+        expired = [key for key, (_, expires_at) in self._data.items() if expires_at is not None and expires_at <= now]
+        for key in expired:
+            del self._data[key]
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
@@ -0,0 +1,44 @@
+import hashlib
+from datetime import timezone
+from flask import Response, make_response, request
+
+
+def make_etag(*version):
+    """ETag a partir da versão do recurso e da query string (filtros, campos e cursor mudam o corpo)"""
+    raw = repr((request.path, request.query_string, version)).encode()
+    return hashlib.sha1(raw).hexdigest()
+
+
+def is_not_modified(etag, last_modified=None):
+    """Avalia If-None-Match (comparação fraca) e, na ausência dele, If-Modified-Since"""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified is not None:
+        # HTTP-date só tem precisão de segundos
+        return last_modified.replace(microsecond=0, tzinfo=timezone.utc) <= request.if_modified_since
+    return False
+
+
+def conditional_response(version, last_modified, build, weak=True):
+    """Resposta com ETag/Last-Modified; 304 sem montar o corpo quando o cliente já tem a versão.
+
+    version identifica o estado do recurso (ex.: contagem e max(updated_at),
+    lidos com uma consulta agregada); build só é chamado quando o corpo
+    precisa ser enviado. ETags fortes servem para recursos cujo JSON é
+    determinado pela versão; listagens e métricas usam ETags fracas.
+    last_modified só deve ser informado quando toda mudança do recurso o
+    avança (exclusões inclusive); com None não há Last-Modified e
+    If-Modified-Since é ignorado.
+    """
+    etag = make_etag(*version)
+    if is_not_modified(etag, last_modified):
+        response = Response(status=304)
+    else:
+        response = make_response(build())
+        if response.status_code != 200:
+            return response
+    response.set_etag(etag, weak=weak)
+    if last_modified is not None:
+        response.last_modified = last_modified.replace(tzinfo=timezone.utc)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
@@ -0,0 +1,136 @@
+import base64
+import json
+from urllib.parse import urlencode
+from flask import current_app, jsonify, request
+from src.models.user import db
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(values):
+    """Codifica os valores da última linha da página em um cursor opaco"""
+    raw = json.dumps(list(values), separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    """Decodifica um cursor gerado por encode_cursor"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError('Cursor inválido')
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError('Cursor inválido')
+    return values
+
+
+def parse_limit():
+    """Lê o parâmetro limit respeitando o tamanho máximo de página; sem ele vale DEFAULT_PAGE_SIZE.
+
+    Com UNPAGINATED_LISTS (compatibilidade com clientes que não seguem o
+    cursor) a requisição sem limit nem cursor devolve None: a listagem sai
+    completa.
+    """
+    raw = request.args.get('limit')
+    if raw is None:
+        if current_app.config.get('UNPAGINATED_LISTS') and not request.args.get('cursor'):
+            return None
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(raw)
+    except ValueError:
+        raise ValueError('Parâmetro limit deve ser um inteiro')
+    if limit < 1:
+        raise ValueError('Parâmetro limit deve ser maior que zero')
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def parse_fields(allowed):
+    """Lê o parâmetro fields (ex.: fields=id,name,status) e valida contra os campos permitidos"""
+    raw = request.args.get('fields')
+    if not raw:
+        return None
+    fields = [field.strip() for field in raw.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ValueError(f"Campos desconhecidos: {', '.join(unknown)}")
+    return fields
+
+
+def parse_list(name):
+    """Lê um filtro que aceita valores separados por vírgula (ex.: status=todo,done)"""
+    raw = request.args.get(name)
+    if not raw:
+        return None
+    return [value.strip() for value in raw.split(',') if value.strip()]
+
+
+def apply_filters(query, filters):
+    """Aplica filtros de igualdade/IN a partir da query string.
+
+    filters mapeia o nome do parâmetro para (coluna, conversor).
+    """
+    for name, (column, convert) in filters.items():
+        values = parse_list(name)
+        if values is None:
+            continue
+        try:
+            values = [convert(value) for value in values]
+        except ValueError:
+            raise ValueError(f'Filtro {name} inválido')
+        query = query.filter(column == values[0]) if len(values) == 1 else query.filter(column.in_(values))
+    return query
+
+
+def keyset_paginate(query, columns, key):
+    """Pagina uma consulta por chave (keyset) sobre as colunas informadas.
+
+    A consulta é ordenada por columns e, se houver cursor, filtrada para as
+    linhas estritamente posteriores à última linha da página anterior, de modo
+    que o custo de cada página independe da sua posição. key extrai de cada
+    linha os valores correspondentes a columns. Quando parse_limit não limita
+    (UNPAGINATED_LISTS), devolve todas as linhas na mesma ordem. Retorna
+    (linhas, próximo cursor).
+    """
+    limit = parse_limit()
+    if limit is None:
+        return query.order_by(*columns).all(), None
+    cursor = request.args.get('cursor')
+    if cursor:
+        values = decode_cursor(cursor, len(columns))
+        # (a, b) > (x, y)  =>  a > x OR (a = x AND b > y)
+        clauses = []
+        for i, column in enumerate(columns):
+            equal = [columns[j] == values[j] for j in range(i)]
+            clauses.append(db.and_(*equal, column > values[i]))
+        query = query.filter(db.or_(*clauses))
+
+    rows = query.order_by(*columns).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(key(rows[-1]))
+    return rows, next_cursor
+
+
+def project_fields(data, fields):
+    """Mantém apenas os campos solicitados em fields"""
+    if fields is None:
+        return data
+    return {field: data[field] for field in fields}
+
+
+def paginated_response(items, next_cursor):
+    """Resposta JSON com a lista da página; o próximo cursor vai nos headers.
+
+    O corpo continua sendo um array para manter compatibilidade com os clientes.
+    """
+    response = jsonify(items)
+    if next_cursor:
+        args = request.args.to_dict()
+        args['cursor'] = next_cursor
+        response.headers['X-Next-Cursor'] = next_cursor
+        response.headers['Link'] = f'<{request.path}?{urlencode(args)}>; rel="next"'
+    return response
@@ -0,0 +1,68 @@
+import pytest
+
+
+def optimize(client, **payload):
+    return client.post('/api/ai/optimize-schedule', json={'start_date': '2026-10-19', **payload})
+
+
+@pytest.mark.parametrize('payload', [
+    {'resources': ['ana']},
+    {'resources': [{'id': 'ana'}, 3]},
+    {'resources': 'ana'},
+    {'resources': True},
+    {'tasks': ['tarefa']},
+    {'tasks': {'title': 'A'}},
+])
+def test_optimize_schedule_rejects_malformed_input(client, payload):
+    payload.setdefault('tasks', [{'title': 'A', 'estimated_hours': 8}])
+    response = optimize(client, **payload)
+    assert response.status_code == 400
+    assert 'Dados inválidos' in response.get_json()['error']
+
+
+def test_optimize_schedule_keeps_legacy_fields(client):
+    response = optimize(client, tasks=[{'title': 'A', 'estimated_hours': 8}, {'title': 'B', 'estimated_hours': 8}],
+                        resources=[{'id': 'ana'}])
+    assert response.status_code == 200
+    tasks = response.get_json()['optimized_tasks']
+    assert [task['resource'] for task in tasks] == ['ana', 'ana']
+    assert all(task['resource_allocation'] == 1.0 for task in tasks)
+    assert tasks[1]['start_date'] == '2026-10-20T00:00:00'
+
+
+@pytest.mark.parametrize('end_date, risk_level', [('2100-01-01', 'low'), ('2020-01-01', 'high')])
+def test_predict_completion_reports_percentile_and_task_velocity(client, user_id, end_date, risk_level):
+    project_id = client.post('/api/projects', json={
+        'name': 'Projeto', 'user_id': user_id, 'end_date': end_date
+    }).get_json()['id']
+    client.post(f'/api/projects/{project_id}/tasks:bulk',
+                json={'create': [{'title': f'Tarefa {i}', 'estimated_hours': 8} for i in range(4)]})
+    response = client.post('/api/ai/predict-completion',
+                           json={'project_id': project_id, 'hours_per_day': 8, 'simulations': 1000, 'seed': 1})
+    body = response.get_json()
+    assert response.status_code == 200, body
+    p80 = body['forecast']['percentiles']['p80']
+    assert body['confidence'] == 80
+    assert body['predicted_completion_date'] == p80['date']
+    assert body['risk_level'] == risk_level
+    # Tarefas por dia, não horas por dia
+    assert body['velocity'] == round(4 / p80['calendar_days'], 2)
+    assert body['forecast']['hours_per_day'] == 8
+
+
+@pytest.mark.parametrize('payload', [
+    {'resources': [{'id': 1, 'working_days': [9]}]},
+    {'resources': [{'id': 1, 'working_days': '12345'}]},
+    {'resources': [{'id': 1, 'working_days': []}]},
+    {'resources': [{'id': 1, 'capacity_hours': 0}]},
+    {'resources': [{'id': 1, 'capacity_hours': 100}]},
+    {'resources': [{'id': 1, 'holidays': '2026-10-20'}]},
+    {'resources': 10 ** 6},
+    {'tasks': [{'title': 'A', 'estimated_hours': 1e9}]},
+    # Capacidade minúscula: termina, mas depois da maior data representável
+    {'resources': [{'id': 1, 'capacity_hours': 1e-6}], 'tasks': [{'title': 'A', 'estimated_hours': 10000}]},
+])
+def test_optimize_schedule_rejects_unbounded_calendars(client, payload):
+    payload.setdefault('tasks', [{'title': 'A', 'estimated_hours': 8}])
+    response = optimize(client, **payload)
+    assert response.status_code == 400, response.get_json()
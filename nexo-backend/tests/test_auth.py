@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.user import db, RevokedToken
+from src.routes import auth
+
+
+@pytest.fixture
+def token(client):
+    # Os caches são do processo e tokens do mesmo usuário no mesmo segundo são idênticos
+    auth._verified_tokens.clear()
+    auth._revoked_tokens.clear()
+    return client.post('/api/auth/login', json={'email': 'ana@example.com', 'password': 'x'}).get_json()['token']
+
+
+def me(client, token):
+    return client.get('/api/auth/me', headers={'Authorization': f'Bearer {token}'})
+
+
+def revoke_elsewhere(app, token, expires_at=None):
+    """Grava a revogação direto na tabela, como faria o logout em outro worker"""
+    with app.app_context():
+        db.session.add(RevokedToken(
+            token_hash=auth._token_digest(token).hex(),
+            expires_at=expires_at or datetime.utcnow() + timedelta(hours=1)
+        ))
+        db.session.commit()
+
+
+def test_logout_revokes_token(app, client, token):
+    assert me(client, token).status_code == 200
+    headers = {'Authorization': f'Bearer {token}'}
+    assert client.post('/api/auth/logout', json={}, headers=headers).status_code == 200
+    assert client.post('/api/auth/logout', json={}, headers=headers).status_code == 200
+    assert me(client, token).status_code == 401
+    with app.app_context():
+        assert RevokedToken.query.count() == 1
+
+
+def test_revocation_from_another_worker_evicts_cached_token(app, client, token, monkeypatch):
+    monkeypatch.setattr(auth, 'REVOCATION_SYNC_INTERVAL', 0)
+    assert me(client, token).status_code == 200
+    revoke_elsewhere(app, token)
+    assert me(client, token).status_code == 401
+
+
+def test_uncached_token_is_checked_against_revocations(app, client, token):
+    revoke_elsewhere(app, token)
+    auth._verified_tokens.clear()
+    auth._revoked_tokens.clear()
+    # Mesmo antes da próxima sincronização, o token fora do cache consulta a tabela
+    app.extensions['token_revocations'] = {'last_id': 0, 'next_sync': float('inf')}
+    assert me(client, token).status_code == 401
+
+
+def test_logout_purges_expired_revocations(app, client, token):
+    revoke_elsewhere(app, 'antigo', expires_at=datetime.utcnow() - timedelta(seconds=1))
+    client.post('/api/auth/logout', json={}, headers={'Authorization': f'Bearer {token}'})
+    with app.app_context():
+        assert [row.token_hash for row in RevokedToken.query] == [auth._token_digest(token).hex()]
+
+
+def test_revocation_cache_is_bounded():
+    assert auth._revoked_tokens.maxsize is not None
@@ -0,0 +1,96 @@
+import pytest
+
+from src.models.project import Task
+
+
+def bulk(client, project_id, **operations):
+    return client.post(f'/api/projects/{project_id}/tasks:bulk', json=operations)
+
+
+def create_tasks(client, project_id, count, **fields):
+    response = bulk(client, project_id, create=[{'title': f'Tarefa {i}', **fields} for i in range(count)])
+    assert response.status_code == 200, response.get_json()
+    return [result['id'] for result in response.get_json()['results']['create']]
+
+
+def parents(app, project_id):
+    with app.app_context():
+        return {task.id: task.parent_task_id for task in Task.query.filter_by(project_id=project_id)}
+
+
+def test_bulk_creates_updates_and_deletes(client, project_id):
+    a, b, c = create_tasks(client, project_id, 3)
+    response = bulk(client, project_id, create=[{'title': 'Nova', 'parent_task_id': a}],
+                    update=[{'id': b, 'parent_task_id': a, 'progress': 50}], delete=[c])
+    body = response.get_json()
+    assert response.status_code == 200, body
+    assert (body['created'], body['updated'], body['deleted']) == (1, 1, 1)
+
+
+@pytest.mark.parametrize('case', ['self', 'cycle', 'other_project', 'missing', 'descendant', 'deleted_parent'])
+def test_bulk_rejects_invalid_parents(app, client, project_id, user_id, case):
+    a, b, c = create_tasks(client, project_id, 3)
+    assert bulk(client, project_id, update=[{'id': b, 'parent_task_id': a}, {'id': c, 'parent_task_id': b}]).status_code == 200
+    other = client.post('/api/projects', json={'name': 'Outro', 'user_id': user_id}).get_json()['id']
+    foreign = create_tasks(client, other, 1)[0]
+    operations = {
+        'self': {'update': [{'id': a, 'parent_task_id': a}]},
+        'cycle': {'create': [{'title': 'x'}], 'update': [{'id': a, 'parent_task_id': b}]},
+        'other_project': {'create': [{'title': 'x', 'parent_task_id': foreign}]},
+        'missing': {'update': [{'id': a, 'parent_task_id': 99999}]},
+        'descendant': {'update': [{'id': a, 'parent_task_id': c}]},
+        'deleted_parent': {'create': [{'title': 'x', 'parent_task_id': c}], 'delete': [c]},
+    }[case]
+    before = parents(app, project_id)
+
+    response = bulk(client, project_id, **operations)
+
+    assert response.status_code == 400, response.get_json()
+    assert parents(app, project_id) == before
+
+
+def test_bulk_rejects_two_task_cycle_in_one_batch(app, client, project_id):
+    a, b = create_tasks(client, project_id, 2)
+    response = bulk(client, project_id, update=[{'id': a, 'parent_task_id': b}, {'id': b, 'parent_task_id': a}])
+    results = response.get_json()['results']['update']
+    assert response.status_code == 400
+    assert all('errors' in result for result in results)
+    assert parents(app, project_id) == {a: None, b: None}
+    assert client.get(f'/api/projects/{project_id}/tasks/tree').get_json()['detached'] == 0
+
+
+def test_bulk_accepts_moves_made_valid_by_the_same_batch(client, project_id):
+    a, b = create_tasks(client, project_id, 2)
+    assert bulk(client, project_id, update=[{'id': b, 'parent_task_id': a}]).status_code == 200
+    # Inverter a relação é válido quando as duas mudanças vêm juntas
+    response = bulk(client, project_id, update=[{'id': b, 'parent_task_id': None}, {'id': a, 'parent_task_id': b}])
+    assert response.status_code == 200, response.get_json()
+
+
+@pytest.mark.parametrize('task_id', [[1], {'id': 1}, '1', True, None])
+def test_bulk_rejects_non_integer_ids(client, project_id, task_id):
+    create_tasks(client, project_id, 1)
+    assert bulk(client, project_id, update=[{'id': task_id, 'title': 'x'}]).status_code == 400
+    assert bulk(client, project_id, delete=[task_id]).status_code == 400
+
+
+@pytest.mark.parametrize('fields', [
+    {'status': 'garbage'},
+    {'priority': 'asap'},
+    {'progress': 1e9},
+    {'progress': -1},
+    {'estimated_hours': -5},
+    {'actual_hours': -0.5},
+])
+def test_bulk_rejects_out_of_range_fields(client, project_id, fields):
+    task_id = create_tasks(client, project_id, 1)[0]
+    assert bulk(client, project_id, create=[{'title': 'x', **fields}]).status_code == 400
+    assert bulk(client, project_id, update=[{'id': task_id, **fields}]).status_code == 400
+
+
+def test_bulk_accepts_boundary_values(client, project_id):
+    response = bulk(client, project_id, create=[
+        {'title': 'a', 'progress': 0, 'estimated_hours': 0, 'status': 'done', 'priority': 'urgent'},
+        {'title': 'b', 'progress': 100, 'actual_hours': 0.0, 'status': 'blocked', 'priority': 'low'},
+    ])
+    assert response.status_code == 200, response.get_json()
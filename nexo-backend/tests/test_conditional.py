@@ -0,0 +1,33 @@
+import pytest
+
+
+def create_tasks(client, project_id, count):
+    response = client.post(f'/api/projects/{project_id}/tasks:bulk',
+                           json={'create': [{'title': f'Tarefa {i}'} for i in range(count)]})
+    return [result['id'] for result in response.get_json()['results']['create']]
+
+
+@pytest.mark.parametrize('path', ['tasks', 'tasks/tree', 'kpis'])
+def test_collections_ignore_if_modified_since(client, project_id, path):
+    create_tasks(client, project_id, 2)
+    response = client.get(f'/api/projects/{project_id}/{path}')
+    assert response.status_code == 200 and response.headers.get('ETag')
+    assert 'Last-Modified' not in response.headers
+    future = 'Fri, 01 Jan 2100 00:00:00 GMT'
+    assert client.get(f'/api/projects/{project_id}/{path}', headers={'If-Modified-Since': future}).status_code == 200
+
+
+def test_task_list_etag_changes_on_delete(client, project_id):
+    first, _ = create_tasks(client, project_id, 2)
+    etag = client.get(f'/api/projects/{project_id}/tasks').headers['ETag']
+    assert client.get(f'/api/projects/{project_id}/tasks', headers={'If-None-Match': etag}).status_code == 304
+    assert client.delete(f'/api/tasks/{first}').status_code == 204
+    response = client.get(f'/api/projects/{project_id}/tasks', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert len(response.get_json()) == 1
+
+
+def test_project_answers_if_modified_since(client, project_id):
+    response = client.get(f'/api/projects/{project_id}')
+    last_modified = response.headers['Last-Modified']
+    assert client.get(f'/api/projects/{project_id}', headers={'If-Modified-Since': last_modified}).status_code == 304
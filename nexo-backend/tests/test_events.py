@@ -0,0 +1,38 @@
+import pytest
+from werkzeug.test import EnvironBuilder
+
+
+@pytest.fixture
+def app(app):
+    app.config['EVENTS_MAX_CONNECTIONS'] = 2
+    return app
+
+
+def test_head_is_refused_without_using_a_slot(app, client, project_id):
+    for _ in range(5):
+        response = client.head(f'/api/projects/{project_id}/events')
+        assert response.status_code == 405
+        assert response.headers['Allow'] == 'GET'
+    assert app.extensions['events']._count == 0
+
+
+def test_unread_streams_release_their_slot(app, project_id):
+    # Chamada WSGI direta: o corpo nunca é iterado, como num cliente que desconecta
+    # antes do primeiro chunk (o cliente de teste sempre lê o primeiro)
+    for _ in range(5):
+        statuses = []
+        body = app(EnvironBuilder(path=f'/api/projects/{project_id}/events').get_environ(),
+                   lambda status, headers, exc_info=None: statuses.append(status))
+        assert statuses == ['200 OK']
+        body.close()
+    assert app.extensions['events']._count == 0
+
+
+def test_connection_limit(app, client, project_id):
+    open_streams = [client.get(f'/api/projects/{project_id}/events', buffered=False) for _ in range(2)]
+    assert client.get(f'/api/projects/{project_id}/events').status_code == 503
+    for response in open_streams:
+        response.close()
+    response = client.get(f'/api/projects/{project_id}/events', buffered=False)
+    assert response.status_code == 200
+    response.close()
@@ -0,0 +1,21 @@
+import csv
+import io
+
+
+def test_csv_export_escapes_formula_cells(client, project_id):
+    titles = ['=1+2', '+SUM(A1)', '-2+3', '@cmd', 'Normal - com hífen']
+    client.post(f'/api/projects/{project_id}/tasks:bulk', json={'create': [
+        {'title': title, 'estimated_hours': 8} for title in titles
+    ]})
+    response = client.get(f'/api/projects/{project_id}/tasks/export', query_string={'format': 'csv', 'gzip': '0'})
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [row['title'] for row in rows] == ["'=1+2", "'+SUM(A1)", "'-2+3", "'@cmd", 'Normal - com hífen']
+    # Números não são texto e saem sem apóstrofo
+    assert {row['estimated_hours'] for row in rows} == {'8.0'}
+
+
+def test_ndjson_export_keeps_values(client, project_id):
+    client.post(f'/api/projects/{project_id}/tasks:bulk', json={'create': [{'title': '=1+2'}]})
+    response = client.get(f'/api/projects/{project_id}/tasks/export', query_string={'format': 'ndjson', 'gzip': '0'})
+    assert '"title":"=1+2"' in response.get_data(as_text=True)
@@ -0,0 +1,83 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from src.models.project import ProjectRollup, db
+from src.services.history import ROLLUP_COLUMNS, rebuild_project_rollups, record_task_events
+
+
+def rollups(project_id):
+    return {
+        (row.period, row.period_start): [getattr(row, column) for column in ROLLUP_COLUMNS]
+        for row in ProjectRollup.query.filter_by(project_id=project_id)
+    }
+
+
+def assert_matches_rebuild(app, project_id):
+    """As linhas mantidas incrementalmente são as mesmas que o rebuild gera a partir do log"""
+    with app.app_context():
+        incremental = rollups(project_id)
+        assert rebuild_project_rollups(project_id) > 0
+        rebuilt = rollups(project_id)
+        db.session.rollback()
+    assert incremental.keys() == rebuilt.keys()
+    for key, values in incremental.items():
+        assert values == pytest.approx(rebuilt[key]), key
+
+
+def run_sequence(client, project_id):
+    """Cria três tarefas, atualiza, conclui, reabre e exclui"""
+    response = client.post(f'/api/projects/{project_id}/tasks:bulk', json={'create': [
+        {'title': 'A', 'estimated_hours': 8}, {'title': 'B', 'estimated_hours': 4}, {'title': 'C', 'estimated_hours': 2}
+    ]})
+    a, b, c = [result['id'] for result in response.get_json()['results']['create']]
+    assert client.put(f'/api/tasks/{a}', json={'actual_hours': 3, 'progress': 50}).status_code == 200
+    assert client.put(f'/api/tasks/{a}', json={'status': 'done', 'progress': 100}).status_code == 200
+    assert client.put(f'/api/tasks/{b}', json={'status': 'done'}).status_code == 200
+    assert client.put(f'/api/tasks/{b}', json={'status': 'in_progress'}).status_code == 200
+    client.post(f'/api/projects/{project_id}/tasks:bulk', json={'update': [{'id': c, 'estimated_hours': 6}]})
+    assert client.delete(f'/api/tasks/{c}').status_code == 204
+
+
+def test_api_changes_match_rebuild(app, client, project_id):
+    run_sequence(client, project_id)
+    assert_matches_rebuild(app, project_id)
+
+
+def test_changes_across_days_and_weeks_match_rebuild(app, project_id):
+    def state(status='todo', estimated_hours=4.0, actual_hours=0.0, progress=0.0):
+        return SimpleNamespace(status=status, estimated_hours=estimated_hours, actual_hours=actual_hours, progress=progress)
+
+    # Domingo, segunda e terça: dois dias na mesma semana e um na semana anterior
+    sunday, monday, tuesday = datetime(2026, 10, 18, 9), datetime(2026, 10, 19, 9), datetime(2026, 10, 20, 9)
+    with app.app_context():
+        record_task_events(project_id, [(1, None, state()), (2, None, state(estimated_hours=8.0))], now=sunday)
+        record_task_events(project_id, [(1, state(), state('done', actual_hours=5.0, progress=100.0))], now=monday)
+        record_task_events(project_id, [(2, state(estimated_hours=8.0), state(estimated_hours=8.0))], now=monday)
+        record_task_events(project_id, [
+            (1, state('done', actual_hours=5.0, progress=100.0), state('in_progress', actual_hours=6.0)),
+            (2, state(estimated_hours=8.0), None),
+            (3, None, state('done', estimated_hours=1.0))
+        ], now=tuesday)
+        db.session.commit()
+        assert len(rollups(project_id)) == 5
+    assert_matches_rebuild(app, project_id)
+
+
+def test_series_endpoints_read_the_rollup(client, project_id):
+    run_sequence(client, project_id)
+    today = datetime.utcnow().date().isoformat()
+    params = {'from': today, 'to': today}
+
+    burnup = client.get(f'/api/projects/{project_id}/burnup', query_string=params).get_json()['series']
+    assert burnup == [{'date': today, 'scope_tasks': 2, 'scope_hours': 12.0, 'done_tasks': 1, 'done_hours': 8.0}]
+    burndown = client.get(f'/api/projects/{project_id}/burndown', query_string=params).get_json()['series']
+    assert burndown == [{'date': today, 'remaining_tasks': 1, 'remaining_hours': 4.0}]
+    week = client.get(f'/api/projects/{project_id}/throughput', query_string=params).get_json()['series'][0]
+    assert (week['completed'], week['reopened'], week['completed_hours'], week['actual_hours']) == (2, 1, 8.0, 3.0)
+
+
+@pytest.mark.parametrize('params', [{'period': 'month'}, {'from': '2026-13-01'}, {'from': '2026-10-20', 'to': '2026-10-01'}])
+def test_series_rejects_invalid_range(client, project_id, params):
+    assert client.get(f'/api/projects/{project_id}/burnup', query_string=params).status_code == 400
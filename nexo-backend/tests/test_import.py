@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from src.models.project import Task, TaskDependency
+
+
+def import_ndjson(client, records, **params):
+    body = '\n'.join(json.dumps(record) for record in records)
+    return client.post('/api/projects/import', data=body, content_type='application/x-ndjson', query_string=params)
+
+
+def create_task(client, project_id, **fields):
+    response = client.post(f'/api/projects/{project_id}/tasks:bulk', json={'create': [{'title': 'Tarefa', **fields}]})
+    return response.get_json()['results']['create'][0]['id']
+
+
+def test_import_has_a_default_size_limit(app, client, project_id):
+    assert app.config['IMPORT_MAX_CONTENT_LENGTH']
+    app.config['IMPORT_MAX_CONTENT_LENGTH'] = 100
+    records = [{'type': 'task', 'project_id': project_id, 'title': f'Tarefa {i}'} for i in range(10)]
+    assert import_ndjson(client, records).status_code == 413
+
+
+@pytest.mark.parametrize('case', ['other_project', 'missing'])
+def test_import_rejects_numeric_parent_outside_project(app, client, project_id, user_id, case):
+    other = client.post('/api/projects', json={'name': 'Outro', 'user_id': user_id}).get_json()['id']
+    parent_id = create_task(client, other) if case == 'other_project' else 99999
+    response = import_ndjson(client, [
+        {'type': 'task', 'project_id': project_id, 'title': 'Filha', 'parent_task_id': parent_id}
+    ])
+    report = response.get_json()
+    assert response.status_code == 200, report
+    assert report['imported']['task'] == 0
+    assert report['errors'] == [{'line': 1, 'errors': [f'Tarefa pai {parent_id} não encontrada no projeto']}]
+
+
+def test_import_accepts_numeric_parent_in_project(app, client, project_id):
+    parent_id = create_task(client, project_id)
+    report = import_ndjson(client, [
+        {'type': 'task', 'project_id': project_id, 'title': 'Filha', 'parent_task_id': parent_id}
+    ]).get_json()
+    assert report['imported']['task'] == 1 and report['error_count'] == 0
+    with app.app_context():
+        assert Task.query.filter_by(title='Filha').one().parent_task_id == parent_id
+
+
+@pytest.mark.parametrize('chunk_size', [1, 10])
+def test_import_keeps_parent_keys_within_project(app, client, project_id, user_id, chunk_size):
+    other = client.post('/api/projects', json={'name': 'Outro', 'user_id': user_id}).get_json()['id']
+    report = import_ndjson(client, [
+        {'type': 'task', 'project_id': project_id, 'title': 'Antes', 'parent': 'p'},
+        {'type': 'task', 'project_id': other, 'title': 'Pai', 'key': 'p'},
+        {'type': 'task', 'project_id': project_id, 'title': 'Depois', 'parent': 'p'}
+    ], chunk_size=chunk_size).get_json()
+    assert report['imported']['task'] == 3 - (chunk_size == 1)
+    assert sorted(error['line'] for error in report['errors']) == [1, 3]
+    with app.app_context():
+        assert Task.query.filter(Task.parent_task_id.isnot(None)).count() == 0
+
+
+@pytest.mark.parametrize('case', ['other_project', 'missing'])
+def test_import_rejects_dependency_outside_project(app, client, project_id, user_id, case):
+    other = client.post('/api/projects', json={'name': 'Outro', 'user_id': user_id}).get_json()['id']
+    task_id = create_task(client, project_id)
+    depends_on = create_task(client, other) if case == 'other_project' else 999999
+    report = import_ndjson(client, [
+        {'type': 'dependency', 'task_id': task_id, 'depends_on_task_id': depends_on},
+        {'type': 'task', 'project_id': project_id, 'title': 'Nova', 'depends_on': [depends_on]}
+    ]).get_json()
+    assert report['imported']['dependency'] == 0
+    message = 'pertence a outro projeto' if case == 'other_project' else 'não encontrada'
+    assert sorted(error['line'] for error in report['errors']) == [1, 2]
+    assert all(f'Tarefa {depends_on} {message}' in error['errors'][0] for error in report['errors'])
+    with app.app_context():
+        assert TaskDependency.query.count() == 0
+
+
+def test_import_accepts_numeric_dependency_in_project(app, client, project_id):
+    existing = create_task(client, project_id)
+    report = import_ndjson(client, [
+        {'type': 'task', 'project_id': project_id, 'title': 'Nova', 'key': 'n', 'depends_on': [existing]},
+        {'type': 'dependency', 'task': 'n', 'depends_on_task_id': existing, 'dependency_type': 'start_to_start'}
+    ]).get_json()
+    assert report['error_count'] == 0, report['errors']
+    assert report['imported']['dependency'] == 2
+    with app.app_context():
+        assert {row.depends_on_task_id for row in TaskDependency.query} == {existing}
@@ -0,0 +1,157 @@
+import threading
+import time
+
+import pytest
+
+from src.app import create_app
+from src.models.job import ACTIVE_STATUSES, CANCELLED, DONE, FAILED, RUNNING, Job
+from src.models.migrations import upgrade_schema
+from src.models.project import ProjectStats, Task
+from src.models.user import User, db
+from src.services import jobs
+from src.services.jobs import get_executor
+
+ASYNC = {'Prefer': 'respond-async'}
+
+
+def predict(client, project_id, **headers):
+    return client.post('/api/ai/predict-completion', headers={**ASYNC, **headers},
+                       json={'project_id': project_id, 'simulations': 100, 'seed': 1})
+
+
+def poll(client, location, timeout=10):
+    """Consulta o job até ele sair de queued/running (ou até o timeout)"""
+    deadline = time.monotonic() + timeout
+    while True:
+        body = client.get(location).get_json()
+        if body['status'] not in ACTIVE_STATUSES or time.monotonic() > deadline:
+            return body
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def eager(app):
+    app.config['JOBS_EAGER'] = True
+    return app
+
+
+@pytest.fixture
+def threaded_app(tmp_path):
+    """Banco em arquivo: os jobs rodam nas threads do executor, com conexões próprias"""
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'jobs.db'}",
+        'RATELIMIT_ENABLED': False,
+        'TESTING': True,
+        'JOBS_MAX_WORKERS': 1
+    })
+    with app.app_context():
+        upgrade_schema()
+        db.session.add(User(username='ana', email='ana@example.com'))
+        db.session.commit()
+    yield app
+    get_executor_of(app).shutdown()
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def get_executor_of(app):
+    with app.app_context():
+        return get_executor()
+
+
+@pytest.fixture
+def blocking_handler(monkeypatch):
+    """Troca o handler da previsão por um que espera release e verifica o cancelamento"""
+    started, release = threading.Event(), threading.Event()
+
+    def handler(payload, context):
+        started.set()
+        release.wait(10)
+        context.check_cancelled()
+        return {'ok': True}
+
+    monkeypatch.setitem(jobs.JOB_HANDLERS, 'ai.predict_completion', handler)
+    return started, release
+
+
+def create_project(client):
+    return client.post('/api/projects', json={'name': 'Projeto', 'user_id': 1}).get_json()['id']
+
+
+def test_async_request_returns_location_and_finishes(eager, client, project_id):
+    response = predict(client, project_id)
+    assert response.status_code == 202
+    assert response.headers['Location'] == f"/api/jobs/{response.get_json()['id']}"
+    body = poll(client, response.headers['Location'])
+    assert body['status'] == DONE, body
+    assert body['result']['forecast']['percentiles']['p80']
+
+
+def test_threaded_job_is_polled_to_completion(threaded_app, blocking_handler):
+    started, release = blocking_handler
+    client = threaded_app.test_client()
+    response = predict(client, create_project(client))
+    assert response.status_code == 202
+    location = response.headers['Location']
+    assert started.wait(5)
+    running = client.get(location)
+    assert running.get_json()['status'] == RUNNING and running.headers['Retry-After']
+    release.set()
+    assert poll(client, location)['status'] == DONE
+
+
+def test_per_owner_limit_returns_429(threaded_app, blocking_handler):
+    started, release = blocking_handler
+    client = threaded_app.test_client()
+    project_id = create_project(client)
+    limit = threaded_app.config['JOBS_PER_USER']
+    locations = [predict(client, project_id).headers['Location'] for _ in range(limit)]
+    response = predict(client, project_id)
+    assert response.status_code == 429 and response.headers['Retry-After']
+    # Outro dono (outro IP) não é afetado
+    other = client.post('/api/ai/predict-completion', headers=ASYNC, environ_base={'REMOTE_ADDR': '10.0.0.2'},
+                        json={'project_id': project_id, 'simulations': 100})
+    assert other.status_code == 202
+    release.set()
+    for location in locations:
+        assert poll(client, location)['status'] == DONE
+
+
+def test_cancel_queued_and_running_jobs(threaded_app, blocking_handler):
+    started, release = blocking_handler
+    client = threaded_app.test_client()
+    project_id = create_project(client)
+    running = predict(client, project_id).headers['Location']
+    assert started.wait(5)
+    # Uma única thread: o segundo job fica na fila
+    queued = predict(client, project_id).headers['Location']
+
+    response = client.delete(queued)
+    assert response.status_code == 200 and response.get_json()['status'] == CANCELLED
+    assert client.delete(queued).status_code == 409
+
+    response = client.delete(running)
+    assert response.status_code == 202 and response.get_json()['status'] == RUNNING
+    release.set()
+    assert poll(client, running)['status'] == CANCELLED
+    with threaded_app.app_context():
+        assert Job.query.filter_by(status=DONE).count() == 0
+
+
+def test_failing_handler_rolls_back_its_writes(eager, client, project_id, monkeypatch):
+    generate = jobs.JOB_HANDLERS['project.generate_tasks']
+
+    def failing(payload, context):
+        generate(payload, context)
+        raise RuntimeError('falhou depois de inserir')
+
+    monkeypatch.setitem(jobs.JOB_HANDLERS, 'project.generate_tasks', failing)
+    response = client.post(f'/api/projects/{project_id}/generate-tasks', headers=ASYNC, json={})
+    assert response.status_code == 202
+    body = client.get(response.headers['Location']).get_json()
+    assert body['status'] == FAILED and body['error'] == 'falhou depois de inserir'
+    with eager.app_context():
+        assert Task.query.count() == 0
+        assert db.session.get(ProjectStats, project_id).task_count == 0
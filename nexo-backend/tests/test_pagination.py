@@ -0,0 +1,50 @@
+from src.utils.pagination import DEFAULT_PAGE_SIZE
+
+
+def create_projects(client, user_id, count):
+    for i in range(count):
+        assert client.post('/api/projects', json={'name': f'P{i}', 'user_id': user_id}).status_code == 201
+
+
+def test_listing_without_limit_is_capped(client, user_id):
+    create_projects(client, user_id, DEFAULT_PAGE_SIZE + 20)
+    response = client.get('/api/projects')
+    assert len(response.get_json()) == DEFAULT_PAGE_SIZE
+    assert response.headers['X-Next-Cursor']
+
+
+def test_user_listing_without_limit_is_capped(client):
+    for i in range(DEFAULT_PAGE_SIZE + 1):
+        client.post('/api/users', json={'username': f'u{i}', 'email': f'u{i}@example.com'})
+    assert len(client.get('/api/users').get_json()) == DEFAULT_PAGE_SIZE
+
+
+def test_task_listing_without_limit_is_capped(client, project_id):
+    client.post(f'/api/projects/{project_id}/tasks:bulk',
+                json={'create': [{'title': f'Tarefa {i}'} for i in range(DEFAULT_PAGE_SIZE + 1)]})
+    response = client.get(f'/api/projects/{project_id}/tasks')
+    assert len(response.get_json()) == DEFAULT_PAGE_SIZE
+    rest = client.get(f'/api/projects/{project_id}/tasks', query_string={'cursor': response.headers['X-Next-Cursor']})
+    assert len(rest.get_json()) == 1 and 'X-Next-Cursor' not in rest.headers
+
+
+def test_unpaginated_lists_opt_out(app, client, user_id):
+    app.config['UNPAGINATED_LISTS'] = True
+    create_projects(client, user_id, DEFAULT_PAGE_SIZE + 20)
+    response = client.get('/api/projects')
+    assert len(response.get_json()) == DEFAULT_PAGE_SIZE + 20
+    assert 'X-Next-Cursor' not in response.headers
+    # limit e cursor continuam paginando
+    assert len(client.get('/api/projects?limit=10').get_json()) == 10
+
+
+def test_cursor_pages_cover_every_row_once(client, user_id):
+    create_projects(client, user_id, 25)
+    ids, url = [], '/api/projects?limit=10'
+    while url:
+        response = client.get(url)
+        ids += [project['id'] for project in response.get_json()]
+        cursor = response.headers.get('X-Next-Cursor')
+        url = f'/api/projects?limit=10&cursor={cursor}' if cursor else None
+    assert len(ids) == len(set(ids)) == 25
+    assert ids == sorted(ids)
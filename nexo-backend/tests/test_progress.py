@@ -0,0 +1,103 @@
+import pytest
+
+from src.models.project import ProjectStats, Task, db
+from src.services.progress import LEAF_COLUMNS, SUBTREE_COLUMNS, reconcile_progress
+
+STATS_FIELDS = (*LEAF_COLUMNS, 'progress_sum', 'weighted_progress_sum')
+
+
+def bulk(client, project_id, **operations):
+    response = client.post(f'/api/projects/{project_id}/tasks:bulk', json=operations)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['results']
+
+
+def snapshot(project_id):
+    tasks = {
+        task.id: [task.progress, *[getattr(task, column) for column in SUBTREE_COLUMNS]]
+        for task in Task.query.filter_by(project_id=project_id)
+    }
+    stats = db.session.get(ProjectStats, project_id)
+    return tasks, [getattr(stats, column) for column in STATS_FIELDS]
+
+
+def assert_matches_reconcile(app, project_id):
+    """O estado mantido incrementalmente é o mesmo que o reconciliador grava do zero"""
+    with app.app_context():
+        incremental = snapshot(project_id)
+        db.session.expunge_all()
+        assert reconcile_progress(db.session.connection(), [project_id])[0] == 0
+        reconciled = snapshot(project_id)
+        db.session.rollback()
+    assert incremental[0].keys() == reconciled[0].keys()
+    for task_id, values in incremental[0].items():
+        assert values == pytest.approx(reconciled[0][task_id]), task_id
+    assert incremental[1] == pytest.approx(reconciled[1])
+
+
+@pytest.fixture
+def tree(client, project_id):
+    """Raiz com duas filhas (uma delas com uma neta) e uma tarefa solta"""
+    root, loose = [result['id'] for result in bulk(client, project_id, create=[
+        {'title': 'Raiz', 'estimated_hours': 4, 'progress': 10},
+        {'title': 'Solta', 'estimated_hours': 6, 'progress': 50}
+    ])['create']]
+    first, second = [result['id'] for result in bulk(client, project_id, create=[
+        {'title': 'Filha 1', 'estimated_hours': 8, 'progress': 25, 'parent_task_id': root},
+        {'title': 'Filha 2', 'estimated_hours': 2, 'progress': 100, 'parent_task_id': root}
+    ])['create']]
+    grandchild = bulk(client, project_id, create=[
+        {'title': 'Neta', 'estimated_hours': 16, 'progress': 40, 'parent_task_id': first}
+    ])['create'][0]['id']
+    return {'root': root, 'loose': loose, 'first': first, 'second': second, 'grandchild': grandchild}
+
+
+def test_create_matches_reconcile(app, client, project_id, tree):
+    assert_matches_reconcile(app, project_id)
+    response = client.post(f'/api/projects/{project_id}/tasks', json={
+        'title': 'Nova', 'estimated_hours': 3, 'parent_task_id': tree['loose']
+    })
+    assert response.status_code == 201
+    assert_matches_reconcile(app, project_id)
+
+
+def test_progress_update_matches_reconcile(app, client, project_id, tree):
+    assert client.put(f"/api/tasks/{tree['grandchild']}", json={'progress': 90}).status_code == 200
+    # Progresso enviado a uma tarefa com subtarefas é substituído pelo das folhas
+    assert client.put(f"/api/tasks/{tree['root']}", json={'progress': 5}).status_code == 200
+    assert_matches_reconcile(app, project_id)
+
+
+def test_estimated_hours_update_matches_reconcile(app, client, project_id, tree):
+    bulk(client, project_id, update=[{'id': tree['second'], 'estimated_hours': 30}])
+    bulk(client, project_id, update=[{'id': tree['loose'], 'estimated_hours': None}])
+    assert_matches_reconcile(app, project_id)
+
+
+def test_move_matches_reconcile(app, client, project_id, tree):
+    # A neta vai para a tarefa solta: Filha 1 volta a ser folha e a solta deixa de ser
+    bulk(client, project_id, update=[{'id': tree['grandchild'], 'parent_task_id': tree['loose']}])
+    assert_matches_reconcile(app, project_id)
+    bulk(client, project_id, update=[{'id': tree['first'], 'parent_task_id': None}])
+    assert_matches_reconcile(app, project_id)
+
+
+def test_delete_leaf_matches_reconcile(app, client, project_id, tree):
+    assert client.delete(f"/api/tasks/{tree['grandchild']}").status_code == 204
+    assert_matches_reconcile(app, project_id)
+
+
+def test_delete_parent_with_children_matches_reconcile(app, client, project_id, tree):
+    assert client.delete(f"/api/tasks/{tree['root']}").status_code == 204
+    assert_matches_reconcile(app, project_id)
+
+
+def test_bulk_batch_matches_reconcile(app, client, project_id, tree):
+    bulk(client, project_id,
+         create=[{'title': 'Nova', 'estimated_hours': 5, 'progress': 60, 'parent_task_id': tree['second']}],
+         update=[
+             {'id': tree['grandchild'], 'progress': 70, 'estimated_hours': 12},
+             {'id': tree['first'], 'parent_task_id': tree['loose']}
+         ],
+         delete=[tree['root']])
+    assert_matches_reconcile(app, project_id)
@@ -0,0 +1,46 @@
+import pytest
+
+from src.app import create_app
+
+
+def make_app(**config):
+    return create_app({
+        'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+        'RATELIMIT_DEFAULT': (2, 60),
+        'RATELIMIT_RULES': {},
+        **config
+    })
+
+
+def test_forwarded_for_is_ignored_without_trusted_proxies():
+    client = make_app().test_client()
+    statuses = [
+        client.get('/api/health', headers={'X-Forwarded-For': f'10.0.0.{i}'}).status_code
+        for i in range(4)
+    ]
+    assert statuses[-1] == 429
+
+
+def test_only_the_hop_added_by_the_trusted_proxy_counts():
+    client = make_app(TRUSTED_PROXIES=1).test_client()
+    # O proxy acrescenta o IP real (203.0.113.7) depois do que o cliente forjou
+    statuses = [
+        client.get('/api/health', headers={'X-Forwarded-For': f'10.0.0.{i}, 203.0.113.7'}).status_code
+        for i in range(4)
+    ]
+    assert statuses[-1] == 429
+    other = client.get('/api/health', headers={'X-Forwarded-For': '198.51.100.1'})
+    assert other.status_code != 429
+
+
+def test_sqlite_backend_purges_idle_buckets(tmp_path):
+    from src.middleware.rate_limit import SQLiteBackend
+
+    backend = SQLiteBackend(str(tmp_path / 'ratelimit.db'))
+    backend.PURGE_EVERY = 10
+    for i in range(9):
+        backend.hit(f'old:{i}', 5, 60, now=1000.0)
+    # A décima verificação, uma janela depois, dispara a limpeza dos baldes parados
+    backend.hit('new', 5, 60, now=1000.0 + 61)
+    keys = [row[0] for row in backend._connection().execute('SELECT key FROM rate_limit_bucket')]
+    assert keys == ['new']
@@ -0,0 +1,37 @@
+from src.models.project import TaskDependency, db
+
+
+def test_schedule_dates_skip_weekends(app, client, user_id):
+    # 2026-10-16 é uma sexta-feira
+    project_id = client.post('/api/projects', json={
+        'name': 'Projeto', 'user_id': user_id, 'start_date': '2026-10-16'
+    }).get_json()['id']
+    response = client.post(f'/api/projects/{project_id}/tasks:bulk', json={'create': [
+        {'title': 'A', 'estimated_hours': 16}, {'title': 'B', 'estimated_hours': 8}
+    ]})
+    a, b = [result['id'] for result in response.get_json()['results']['create']]
+    with app.app_context():
+        db.session.add(TaskDependency(task_id=b, depends_on_task_id=a))
+        db.session.commit()
+
+    body = client.get(f'/api/projects/{project_id}/schedule').get_json()
+    tasks = {task['task_id']: task for task in body['tasks']}
+    assert body['project_start'] == '2026-10-16T00:00:00'
+    # A ocupa sexta e segunda; B, a terça
+    assert tasks[a]['early_start_date'] == '2026-10-16T00:00:00'
+    assert tasks[a]['early_finish_date'] == '2026-10-20T00:00:00'
+    assert tasks[b]['early_start_date'] == '2026-10-20T00:00:00'
+    assert tasks[b]['late_finish_date'] == '2026-10-21T00:00:00'
+    assert body['project_end'] == '2026-10-21T00:00:00'
+    assert body['duration_days'] == 3
+
+
+def test_schedule_starting_on_weekend_begins_on_monday(client, user_id):
+    # 2026-10-17 é um sábado
+    project_id = client.post('/api/projects', json={
+        'name': 'Projeto', 'user_id': user_id, 'start_date': '2026-10-17'
+    }).get_json()['id']
+    client.post(f'/api/projects/{project_id}/tasks:bulk', json={'create': [{'title': 'A', 'estimated_hours': 4}]})
+    body = client.get(f'/api/projects/{project_id}/schedule').get_json()
+    assert body['project_start'] == '2026-10-19T00:00:00'
+    assert body['tasks'][0]['early_finish_date'] == '2026-10-19T12:00:00'
@@ -0,0 +1,56 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from src.services.scheduling import WorkCalendar
+
+
+def reference(start, hours_per_day, working_days, holidays, days=400):
+    """Capacidade dia a dia, como o calendário calculava antes de pular semanas"""
+    return [
+        0.0 if (start + timedelta(days=day)).weekday() not in working_days
+        or (start + timedelta(days=day)).toordinal() in holidays else float(hours_per_day)
+        for day in range(days)
+    ]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_calendar_matches_day_by_day_reference(seed):
+    rng = random.Random(seed)
+    start = date(2026, 1, 1) + timedelta(days=rng.randint(0, 365))
+    working_days = set(rng.sample(range(7), rng.randint(1, 7)))
+    hours_per_day = rng.choice([8, 4, 7.5, 24])
+    holidays = {start.toordinal() + rng.randint(-5, 60) for _ in range(rng.randint(0, 6))}
+    calendar = WorkCalendar(start, hours_per_day, working_days, holidays)
+    capacity = reference(start, hours_per_day, working_days, holidays)
+    cum = [0.0]
+    for value in capacity:
+        cum.append(cum[-1] + value)
+
+    for day in range(300):
+        assert calendar.work_at(day + 0.5) == pytest.approx(cum[day] + 0.5 * capacity[day])
+    for _ in range(200):
+        hours = rng.uniform(0.01, cum[300])
+        # Início: primeiro dia útil com horas restantes; término: dia em que elas se esgotam
+        begin = max(day for day in range(300) if cum[day] <= hours)
+        end = max(day for day in range(300) if cum[day] < hours)
+        assert calendar.time_at(hours) == pytest.approx(begin + (hours - cum[begin]) / capacity[begin])
+        assert calendar.end_at(hours) == pytest.approx(end + (hours - cum[end]) / capacity[end])
+
+
+def test_calendar_jumps_far_dates_without_walking_days():
+    calendar = WorkCalendar(date(2026, 10, 19), 8, (0, 1, 2, 3, 4))
+    # 10^9 horas = 25 milhões de semanas de 40 horas, terminando numa sexta-feira
+    assert calendar.end_at(1e9) == 25_000_000 * 7 - 2
+    assert calendar.time_at(1e9) == 25_000_000 * 7
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'working_days': [9]}, {'working_days': '01234'}, {'working_days': []}, {'working_days': [True]},
+    {'hours_per_day': 0}, {'hours_per_day': float('nan')}, {'hours_per_day': float('inf')},
+    {'holidays': [date(2300, 1, 1).toordinal()]},
+])
+def test_calendar_rejects_invalid_configuration(kwargs):
+    with pytest.raises(ValueError):
+        WorkCalendar(date(2026, 10, 19), **kwargs)
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+from flask import g
+
+from src.middleware import security
+from src.middleware.security import SanitizedDict, SanitizedList, json_depth_exceeds, sanitize_string
+
+
+def nested(depth):
+    return '[' * depth + ']' * depth
+
+
+@pytest.mark.parametrize('depth, exceeds', [(32, False), (33, True)])
+def test_json_depth_is_checked_before_parsing(client, depth, exceeds):
+    body = '{"tasks": ' + nested(depth - 1) + '}'
+    response = client.post('/api/ai/optimize-schedule', data=body, content_type='application/json')
+    assert response.status_code == 400
+    error = response.get_json()['error']
+    assert (error == 'JSON excede a profundidade máxima permitida') == exceeds, error
+
+
+def test_brackets_inside_strings_do_not_count():
+    raw = json.dumps({'text': '[[[[{{{{' * 10, 'escaped': '\\"[[[['}).encode()
+    assert not json_depth_exceeds(raw, 2)
+    assert json_depth_exceeds(nested(3).encode(), 2)
+
+
+def test_alternating_objects_and_lists_count_every_level():
+    raw = ('{"a": [' * 17 + ']}' * 17).encode()
+    assert not json_depth_exceeds(raw, 34)
+    assert json_depth_exceeds(raw, 33)
+
+
+def test_oversized_json_body_is_413(app, client):
+    app.config['MAX_CONTENT_LENGTH'] = 64
+    response = client.post('/api/projects', json={'name': 'x' * 100, 'user_id': 1})
+    assert response.status_code == 413
+    assert response.get_json()['error'] == 'Corpo da requisição excede o tamanho máximo permitido'
+
+
+def test_sanitized_data_escapes_fields_on_access(app, monkeypatch):
+    escaped = []
+
+    def recording(value):
+        escaped.append(value)
+        return sanitize_string(value)
+
+    monkeypatch.setattr(security, 'sanitize_string', recording)
+    payload = {'name': '<b>x</b>', 'tags': ['<i>', 'ok'], 'meta': {'note': 'a & b'}, 'count': 3}
+    with app.test_request_context('/api/projects', method='POST', json=payload):
+        assert app.preprocess_request() is None
+        data = g.sanitized_data
+        # Nada é parseado nem escapado até o handler ler os campos
+        assert 'sanitized_json' not in g and escaped == []
+        assert data['count'] == 3 and escaped == []
+        assert isinstance(data['tags'], SanitizedList) and isinstance(data['meta'], SanitizedDict)
+        assert data['tags'][0] == '&lt;i&gt;'
+        assert escaped == ['<i>']
+        # Leituras repetidas usam o valor já sanitizado
+        data['tags'][0]
+        assert escaped == ['<i>']
+
+
+def test_sanitized_values_are_html_escaped(app):
+    payload = {'name': '<script>alert(1)</script>Projeto', 'description': '<img onerror="x" src=a>', 'plain': 'ok'}
+    with app.test_request_context('/api/projects', method='POST', json=payload):
+        app.preprocess_request()
+        data = g.sanitized_data
+        assert data['name'] == '&lt;script&gt;alert(1)&lt;/script&gt;Projeto'
+        assert '<' not in data['description'] and '"' not in data['description']
+        assert data['plain'] == 'ok'
+        assert dict(data) == {key: data[key] for key in payload}
@@ -0,0 +1,40 @@
+from src.models.project import ProjectStats, db
+from src.models.migrations import MIGRATIONS_TABLE, run_migrations
+
+
+def create_tasks(client, project_id):
+    client.post(f'/api/projects/{project_id}/tasks:bulk', json={'create': [
+        {'title': 'A', 'estimated_hours': 10, 'progress': 100, 'status': 'done'},
+        {'title': 'B', 'estimated_hours': 30, 'progress': 20}
+    ]})
+
+
+def drop_stats(app, project_id):
+    """Simula um projeto de antes da tabela project_stats"""
+    with app.app_context():
+        db.session.execute(db.delete(ProjectStats).where(ProjectStats.project_id == project_id))
+        db.session.commit()
+
+
+def test_analytics_without_stats_row_does_not_write(app, client, project_id):
+    create_tasks(client, project_id)
+    expected = client.get(f'/api/projects/{project_id}/analytics').get_json()
+    drop_stats(app, project_id)
+
+    body = client.get(f'/api/projects/{project_id}/analytics').get_json()
+    assert body['tasks_summary'] == expected['tasks_summary']
+    assert body['weighted_progress'] == expected['weighted_progress'] == 40.0
+    with app.app_context():
+        assert db.session.get(ProjectStats, project_id) is None
+
+
+def test_migration_creates_missing_stats_rows(app, client, project_id):
+    create_tasks(client, project_id)
+    drop_stats(app, project_id)
+    with app.app_context():
+        db.session.execute(db.text(f'DELETE FROM {MIGRATIONS_TABLE} WHERE version = 3'))
+        db.session.commit()
+        assert run_migrations() == [3]
+        stats = db.session.get(ProjectStats, project_id)
+        assert (stats.task_count, stats.done_count, stats.leaf_count) == (2, 1, 2)
+        assert stats.weighted_progress == 40.0
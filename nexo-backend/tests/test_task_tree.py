@@ -0,0 +1,36 @@
+from src.models.project import Task, db
+
+
+def create_chain(client, project_id, count):
+    """Cria count tarefas, cada uma subtarefa da anterior"""
+    ids = []
+    for i in range(count):
+        fields = {'title': f'Tarefa {i}', 'estimated_hours': 8}
+        if ids:
+            fields['parent_task_id'] = ids[-1]
+        response = client.post(f'/api/projects/{project_id}/tasks:bulk', json={'create': [fields]})
+        ids.append(response.get_json()['results']['create'][0]['id'])
+    return ids
+
+
+def test_tree_of_root_inside_parent_cycle_visits_each_task_once(app, client, project_id):
+    a, b, c = create_chain(client, project_id, 3)
+    with app.app_context():
+        # Ciclo a -> b -> c -> a gravado direto no banco (a API rejeita)
+        db.session.get(Task, a).parent_task_id = c
+        db.session.commit()
+
+    body = client.get(f'/api/projects/{project_id}/tasks/tree', query_string={'root_id': a}).get_json()
+    assert body['count'] == 3
+    assert body['rollup']['tasks'] == 3
+    assert body['rollup']['estimated_hours'] == 8
+    assert [node['id'] for node in body['items']] == [a]
+    assert body['items'][0]['children'][0]['children'][0]['children'] == []
+
+    # Sem root_id, as tarefas do ciclo não são alcançáveis a partir de uma raiz
+    body = client.get(f'/api/projects/{project_id}/tasks/tree').get_json()
+    assert (body['count'], body['detached']) == (0, 3)
+
+
+def test_tree_of_missing_project_is_404(client):
+    assert client.get('/api/projects/999/tasks/tree').status_code == 404
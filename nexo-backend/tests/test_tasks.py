@@ -0,0 +1,24 @@
+from sqlalchemy import event
+
+from src.models.user import db
+
+
+def test_task_list_counts_subtasks_in_a_single_query(app, client, project_id):
+    parent = client.post(f'/api/projects/{project_id}/tasks', json={'title': 'Pai'}).get_json()['id']
+    for i in range(20):
+        client.post(f'/api/projects/{project_id}/tasks', json={'title': f'Filha {i}', 'parent_task_id': parent})
+
+    statements = []
+    with app.app_context():
+        engine = db.engine
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, 'before_cursor_execute', listener)
+    try:
+        tasks = client.get(f'/api/projects/{project_id}/tasks').get_json()
+    finally:
+        event.remove(engine, 'before_cursor_execute', listener)
+
+    counts = {task['id']: task['subtasks_count'] for task in tasks}
+    assert counts[parent] == 20 and sum(counts.values()) == 20
+    # Versão para o ETag + a listagem, independente do número de tarefas
+    assert len([sql for sql in statements if sql.lstrip().upper().startswith('SELECT')]) <= 3
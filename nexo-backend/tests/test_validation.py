@@ -0,0 +1,88 @@
+import pytest
+
+from src.middleware.security import VALIDATORS
+from src.middleware.validation import compile_schema
+from src.services.bulk import parse_task_fields
+
+SCHEMA = compile_schema({
+    'required': ['name', 'user_id'],
+    'types': {'name': str, 'user_id': int, 'budget': (int, float), 'ratio': float},
+    'max_lengths': {'name': 10},
+    'email_fields': ['email']
+})
+
+
+def test_required_fields_reject_missing_and_empty():
+    _, errors = SCHEMA({'name': ''})
+    assert errors == ['Campo name é obrigatório', 'Campo user_id é obrigatório']
+    assert SCHEMA([1, 2]) == (None, ['Corpo da requisição deve ser um objeto JSON'])
+
+
+@pytest.mark.parametrize('field, value, expected', [
+    ('user_id', '12', 12),
+    ('user_id', 7, 7),
+    ('budget', '3.5', 3.5),
+    ('budget', 4, 4),
+    ('ratio', 2, 2.0),
+    ('ratio', '-0.25', -0.25),
+])
+def test_numbers_are_coerced(field, value, expected):
+    parsed, errors = SCHEMA({'name': 'Projeto', 'user_id': 1, field: value})
+    assert errors == []
+    assert parsed[field] == expected and type(parsed[field]) is type(expected)
+
+
+@pytest.mark.parametrize('field, value', [
+    ('user_id', True),
+    ('user_id', 1.5),
+    ('user_id', 'doze'),
+    ('name', 12),
+    ('budget', False),
+    ('budget', 'nan'),
+    ('budget', float('nan')),
+    ('ratio', 'inf'),
+    ('ratio', '-Infinity'),
+    ('ratio', float('inf')),
+    ('ratio', [1]),
+])
+def test_invalid_types_are_rejected(field, value):
+    _, errors = SCHEMA({'name': 'Projeto', 'user_id': 1, field: value})
+    assert len(errors) == 1 and errors[0].startswith(f'Campo {field} deve ser do tipo')
+
+
+def test_lengths_and_emails():
+    _, errors = SCHEMA({'name': 'x' * 11, 'user_id': 1, 'email': 'ana@'})
+    assert errors == ['Campo name deve ter no máximo 10 caracteres', 'Campo email deve ser um email válido']
+
+
+def test_unknown_keys_pass_through_unchanged():
+    payload = {'name': 'Projeto', 'user_id': '3', 'extra': {'a': 1}}
+    parsed, errors = SCHEMA(payload)
+    assert errors == []
+    assert parsed == {'name': 'Projeto', 'user_id': 3, 'extra': {'a': 1}}
+    # O payload original não é alterado
+    assert payload['user_id'] == '3'
+
+
+def test_registered_schemas_are_compiled():
+    assert VALIDATORS['login']({'email': 'ana@example.com', 'password': 'x'})[1] == []
+    assert VALIDATORS['task']({'title': 'T', 'project_id': 1, 'estimated_hours': 'nan'})[1] == [
+        'Campo estimated_hours deve ser do tipo int ou float'
+    ]
+
+
+@pytest.mark.parametrize('item, error', [
+    ({'title': 'T', 'status': 'feito'}, 'Campo status deve ser um de: todo, in_progress, done, blocked'),
+    ({'title': 'T', 'priority': 'máxima'}, 'Campo priority deve ser um de: low, medium, high, urgent'),
+    ({'title': 'T', 'progress': 101}, 'Campo progress deve ser entre 0 e 100'),
+    ({'title': 'T', 'progress': float('nan')}, 'Campo progress deve ser entre 0 e 100'),
+    ({'title': 'T', 'estimated_hours': -1}, 'Campo estimated_hours deve ser maior ou igual a 0'),
+    ({'title': 'T', 'actual_hours': float('inf')}, 'Campo actual_hours deve ser maior ou igual a 0'),
+])
+def test_task_fields_check_choices_and_ranges(item, error):
+    assert parse_task_fields(item)[1] == [error]
+
+
+def test_task_fields_ignore_unknown_keys():
+    values, errors = parse_task_fields({'title': 'T', 'progress': 50, 'id_externo': 'x'})
+    assert errors == [] and values == {'title': 'T', 'progress': 50}